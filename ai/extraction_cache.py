@@ -0,0 +1,140 @@
+"""
+On-disk cache of LLM extraction results
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from typing import Any, Dict, Optional
+
+from constants import LLM_CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+# Bump when the prompts or response parsing change, so results produced by
+# the old version are no longer returned
+PROMPT_VERSION = 1
+
+
+class ExtractionCache:
+    """
+    Content addressed cache of extraction results, stored as JSON files
+
+    Results are keyed by a hash of everything that determines them: the
+    provider, model and temperature, the prompt (which contains the document
+    text) and the schema. A document extracted again with the same schema and
+    model is then answered from disk instead of the LLM.
+    """
+
+    def __init__(self, cache_dir: str):
+        """
+        Initialize the cache
+
+        Args:
+            cache_dir: Directory the cached results are stored in
+        """
+        self.cache_dir = cache_dir
+
+    @staticmethod
+    def make_key(provider: str, model: Optional[str], temperature: float,
+                 prompt: str, schema: Dict[str, Any]) -> str:
+        """
+        Build the cache key for an extraction
+
+        Args:
+            provider: LLM provider name
+            model: Model name
+            temperature: Temperature used for generation
+            prompt: Full prompt sent to the model
+            schema: JSON schema the result is filtered by
+
+        Returns:
+            Hex digest identifying the extraction
+        """
+        canonical = json.dumps(
+            [PROMPT_VERSION, provider, model, temperature, prompt, schema],
+            sort_keys=True, separators=(',', ':'), default=str
+        )
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached result
+
+        Entries that cannot be read or do not hold a result are removed.
+
+        Args:
+            key: Key from make_key
+
+        Returns:
+            The cached result, or None on a miss
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable extraction cache entry {path}: {e}")
+            self._remove(path)
+            return None
+
+        result = entry.get('result') if isinstance(entry, dict) else None
+        if not isinstance(result, dict) or not isinstance(result.get('data'), dict):
+            logger.warning(f"Discarding invalid extraction cache entry {path}")
+            self._remove(path)
+            return None
+        return result
+
+    def set(self, key: str, result: Dict[str, Any], provider: str, model: Optional[str]) -> None:
+        """
+        Store a result
+
+        The entry is written to a temporary file and renamed into place, so
+        concurrent readers never see a partial file.
+
+        Args:
+            key: Key from make_key
+            result: Extraction result to cache
+            provider: LLM provider name, stored for reference
+            model: Model name, stored for reference
+        """
+        path = self._path(key)
+        entry = {
+            'provider': provider,
+            'model': model,
+            'prompt_version': PROMPT_VERSION,
+            'created_at': time.time(),
+            'result': result
+        }
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(temp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Failed to write extraction cache entry {path}: {e}")
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def get_extraction_cache() -> Optional[ExtractionCache]:
+    """
+    Get the extraction cache configured by LLM_CACHE_DIR
+
+    Returns:
+        The cache, or None when caching is not enabled
+    """
+    return ExtractionCache(LLM_CACHE_DIR) if LLM_CACHE_DIR else None
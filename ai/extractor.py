@@ -51,10 +51,11 @@ class DataExtractor(ABC):
         Returns:
             Prompt string for the model
         """
+        schema_str = json.dumps(schema, indent=2)
 
         return f"""Please extract structured data from the following content according to this schema, defined in JSON Schema Draft-07 format:
 
-{json.dumps(schema, indent=2)}
+{schema_str}
 
 Content to extract from:
 {content}
@@ -73,7 +74,7 @@ It is okay if the JSON object is empty. It is okay if the JSON object is not com
 
 Again, the schema in JSON Schema Draft-07 format is:
 
-{json.dumps(schema, indent=2)}
+{schema_str}
 
 Response:"""
     
@@ -1,15 +1,48 @@
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Union
 import json
 import re
 import logging
 import os
+import time
 import requests
+from .extraction_cache import get_extraction_cache
+from .llm_http import post_llm_request
 from .extractor import DataExtractor
 from constants import DEFAULT_LLM_PROVIDER, PROVIDER_CONFIGS, DEFAULT_TEMPERATURE
 from utils.json_utils import extract_json_from_text
 
 logger = logging.getLogger(__name__)
 
+# Extra attempts for a response that is not valid JSON, and the base delay between them in seconds
+LLM_MAX_RETRIES = 2
+LLM_RETRY_BACKOFF = 1.0
+
+def _is_json_schema(schema: Any) -> bool:
+    """Whether a schema is a JSON schema object Ollama can constrain output to"""
+    return isinstance(schema, dict) and schema.get('type') == 'object' and isinstance(schema.get('properties'), dict)
+
+def context_response_format(schema: Dict[str, Any]) -> Union[str, Dict[str, Any]]:
+    """
+    Ollama output format for a contextual extraction response
+
+    Args:
+        schema: JSON schema of the extracted data
+
+    Returns:
+        A JSON schema for the data and metadata object, or "json" to only
+        require valid JSON when the schema cannot be used for constrained decoding
+    """
+    if not _is_json_schema(schema):
+        return 'json'
+    return {
+        'type': 'object',
+        'properties': {
+            'data': schema,
+            'metadata': {'type': 'object'}
+        },
+        'required': ['data', 'metadata']
+    }
+
 class LLMExtractor(DataExtractor):
     """
     LLM-based data extractor that can work with different models and providers
@@ -72,11 +105,31 @@ class LLMExtractor(DataExtractor):
         # Create the prompt for extraction
         prompt = self.create_extraction_prompt(content, schema)
         
+        # Results share the cache with extract_data_with_context; the prompts
+        # differ, so their keys do too
+        cache = get_extraction_cache()
+        if cache is None:
+            return self._extract_data(prompt, schema)
+        
+        key = cache.make_key(self.provider, self.model, self.temperature, prompt, schema)
+        result = cache.get(key)
+        if result is not None:
+            logger.info(f"Using cached extraction result {key[:12]}")
+            return result['data']
+        
+        extracted_data = self._extract_data(prompt, schema)
+        # Failed extractions are not cached, so they are retried next time
+        if extracted_data:
+            cache.set(key, {'data': extracted_data, 'metadata': {}}, self.provider, self.model)
+        return extracted_data
+    
+    def _extract_data(self, prompt: str, schema: Dict[str, Any]) -> Dict[str, Any]:
+        """Send an extraction prompt to the model and parse the response"""
         # Send the prompt to the appropriate model
         if self.use_api:
             response_text = self._call_cloud_api(prompt)
         else:
-            response_text = self._call_local_api(prompt)
+            response_text = self._call_local_api(prompt, schema if _is_json_schema(schema) else 'json')
         
         logger.debug(f"Response text: {response_text}")
         # Parse the response
@@ -92,6 +145,9 @@ class LLMExtractor(DataExtractor):
         """
         Extract structured data from content with contextual information
         
+        When LLM_CACHE_DIR is set, results are cached on disk, so a prompt seen
+        before with the same schema and model is not sent to the model again.
+        
         Args:
             prompt: Prompt for the model that includes instructions for contextual information
             schema: JSON schema defining the structure of the data to extract
@@ -99,15 +155,76 @@ class LLMExtractor(DataExtractor):
         Returns:
             Extracted data as a dictionary matching the schema, with metadata
         """
-        # Send the prompt to the appropriate model
-        if self.use_api:
-            response_text = self._call_cloud_api(prompt)
-        else:
-            response_text = self._call_local_api(prompt)
+        cache = get_extraction_cache()
+        if cache is None:
+            return self._extract_data_with_context(prompt, schema)
         
-        logger.debug(f"Context response text: {response_text}")
+        key = cache.make_key(self.provider, self.model, self.temperature, prompt, schema)
+        result = cache.get(key)
+        if result is not None:
+            logger.info(f"Using cached extraction result {key[:12]}")
+            return result
         
-        # Parse the response
+        result = self._extract_data_with_context(prompt, schema)
+        # Failed extractions are not cached, so they are retried next time
+        if result.get('data'):
+            cache.set(key, result, self.provider, self.model)
+        return result
+    
+    def _extract_data_with_context(self, prompt: str, schema: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Send a contextual extraction prompt to the model and parse the response
+        
+        A response that cannot be parsed is retried up to LLM_MAX_RETRIES times,
+        with the parse failure appended to the prompt so the model can correct
+        its output instead of the chunk coming back empty.
+        """
+        request_prompt = prompt
+        response_format = context_response_format(schema)
+        for attempt in range(LLM_MAX_RETRIES + 1):
+            # Send the prompt to the appropriate model
+            if self.use_api:
+                response_text = self._call_cloud_api(request_prompt)
+            else:
+                response_text = self._call_local_api(request_prompt, response_format)
+            
+            logger.debug(f"Context response text: {response_text}")
+            
+            # No response means the request itself failed, which a retry with feedback cannot fix
+            if not response_text:
+                break
+            
+            result = self._parse_context_response(response_text, schema)
+            if result is not None:
+                return result
+            
+            if attempt < LLM_MAX_RETRIES:
+                logger.warning(f"Model response was not valid JSON, retrying ({attempt + 1}/{LLM_MAX_RETRIES})")
+                time.sleep(LLM_RETRY_BACKOFF * (attempt + 1))
+                request_prompt = (
+                    f"{prompt}\n\nYour previous response could not be parsed as a JSON object:\n"
+                    f"{response_text[:2000]}\n\n"
+                    "Return only a valid JSON object in the format described above."
+                )
+        
+        logger.error("Failed to extract valid JSON from model response with context")
+        return {
+            'data': {},
+            'metadata': {}
+        }
+    
+    def _parse_context_response(self, response_text: str, schema: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Parse a contextual extraction response into data and metadata
+        
+        Args:
+            response_text: Text returned by the model
+            schema: JSON schema the extracted data is filtered by
+            
+        Returns:
+            Dictionary with the filtered data and metadata, or None if the
+            response does not contain valid JSON
+        """
         if response_text:
             # First, try to parse the full response with metadata
             try:
@@ -203,18 +320,77 @@ class LLMExtractor(DataExtractor):
                     'metadata': {}  # Empty metadata
                 }
         
-        logger.error("Failed to extract valid JSON from model response with context")
-        return {
-            'data': {},
-            'metadata': {}
-        }
+        return None
+    
+    def extract_batch_with_context(self, prompt: str, schema: Dict[str, Any], count: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        Extract structured data for several documents sent in a single prompt
+        
+        The prompt asks for a JSON array with one data and metadata object per
+        document, in the order the documents were given.
+        
+        Args:
+            prompt: Prompt containing all the documents
+            schema: JSON schema each document's data is filtered by
+            count: Number of documents in the prompt
+            
+        Returns:
+            One result per document, or None if the response is missing or is
+            not an array of count results, in which case the caller should
+            extract the documents one at a time
+        """
+        if self.use_api:
+            response_text = self._call_cloud_api(prompt)
+        else:
+            # Without a usable schema only the prompt asks for an array, since
+            # Ollama's plain JSON mode produces objects
+            response_format = None
+            if _is_json_schema(schema):
+                response_format = {'type': 'array', 'items': context_response_format(schema)}
+            response_text = self._call_local_api(prompt, response_format)
+        
+        logger.debug(f"Batch response text: {response_text}")
+        if not response_text:
+            return None
+        
+        text = response_text.strip()
+        fence_match = re.search(r'```(?:json)?\s*([\s\S]*?)\s*```', text)
+        if fence_match:
+            text = fence_match.group(1)
+        try:
+            items = json.loads(text)
+        except json.JSONDecodeError as e:
+            logger.warning(f"Failed to parse batch response: {str(e)}")
+            return None
+        
+        if not isinstance(items, list) or len(items) != count:
+            logger.warning(f"Batch response is not an array of {count} results")
+            return None
+        
+        results = []
+        for item in items:
+            if not isinstance(item, dict) or not isinstance(item.get('data'), dict):
+                logger.warning("Batch response contains a result without a data object")
+                return None
+            metadata = item.get('metadata')
+            results.append({
+                'data': self.filter_data_by_schema(item['data'], schema),
+                'metadata': metadata if isinstance(metadata, dict) else {}
+            })
+        return results
+    
+    def _post(self, url: str, **kwargs: Any) -> requests.Response:
+        """POST a request to the model API, within the process-wide LLM request limits"""
+        return post_llm_request(url, **kwargs)
     
-    def _call_local_api(self, prompt: str) -> Optional[str]:
+    def _call_local_api(self, prompt: str, response_format: Union[str, Dict[str, Any], None] = None) -> Optional[str]:
         """
         Call the local API with the prompt
         
         Args:
             prompt: Prompt to send to the model
+            response_format: Ollama output format, "json" or a JSON schema the
+                response is constrained to during decoding
             
         Returns:
             Model response text or None if the call fails
@@ -228,9 +404,11 @@ class LLMExtractor(DataExtractor):
                     "messages": [{"role": "user", "content": prompt}],
                     "stream": False
                 }
+                if response_format is not None:
+                    payload["format"] = response_format
                 
                 logger.debug(f"Sending request to local {self.provider} API: {self.api_url}")
-                response = requests.post(self.api_url, json=payload)
+                response = self._post(self.api_url, json=payload)
                 response.raise_for_status()
                 
                 result = response.json()
@@ -276,7 +454,7 @@ class LLMExtractor(DataExtractor):
                 }
                 
                 logger.debug(f"Sending request to DeepSeek cloud API: {self.api_url}")
-                response = requests.post(self.api_url, headers=headers, json=payload)
+                response = self._post(self.api_url, headers=headers, json=payload)
                 response.raise_for_status()
                 
                 result = response.json()
@@ -296,7 +474,7 @@ class LLMExtractor(DataExtractor):
                 }
                 
                 logger.debug(f"Sending request to OpenAI API: {self.api_url}")
-                response = requests.post(self.api_url, headers=headers, json=payload)
+                response = self._post(self.api_url, headers=headers, json=payload)
                 response.raise_for_status()
                 
                 result = response.json()
@@ -317,7 +495,7 @@ class LLMExtractor(DataExtractor):
                 }
                 
                 logger.debug(f"Sending request to Anthropic API: {self.api_url}")
-                response = requests.post(self.api_url, headers=headers, json=payload)
+                response = self._post(self.api_url, headers=headers, json=payload)
                 response.raise_for_status()
                 
                 result = response.json()
@@ -0,0 +1,39 @@
+"""
+Shared HTTP connections for requests to LLM backends
+"""
+from typing import Any
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from constants import LLM_MAX_CONCURRENCY
+from .rate_limit import llm_request_limiter
+
+# One session for the whole process, so connections to the model APIs are kept
+# alive and reused instead of paying a TCP and TLS handshake per request. The
+# pool holds one connection per request the limiter lets run at once.
+_session = requests.Session()
+_adapter = HTTPAdapter(pool_connections=16, pool_maxsize=max(LLM_MAX_CONCURRENCY, 1))
+_session.mount('http://', _adapter)
+_session.mount('https://', _adapter)
+
+
+def post_llm_request(url: str, **kwargs: Any) -> requests.Response:
+    """
+    POST a request to an LLM backend
+
+    The request uses the shared keep-alive session and counts against the
+    process-wide LLM request limits.
+
+    Args:
+        url: URL of the model API
+        **kwargs: Arguments passed to requests.Session.post
+
+    Returns:
+        The response
+
+    Raises:
+        requests.exceptions.RequestException: If the request fails
+    """
+    with llm_request_limiter:
+        return _session.post(url, **kwargs)
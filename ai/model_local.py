@@ -1,10 +1,10 @@
 import re
 import json
 import logging
-import requests
 from typing import List, Dict, Any, Optional
 
 from .base import SchemaGenerator
+from .llm_http import post_llm_request
 from constants import DEFAULT_LOCAL_MODEL, DEFAULT_OLLAMA_API_URL
 
 logger = logging.getLogger(__name__)
@@ -97,7 +97,8 @@ Do not include any markdown formatting or code blocks. Just return the raw JSON.
             Dict with the API response content
             
         Raises:
-            requests.exceptions.RequestException: If the API request fails
+            requests.exceptions.RequestException: If the request sent through
+                post_llm_request fails or returns an error status
         """
         # Convert conversation to Ollama format
         ollama_messages = messages.copy()
@@ -110,7 +111,7 @@ Do not include any markdown formatting or code blocks. Just return the raw JSON.
         
         logger.info(f"Generating schema using model: {self.model}")
         logger.debug(f"Sending request to local Ollama API: {json.dumps(payload)}")
-        response = requests.post(self.api_url, json=payload)
+        response = post_llm_request(self.api_url, json=payload)
         response.raise_for_status()
         
         result = response.json()
@@ -0,0 +1,50 @@
+"""
+Process-wide limits on requests to LLM backends
+"""
+import threading
+import time
+from typing import Any
+
+from constants import LLM_MAX_CONCURRENCY, LLM_REQUESTS_PER_SECOND
+
+
+class RequestLimiter:
+    """
+    Caps how many requests run at once and how often new ones start
+
+    Used as a context manager around each request. Extractions running on
+    several threads then overlap their LLM latency without flooding the
+    backend or tripping a provider's rate limit.
+    """
+
+    def __init__(self, max_concurrency: int, requests_per_second: float = 0):
+        """
+        Initialize the limiter
+
+        Args:
+            max_concurrency: Maximum number of requests in flight at once
+            requests_per_second: Maximum rate at which requests start, 0 for no limit
+        """
+        self._slots = threading.BoundedSemaphore(max(1, max_concurrency))
+        self._interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+
+    def __enter__(self) -> 'RequestLimiter':
+        self._slots.acquire()
+        if self._interval:
+            # Reserve the next start time, then wait for it outside the lock
+            with self._lock:
+                now = time.monotonic()
+                start = max(now, self._next_start)
+                self._next_start = start + self._interval
+            if start > now:
+                time.sleep(start - now)
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._slots.release()
+
+
+# Shared by every extractor in the process
+llm_request_limiter = RequestLimiter(LLM_MAX_CONCURRENCY, LLM_REQUESTS_PER_SECOND)
@@ -5,6 +5,8 @@ import logging
 from typing import Optional, Dict, Any, Union, List, cast
 from flask import Flask, request, jsonify, send_from_directory, Response, send_file
 from flask_cors import CORS
+from sqlalchemy import exists
+from sqlalchemy.orm import undefer_group
 import json
 import time
 from pathlib import Path
@@ -12,10 +14,10 @@ from pathlib import Path
 # All other imports
 from db import init_db
 from routes import register_blueprints
+from routes.extraction_progress import shutdown_extraction_pool
 from constants import MODEL_CONFIGS, DEFAULT_OLLAMA_HOST, DEFAULT_OLLAMA_API_PATH, DEFAULT_DATABASE_NAME
 from type_definitions import StorageType
 from utils import extraction_progress
-from utils.s3_utils import list_s3_buckets, list_s3_objects
 from utils.schema_generator import generate_schema_from_file, merge_schemas
 from utils.file_utils import get_file_type, is_supported_file_type, list_files_with_extensions
 from storage import create_storage
@@ -40,6 +42,10 @@ CORS(app, resources={
     }
 })
 
+# Serialize JSON responses without sorting keys; sorting every nested dict
+# dominates the cost of large merged_data payloads
+app.json.sort_keys = False
+
 # Load configuration from environment variables
 app.config.update(
     # Storage configuration
@@ -144,11 +150,12 @@ def get_extraction_state():
             'is_active': False
         }), 404
     
+    # The state already holds the status, so no second lookup is needed
     return jsonify({
         'source': source,
         'dataset_name': dataset_name,
         'state': state,
-        'is_active': extraction_progress.is_extraction_active(source, dataset_name)
+        'is_active': extraction_progress.is_state_active(state)
     })
 
 # New endpoint to preview a file from a dataset
@@ -335,16 +342,18 @@ def check_extraction_progress(source: str, dataset_name: str):
         # Check if there's an extraction record in the database
         from db import db, ExtractionProgress
         with db.get_session() as session:
-            extraction_record = session.query(ExtractionProgress).filter(
-                ExtractionProgress.source == source,
-                ExtractionProgress.dataset_name == dataset_name,
-                ExtractionProgress.status.in_(['in_progress', 'scheduled', 'paused', 'failed'])
-            ).order_by(ExtractionProgress.id.desc()).first()
-            
-            has_extraction_record = extraction_record is not None
+            has_extraction_record = session.query(
+                exists().where(
+                    ExtractionProgress.source == source,
+                    ExtractionProgress.dataset_name == dataset_name,
+                    ExtractionProgress.status.in_(['in_progress', 'scheduled', 'paused', 'failed'])
+                )
+            ).scalar()
             
             # Get the most recent record regardless of status
-            most_recent = session.query(ExtractionProgress).filter_by(
+            most_recent = session.query(ExtractionProgress).options(
+                undefer_group('merge_data')
+            ).filter_by(
                 source=source,
                 dataset_name=dataset_name
             ).order_by(ExtractionProgress.id.desc()).first()
@@ -373,9 +382,13 @@ def check_extraction_progress(source: str, dataset_name: str):
         }), 500
 
 if __name__ == '__main__':
-    # Use regular Flask run instead of socketio.run
-    app.run(
-        debug=True,
-        host='0.0.0.0',
-        port=5000
-    ) 
\ No newline at end of file
+    try:
+        # Use regular Flask run instead of socketio.run
+        app.run(
+            debug=True,
+            host='0.0.0.0',
+            port=5000
+        )
+    finally:
+        # Stop queued and running extractions before the interpreter waits on them
+        shutdown_extraction_pool()
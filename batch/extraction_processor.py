@@ -5,47 +5,39 @@ import os
 import json
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
 import io
+from concurrent.futures import ThreadPoolExecutor, wait
 import tempfile
+import shutil
 
 from db import db, ExtractionProgress
 from utils import extraction_progress
-from storage import create_storage
+from utils.pdf_utils import PDF_SUPPORT, pdf_to_markdown
+from utils.json_utils import is_path_populated, schema_leaf_paths, write_json_file
+from utils.text_utils import has_extractable_text, split_content_into_chunks
+from storage import create_storage, get_storage_config
 from ai import create_llm_extractor
 from constants import (
-    STORAGE_TYPE, LOCAL_STORAGE_PATH, S3_BUCKET_NAME, AWS_ACCESS_KEY_ID,
-    AWS_SECRET_ACCESS_KEY, AWS_REGION, USE_LOCAL_MODEL, LLM_PROVIDER,
+    STORAGE_TYPE, USE_LOCAL_MODEL, LLM_PROVIDER,
     DEEPSEEK_API_KEY, OPENAI_API_KEY, ANTHROPIC_API_KEY, MODEL_CONFIGS,
-    DEFAULT_LLM_PROVIDER, MAX_CHUNK_SIZE, DEFAULT_TEMPERATURE, DATA_DIR
+    DEFAULT_LLM_PROVIDER, MAX_CHUNK_SIZE, DEFAULT_TEMPERATURE, DATA_DIR,
+    EXTRACTION_BATCH_MAX_FILES, EXTRACTION_WORKERS, LLM_MAX_CONCURRENCY
 )
 
 logger = logging.getLogger(__name__)
 
-# Import pymupdf4llm for PDF processing
-try:
-    import pymupdf4llm
-    PDF_SUPPORT = True
-except ImportError:
+if not PDF_SUPPORT:
     logger.warning("pymupdf4llm not installed. PDF processing will not be available.")
-    PDF_SUPPORT = False
-
-def get_storage_config() -> Dict[str, Any]:
-    """Get storage configuration based on environment variables"""
-    if STORAGE_TYPE == 's3':
-        return {
-            'bucket_name': S3_BUCKET_NAME,
-            'aws_access_key_id': AWS_ACCESS_KEY_ID,
-            'aws_secret_access_key': AWS_SECRET_ACCESS_KEY,
-            'region_name': AWS_REGION
-        }
-    else:
-        return {
-            'storage_path': LOCAL_STORAGE_PATH
-        }
-
-def convert_pdf_to_markdown(file_path: str, source: str, dataset_name: str) -> str:
-    """Convert a PDF file to markdown format and save it to a temporary directory"""
+
+def convert_pdf_to_markdown(file_path: str, source: str, dataset_name: str, markdown_dir: Optional[str] = None) -> str:
+    """
+    Convert a PDF file to markdown format and save it to the markdown cache directory
+
+    Callers converting many files should create markdown_dir once and pass it in,
+    rather than have it built and created again for every file.
+    """
     try:
         print(f"[PDF Processing] Starting conversion of {file_path} to markdown")
         
@@ -53,30 +45,33 @@ def convert_pdf_to_markdown(file_path: str, source: str, dataset_name: str) -> s
         storage_config = get_storage_config()
         storage = create_storage(STORAGE_TYPE, storage_config)
         
-        # Check if file exists in storage
-        print(f"[PDF Processing] Retrieving file from storage: {file_path}")
-        file_obj = storage.get_file(dataset_name, file_path)
-        if not file_obj:
-            print(f"[PDF Processing] ERROR: File {file_path} not found in dataset {dataset_name}")
-            raise FileNotFoundError(f"File {file_path} not found in dataset {dataset_name}")
-        
-        # Read the file content from storage
-        file_obj.seek(0)
-        file_content = file_obj.read()
-        file_size = len(file_content)
-        print(f"[PDF Processing] Retrieved file content, size: {file_size} bytes")
-        
-        # Create a temporary file for the PDF
-        print(f"[PDF Processing] Creating temporary file for PDF processing")
-        with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as temp_file:
-            temp_file.write(file_content)
-            temp_file_path = temp_file.name
-            print(f"[PDF Processing] Temporary file created at: {temp_file_path}")
+        # Local storage files are converted in place; other backends are
+        # copied to a temporary file first
+        temp_file_path = None
+        pdf_path = storage.get_local_path(dataset_name, file_path)
+        if pdf_path:
+            print(f"[PDF Processing] Reading file in place from: {pdf_path}")
+        else:
+            # Check if file exists in storage
+            print(f"[PDF Processing] Retrieving file from storage: {file_path}")
+            file_obj = storage.get_file(dataset_name, file_path)
+            if not file_obj:
+                print(f"[PDF Processing] ERROR: File {file_path} not found in dataset {dataset_name}")
+                raise FileNotFoundError(f"File {file_path} not found in dataset {dataset_name}")
+            
+            # Copy the file content into a temporary file for the PDF
+            print(f"[PDF Processing] Creating temporary file for PDF processing")
+            with file_obj, tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as temp_file:
+                file_obj.seek(0)
+                shutil.copyfileobj(file_obj, temp_file)
+                temp_file_path = temp_file.name
+                print(f"[PDF Processing] Temporary file created at: {temp_file_path}, size: {temp_file.tell()} bytes")
+            pdf_path = temp_file_path
         
         try:
             # Convert PDF to markdown using pymupdf4llm
             print(f"[PDF Processing] Converting PDF to markdown using pymupdf4llm")
-            markdown_content = pymupdf4llm.to_markdown(temp_file_path)
+            markdown_content = pdf_to_markdown(pdf_path)
             
             print(f"[PDF Processing] Conversion complete, markdown size: {len(markdown_content)} characters")
             if not markdown_content.strip():
@@ -84,12 +79,13 @@ def convert_pdf_to_markdown(file_path: str, source: str, dataset_name: str) -> s
                 markdown_content = "No text content could be extracted from this PDF file."
             
             # Save markdown content to a file in the .data directory
-            markdown_dir = Path(f"{DATA_DIR}/cached/{source}/{dataset_name}-md")
-            os.makedirs(markdown_dir, exist_ok=True)
+            if markdown_dir is None:
+                markdown_dir = os.path.join(DATA_DIR, 'cached', source, f"{dataset_name}-md")
+                os.makedirs(markdown_dir, exist_ok=True)
             
             # Create a filename based on the original PDF filename
             markdown_filename = os.path.splitext(os.path.basename(file_path))[0] + '.md'
-            markdown_file_path = markdown_dir / markdown_filename
+            markdown_file_path = os.path.join(markdown_dir, markdown_filename)
             
             print(f"[PDF Processing] Saving markdown content to {markdown_file_path}")
             
@@ -103,8 +99,8 @@ def convert_pdf_to_markdown(file_path: str, source: str, dataset_name: str) -> s
             return markdown_content
         finally:
             # Clean up the temporary PDF file
-            print(f"[PDF Processing] Cleaning up temporary file")
-            if os.path.exists(temp_file_path):
+            if temp_file_path and os.path.exists(temp_file_path):
+                print(f"[PDF Processing] Cleaning up temporary file")
                 os.unlink(temp_file_path)
                 print(f"[PDF Processing] Temporary file removed")
                 
@@ -113,60 +109,89 @@ def convert_pdf_to_markdown(file_path: str, source: str, dataset_name: str) -> s
         logger.exception(f"Error converting PDF to markdown for {file_path}: {e}")
         raise
 
-def process_file(file_path: str, source: str, dataset_name: str, config: Dict[str, Any], markdown_content: Optional[str] = None) -> Dict[str, Any]:
-    """Process a single file with the given configuration"""
-    session = None
+@lru_cache(maxsize=32)
+def parse_schema_for_prompt(schema_json: Optional[str]) -> Tuple[Dict[str, Any], str]:
+    """
+    Parse a stored extraction schema and render it for the extraction prompt
+    
+    Every file of a dataset is extracted with the same schema, so the result is
+    cached by the stored JSON text instead of being rebuilt for each file. The
+    returned dict is shared between callers and must not be modified. The
+    prompt text is compact JSON, since the schema is sent with every chunk
+    and whitespace in it only adds input tokens.
+    
+    Args:
+        schema_json: Schema JSON as stored on the extraction progress record
+        
+    Returns:
+        Tuple of the parsed schema, empty if missing or invalid, and its prompt text
+    """
+    try:
+        schema = json.loads(schema_json) if schema_json else {}
+    except ValueError:
+        schema = {}
+    return schema, json.dumps(schema, separators=(',', ':'))
+
+@lru_cache(maxsize=8)
+def _cached_llm_extractor(config_items: Tuple[Tuple[str, Any], ...]):
+    return create_llm_extractor(dict(config_items))
+
+def get_llm_extractor(config: Dict[str, Any]):
+    """
+    Get an LLM extractor for a configuration, reused across files
+
+    Extractors hold no per-file state, so every file of an extraction shares one
+    instead of creating it again for each file.
+
+    Args:
+        config: Extractor configuration
+
+    Returns:
+        The extractor for the configuration
+
+    Raises:
+        ValueError: If the configuration is invalid, such as a missing API key
+    """
+    return _cached_llm_extractor(tuple(sorted(config.items())))
+
+def process_file(file_path: str, source: str, dataset_name: str, config: Dict[str, Any], markdown_content: Optional[str] = None, output_dir: Optional[str] = None, schema: Any = None) -> Dict[str, Any]:
+    """
+    Process a single file with the given configuration
+
+    Several files of an extraction are processed at once, so this does not
+    write to the extraction progress record. The caller records progress
+    from the returned result.
+
+    Args:
+        file_path: File to extract
+        source: Data source
+        dataset_name: Name of the dataset
+        config: Extractor configuration
+        markdown_content: Markdown content of the file, read from storage if not given
+        output_dir: Directory the extraction result is written to
+        schema: Extraction schema, as a dict or JSON string
+
+    Returns:
+        The merged extraction result, with the merge reasoning entries of the
+        file under 'merge_reasoning_history'
+    """
     try:
         print(f"\n[LLM Extraction] Starting extraction for file: {file_path}")
-        session = db.get_session()
-        
-        # Check if there's an active extraction for this dataset
-        print(f"[LLM Extraction] Looking for active extraction record for {source}/{dataset_name}")
-        active_extraction = session.query(ExtractionProgress).filter(
-            ExtractionProgress.source == source,
-            ExtractionProgress.dataset_name == dataset_name,
-            ExtractionProgress.status.in_(['in_progress', 'scheduled', 'paused'])
-        ).order_by(ExtractionProgress.updated_at.desc()).first()
-        
-        if active_extraction:
-            extraction_progress_id = active_extraction.id
-            schema = active_extraction.get_schema()
-            
-            # If the status is not 'in_progress', update it
-            if active_extraction.status != 'in_progress':
-                active_extraction.status = 'in_progress'
-                session.commit()
-                
-            print(f"[LLM Extraction] Using existing extraction progress record {extraction_progress_id} for {source}/{dataset_name}")
-            logger.info(f"Using existing extraction progress record {extraction_progress_id} for {source}/{dataset_name}")
-        else:
-            # Create a new extraction progress record
-            print(f"[LLM Extraction] Creating new extraction progress record for {source}/{dataset_name}")
-            extraction_progress_record = ExtractionProgress(
-                source=source,
-                dataset_name=dataset_name,
-                status='in_progress',
-                current_file=file_path,
-                total_files=1,
-                processed_files=0
-            )
-            session.add(extraction_progress_record)
-            session.commit()
-            extraction_progress_id = extraction_progress_record.id
-            schema = None
-            print(f"[LLM Extraction] Created extraction progress record with ID {extraction_progress_id}")
+        schema_json = schema if isinstance(schema, str) or schema is None else json.dumps(schema)
+        schema, schema_text = parse_schema_for_prompt(schema_json)
         
         # Create the extractor
         print(f"[LLM Extraction] Creating LLM extractor with config: {config}")
         try:
-            extractor = create_llm_extractor(config)
+            extractor = get_llm_extractor(config)
             print(f"[LLM Extraction] Extractor created: provider={extractor.provider}, model={extractor.model}, use_api={extractor.use_api}")
         except ValueError as e:
             if "API key is required" in str(e):
                 # If API key is missing, retry with use_api=False
                 print(f"[LLM Extraction] API key missing, falling back to local model")
-                config['use_api'] = False
-                extractor = create_llm_extractor(config)
+                # Copied, since the other files of the extraction share config
+                config = {**config, 'use_api': False}
+                extractor = get_llm_extractor(config)
                 print(f"[LLM Extraction] Extractor created: provider={extractor.provider}, model={extractor.model}, use_api={extractor.use_api}")
             else:
                 raise
@@ -208,7 +233,7 @@ def process_file(file_path: str, source: str, dataset_name: str, config: Dict[st
                 
                 # Convert PDF to markdown using pymupdf4llm
                 print(f"[LLM Extraction] Converting PDF to markdown using pymupdf4llm")
-                content = pymupdf4llm.to_markdown(str(temp_file))
+                content = pdf_to_markdown(str(temp_file))
                 
                 # Clean up the temporary file
                 if temp_file.exists():
@@ -240,30 +265,16 @@ def process_file(file_path: str, source: str, dataset_name: str, config: Dict[st
                         print(f"[LLM Extraction] All decoding attempts failed, using placeholder message")
                         content = f"Binary file content could not be decoded as text. File: {file_path}"
         
-        # Split content into chunks if it's too large
-        if len(content) > MAX_CHUNK_SIZE:
-            print(f"[LLM Extraction] Content exceeds MAX_CHUNK_SIZE ({MAX_CHUNK_SIZE}), splitting into chunks")
-            chunks = []
-            for i in range(0, len(content), MAX_CHUNK_SIZE):
-                chunks.append(content[i:i + MAX_CHUNK_SIZE])
-            print(f"[LLM Extraction] Split content into {len(chunks)} chunks of max size {MAX_CHUNK_SIZE}")
-        else:
-            print(f"[LLM Extraction] Content size ({len(content)}) is within MAX_CHUNK_SIZE, using single chunk")
-            chunks = [content]
+        # Split content into chunks of whole paragraphs if it's too large
+        chunks = split_content_into_chunks(content, MAX_CHUNK_SIZE)
+        print(f"[LLM Extraction] Split content into {len(chunks)} chunks of max size {MAX_CHUNK_SIZE}")
         
-        # Update extraction progress with chunk information
-        print(f"[LLM Extraction] Updating extraction progress with chunk information")
-        extraction_progress.update_extraction_progress(
-            source, 
-            dataset_name, 
-            {
-                'current_file': file_path,
-                'total_chunks': len(chunks),
-                'current_chunk': 0,
-                'file_progress': 0,
-                'message': f'Processing file {os.path.basename(file_path)}'
-            }
-        )
+        # Skip chunks with no text, such as blank pages, keeping one so the
+        # file still gets a result
+        text_chunks = [chunk for chunk in chunks if has_extractable_text(chunk)]
+        if len(text_chunks) < len(chunks):
+            print(f"[LLM Extraction] Skipping {len(chunks) - len(text_chunks)} chunks without text")
+            chunks = text_chunks or chunks[:1]
         
         # Create a prompt for extraction
         print(f"[LLM Extraction] Creating extraction prompt template")
@@ -300,14 +311,13 @@ Return your response in this format:
   }}
 }}
 
-Remember, all data extracted should conform to the schema:
-{schema}
+Remember, all data extracted should conform to the schema given above.
 
 Return only the JSON object, with no additional text or explanation.
 """
         
         # If schema is None, provide a default schema to avoid errors
-        if schema is None:
+        if not schema:
             # Create a default schema that allows any data structure
             print(f"[LLM Extraction] No schema provided, creating default schema")
             default_schema = {
@@ -319,104 +329,77 @@ Return only the JSON object, with no additional text or explanation.
             schema_text = "No schema provided"
         else:
             schema_to_use = schema
-            schema_text = str(schema)
             print(f"[LLM Extraction] Using schema: {schema_text[:100]}{'...' if len(schema_text) > 100 else ''}")
         
         chunk_results = []
+        merge_reasoning_history = []
         
-        # Process each chunk
-        for i, chunk in enumerate(chunks):
-            # Update extraction progress with chunk information
-            print(f"\n[LLM Extraction] Processing chunk {i+1}/{len(chunks)}, size: {len(chunk)} characters")
-            
-            # Update the current chunk being processed
-            extraction_progress.update_extraction_progress(
-                source, 
-                dataset_name, 
-                {
-                    'current_file': file_path,
-                    'current_chunk': i + 1,
-                    'message': f'Processing chunk {i+1}/{len(chunks)} of {os.path.basename(file_path)}'
-                }
-            )
-            
-            logger.info(f"Processing chunk {i+1}/{len(chunks)} of {file_path}")
-            
+        # Fields of the schema no chunk has filled in yet. Once every field has a
+        # value, later chunks could not add anything and are not extracted.
+        # Schemas with arrays are always extracted in full.
+        remaining_fields = schema_leaf_paths(schema_to_use) or None
+        
+        def extract_chunk(i: int) -> Dict[str, Any]:
             # Create prompt for this chunk
-            print(f"[LLM Extraction] Creating prompt for chunk {i+1}")
-            prompt = prompt_template.format(schema=schema_text, content=chunk)
-            print(f"[LLM Extraction] Prompt size: {len(prompt)} characters")
-            
-            # Process the chunk
-            print(f"[LLM Extraction] Sending prompt to extractor for processing")
-            result = extractor.extract_data_with_context(prompt, schema_to_use)
-            print(f"[LLM Extraction] Received extraction result: {json.dumps(result, indent=2)}...")
-            
-            chunk_results.append(result)
-            
-            # Log chunk result and update progress
-            print(f"[LLM Extraction] Updating extraction progress with chunk result")
-            extraction_progress.update_extraction_progress(
-                source, 
-                dataset_name, 
-                {
-                    'current_file': file_path,
-                    'current_chunk': i + 1,
-                    'message': f'Processed chunk {i+1}/{len(chunks)} of {os.path.basename(file_path)}'
-                }
-            )
-            
-            # Perform intermediate merges every 2 chunks
-            if len(chunk_results) > 1 and (i + 1) % 2 == 0 and i + 1 < len(chunks):
-                print(f"[LLM Extraction] Performing intermediate merge after chunk {i+1}/{len(chunks)}")
-                
-                # Create intermediate merge 
-                intermediate_merge_explanation = extractor.merge_results(chunk_results[:i+1])
-                
-                # Store the intermediate result with merge explanation
-                intermediate_result = chunk_results[i]  # Use the current chunk result
-                intermediate_result['merge_explanation'] = intermediate_merge_explanation
+            prompt = prompt_template.format(schema=schema_text, content=chunks[i])
+            print(f"[LLM Extraction] Sending chunk {i+1} prompt to extractor, size: {len(prompt)} characters")
+            return extractor.extract_data_with_context(prompt, schema_to_use)
+        
+        # Chunks are independent requests, so they are extracted concurrently in
+        # windows of LLM_MAX_CONCURRENCY, with an intermediate merge after each
+        # window that leaves chunks to process
+        window_size = max(1, LLM_MAX_CONCURRENCY)
+        with ThreadPoolExecutor(max_workers=min(window_size, len(chunks)), thread_name_prefix='chunk-extract') as chunk_pool:
+            for start in range(0, len(chunks), window_size):
+                window = range(start, min(start + window_size, len(chunks)))
+                last = window[-1]
+                print(f"\n[LLM Extraction] Processing chunks {start+1}-{last+1}/{len(chunks)}")
+                logger.info(f"Processing chunks {start+1}-{last+1}/{len(chunks)} of {file_path}")
                 
-                # Extract the merged data for preview
-                intermediate_merged_data = intermediate_result.get('data', {})
+                # Results come back in chunk order
+                for i, result in zip(window, chunk_pool.map(extract_chunk, window)):
+                    print(f"[LLM Extraction] Received extraction result for chunk {i+1} with {len(result.get('data') or {})} fields")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(f"Extraction result for chunk {i+1}: {json.dumps(result)}")
+                    
+                    chunk_results.append(result)
+                    
+                    if remaining_fields:
+                        chunk_fields = result.get('data') or {}
+                        remaining_fields = {
+                            path for path in remaining_fields if not is_path_populated(chunk_fields, path)
+                        }
                 
-                # Create a reasoning entry for this intermediate merge
-                timestamp = int(time.time())
-                intermediate_reasoning_entry = {
-                    "timestamp": timestamp,
-                    "chunk_index": i,
-                    "total_chunks": len(chunks),
-                    "reasoning": {"merge_explanation": intermediate_merge_explanation},
-                    "is_final": False
-                }
+                if remaining_fields is not None and not remaining_fields and last + 1 < len(chunks):
+                    print(f"[LLM Extraction] All schema fields found after chunk {last+1}/{len(chunks)}, skipping remaining chunks")
+                    logger.info(f"All schema fields found after chunk {last+1}/{len(chunks)} of {file_path}, skipping remaining chunks")
+                    break
                 
-                # Update progress with intermediate merge reasoning
-                print(f"[LLM Extraction] Updating extraction progress with intermediate merge reasoning")
-                extraction_progress.update_extraction_progress(
-                    source, 
-                    dataset_name, 
-                    {
-                        'current_file': file_path,
-                        'message': f'Intermediate merge after chunk {i+1}/{len(chunks)} of {os.path.basename(file_path)}',
-                        'merge_reasoning_history': intermediate_reasoning_entry,
-                        'merged_data': intermediate_merged_data
-                    }
-                )
+                # Perform an intermediate merge if more chunks remain
+                if len(chunk_results) > 1 and last + 1 < len(chunks):
+                    print(f"[LLM Extraction] Performing intermediate merge after chunk {last+1}/{len(chunks)}")
+                    
+                    # Create intermediate merge 
+                    intermediate_merge_explanation = extractor.merge_results(chunk_results)
+                    
+                    # Store the intermediate result with merge explanation
+                    intermediate_result = chunk_results[last]  # Use the current chunk result
+                    intermediate_result['merge_explanation'] = intermediate_merge_explanation
+                    
+                    # Create a reasoning entry for this intermediate merge
+                    timestamp = int(time.time())
+                    merge_reasoning_history.append({
+                        "timestamp": timestamp,
+                        "chunk_index": last,
+                        "total_chunks": len(chunks),
+                        "reasoning": {"merge_explanation": intermediate_merge_explanation},
+                        "is_final": False
+                    })
         
         # Final merge if there are multiple chunks
         if len(chunk_results) > 1:
             print(f"\n[LLM Extraction] Performing final merge for all {len(chunk_results)} chunks of {file_path}")
             
-            # Update progress to indicate final merging
-            extraction_progress.update_extraction_progress(
-                source, 
-                dataset_name, 
-                {
-                    'current_file': file_path,
-                    'message': f'Performing final merge for all chunks of {os.path.basename(file_path)}'
-                }
-            )
-            
             # Create merge prompt with previous results
             print(f"[LLM Extraction] Calling extractor.merge_results to merge all chunks")
             merge_explanation = extractor.merge_results(chunk_results)
@@ -426,120 +409,155 @@ Return only the JSON object, with no additional text or explanation.
             final_result = chunk_results[-1]  # Use the last merged result
             final_result['merge_explanation'] = merge_explanation
             
-            # Extract the merged data for preview
-            merged_data = final_result.get('data', {})
-            
             # Create a reasoning entry for this final merge
             timestamp = int(time.time())
-            reasoning_entry = {
+            merge_reasoning_history.append({
                 "timestamp": timestamp,
                 "chunk_index": len(chunk_results) - 1,
                 "total_chunks": len(chunk_results),
                 "reasoning": {"merge_explanation": merge_explanation},
                 "is_final": True
-            }
-            
-            # Update progress with final merge explanation and reasoning entry
-            print(f"[LLM Extraction] Updating extraction progress with final merge reasoning")
-            extraction_progress.update_extraction_progress(
-                source, 
-                dataset_name, 
-                {
-                    'current_file': file_path,
-                    'message': f'Completed final merge for {os.path.basename(file_path)}',
-                    'merge_reasoning_history': reasoning_entry,
-                    'merged_data': merged_data
-                }
-            )
+            })
         else:
             print(f"[LLM Extraction] Single chunk processed, no merging required")
             final_result = chunk_results[0]
             
-            # Extract the data for preview
-            merged_data = final_result.get('data', {})
-            
             # Create a single-chunk reasoning entry
             timestamp = int(time.time())
-            reasoning_entry = {
+            merge_reasoning_history.append({
                 "timestamp": timestamp,
                 "chunk_index": 0,
                 "total_chunks": 1,
                 "reasoning": {"single_chunk": "Only one chunk was processed, so no merging was necessary."},
                 "is_final": True
-            }
-            
-            # Update progress with data preview and reasoning
-            extraction_progress.update_extraction_progress(
-                source, 
-                dataset_name, 
-                {
-                    'current_file': file_path,
-                    'message': f'Completed processing {os.path.basename(file_path)}',
-                    'merged_data': merged_data,
-                    'merge_reasoning_history': reasoning_entry
-                }
-            )
-        
-        # Update extraction progress and clear merge reasoning after file is complete
-        print(f"[LLM Extraction] Updating extraction progress record to indicate completion")
-        with db.get_session() as update_session:
-            extraction_progress_record = update_session.query(ExtractionProgress).get(extraction_progress_id)
-            if extraction_progress_record:
-                extraction_progress_record.processed_files += 1
-                # Clear merge reasoning and preview data since file is complete
-                extraction_progress_record.merge_reasoning_history = None
-                update_session.commit()
-                print(f"[LLM Extraction] Extraction progress record updated and merge reasoning cleared")
+            })
         
         # Save the final extraction result to a file
         try:
-            # Create output directory based on source/dataset
-            output_dir = Path(f"{DATA_DIR}/extracted/{source}/{dataset_name}")
-            os.makedirs(output_dir, exist_ok=True)
+            # Create output directory based on source/dataset, unless the
+            # caller already created it
+            if output_dir is None:
+                output_dir = os.path.join(DATA_DIR, 'extracted', source, dataset_name)
+                os.makedirs(output_dir, exist_ok=True)
             
             # Create output filename based on the input filename
             output_filename = os.path.splitext(os.path.basename(file_path))[0] + '.json'
-            output_file_path = output_dir / output_filename
+            output_file_path = os.path.join(output_dir, output_filename)
             
             # Save the extraction result
             print(f"[LLM Extraction] Saving final extraction result to {output_file_path}")
-            with open(output_file_path, 'w', encoding='utf-8') as f:
-                json.dump(final_result.get('data', {}), f, indent=2)
+            write_json_file(output_file_path, final_result.get('data', {}))
             
             print(f"[LLM Extraction] Extraction result saved successfully")
-            
-            # Update progress to indicate file saved
-            extraction_progress.update_extraction_progress(
-                source, 
-                dataset_name, 
-                {
-                    'message': f'Saved extraction result for {os.path.basename(file_path)}'
-                }
-            )
         except Exception as e:
             print(f"[LLM Extraction] ERROR saving extraction result: {str(e)}")
             logger.exception(f"Error saving extraction result for {file_path}: {e}")
         
         print(f"[LLM Extraction] Processing completed for {file_path}")
+        final_result['merge_reasoning_history'] = merge_reasoning_history
         return final_result
     except Exception as e:
         print(f"[LLM Extraction] ERROR processing file {file_path}: {str(e)}")
         logger.exception(f"Error processing file {file_path}: {e}")
-        # Update extraction progress to failed
-        if session and 'extraction_progress_id' in locals():
-            print(f"[LLM Extraction] Updating extraction progress to failed state")
-            extraction_progress.update_extraction_progress(
-                source, 
-                dataset_name, 
-                {
-                    'status': 'failed',
-                    'message': f'Error processing file {file_path}: {str(e)}'
-                }
-            )
         raise
-    finally:
-        if session:
-            db.close_session(session)
+
+BATCH_PROMPT_TEMPLATE = """
+You are an expert at extracting structured data from documents. I have {count} documents, and I need you to extract data from each of them
+to populate a set of fields defined in a schema.
+
+The data should all be relevant to the data in this schema:
+{schema}
+
+Here are the documents:
+{documents}
+
+Please extract the data from each document separately and return a JSON array with exactly {count} objects, one per document, in the order
+the documents are given. Each object has this format:
+{{
+  "data": {{
+    // The extracted data for the document according to the schema
+  }},
+  "metadata": {{
+    // For each field in the data: page_number, prominence, format and confidence (0.0 to 1.0)
+  }}
+}}
+
+Remember, all data extracted should conform to the schema given above.
+
+Return only the JSON array, with no additional text or explanation.
+"""
+
+def pack_extraction_batch(files: List[str], start: int, markdown_cache: Dict[str, str], max_files: int, max_chars: int) -> List[str]:
+    """
+    Select the consecutive files from start that can be extracted in one request
+
+    Files are added while their markdown is available and the combined content
+    fits in max_chars. Batches are consecutive so the files are still
+    completed in order, which resuming an extraction relies on.
+
+    Args:
+        files: Files of the extraction, in order
+        start: Index of the first file of the batch
+        markdown_cache: Markdown content by filename
+        max_files: Most files in a batch
+        max_chars: Most characters of content in a batch
+
+    Returns:
+        The filenames in the batch, empty if the first file does not fit
+    """
+    batch = []
+    total_chars = 0
+    for filename in files[start:start + max_files]:
+        content = markdown_cache.get(filename)
+        if not content or total_chars + len(content) > max_chars:
+            break
+        batch.append(filename)
+        total_chars += len(content)
+    return batch
+
+def process_file_batch(file_paths: List[str], contents: List[str], source: str, dataset_name: str, config: Dict[str, Any], schema: Any, output_dir: str) -> Optional[List[Dict[str, Any]]]:
+    """
+    Extract several small files with a single LLM request
+
+    Args:
+        file_paths: Files in the batch
+        contents: Markdown content of each file
+        source: Data source
+        dataset_name: Name of the dataset
+        config: Extractor configuration
+        schema: Extraction schema, as a dict or JSON string
+        output_dir: Directory the extraction results are written to
+
+    Returns:
+        The extraction result of each file once every file was extracted and
+        saved, or None if the files should be processed one at a time instead
+    """
+    schema_json = schema if isinstance(schema, str) or schema is None else json.dumps(schema)
+    schema_to_use, schema_text = parse_schema_for_prompt(schema_json)
+    if not schema_to_use:
+        return None
+
+    try:
+        extractor = get_llm_extractor(config)
+    except ValueError as e:
+        logger.warning(f"Cannot create extractor for batch extraction, extracting files one at a time: {e}")
+        return None
+
+    documents = '\n\n'.join(
+        f"### Document {n}\n{content}" for n, content in enumerate(contents, start=1)
+    )
+    prompt = BATCH_PROMPT_TEMPLATE.format(count=len(file_paths), schema=schema_text, documents=documents)
+    print(f"[LLM Extraction] Extracting batch of {len(file_paths)} files, prompt size: {len(prompt)} characters")
+
+    results = extractor.extract_batch_with_context(prompt, schema_to_use, len(file_paths))
+    if results is None:
+        logger.warning(f"Batch extraction of {len(file_paths)} files failed, extracting them one at a time")
+        return None
+
+    for file_path, result in zip(file_paths, results):
+        output_filename = os.path.splitext(os.path.basename(file_path))[0] + '.json'
+        write_json_file(os.path.join(output_dir, output_filename), result['data'])
+    return results
 
 def handle_dataset_extraction(extraction_progress_id, source, dataset_name, files, schema, output_dir, provider=None, model=None, use_api=None, temperature=None):
     """
@@ -578,10 +596,15 @@ def handle_dataset_extraction(extraction_progress_id, source, dataset_name, file
             
         print(f"[Extraction Task] Extractor configuration: {config}")
         
-        # Create markdown directory path
-        markdown_dir = Path(f"{DATA_DIR}/cached/{source}/{dataset_name}-md")
+        # Create the markdown and output directories once for all files
+        markdown_dir = os.path.join(DATA_DIR, 'cached', source, f"{dataset_name}-md")
         os.makedirs(markdown_dir, exist_ok=True)
         print(f"[Extraction Task] Created markdown directory: {markdown_dir}")
+        # List the cached markdown once instead of checking for each file
+        with os.scandir(markdown_dir) as entries:
+            cached_markdown = {entry.name for entry in entries if entry.is_file()}
+        extracted_dir = os.path.join(DATA_DIR, 'extracted', source, dataset_name)
+        os.makedirs(extracted_dir, exist_ok=True)
         
         # STEP 1: Convert all PDF files to markdown first using multithreading
         print(f"\n[Extraction Task] ===== STEP 1: CONVERTING PDFs TO MARKDOWN (MULTITHREADED) =====")
@@ -623,9 +646,9 @@ def handle_dataset_extraction(extraction_progress_id, source, dataset_name, file
             if filename.lower().endswith('.pdf'):
                 # Check if markdown file already exists
                 markdown_filename = os.path.splitext(os.path.basename(filename))[0] + '.md'
-                markdown_file_path = markdown_dir / markdown_filename
+                markdown_file_path = os.path.join(markdown_dir, markdown_filename)
                 
-                if markdown_file_path.exists():
+                if markdown_filename in cached_markdown:
                     print(f"[Thread {threading.current_thread().name}] Markdown file already exists for {filename}, loading from cache")
                     logger.info(f"Markdown file already exists for {filename}, loading from cache")
                     try:
@@ -642,7 +665,7 @@ def handle_dataset_extraction(extraction_progress_id, source, dataset_name, file
                         # If loading from cache fails, convert the PDF
                         try:
                             print(f"[Thread {threading.current_thread().name}] Cache loading failed, converting PDF instead")
-                            markdown_content = convert_pdf_to_markdown(filename, source, dataset_name)
+                            markdown_content = convert_pdf_to_markdown(filename, source, dataset_name, markdown_dir)
                             # Store content in cache
                             print(f"[Thread {threading.current_thread().name}] Storing content in cache after conversion")
                             markdown_cache[filename] = markdown_content
@@ -657,7 +680,7 @@ def handle_dataset_extraction(extraction_progress_id, source, dataset_name, file
                     # Convert PDF to markdown
                     try:
                         print(f"[Thread {threading.current_thread().name}] No cached markdown found, converting PDF to markdown")
-                        markdown_content = convert_pdf_to_markdown(filename, source, dataset_name)
+                        markdown_content = convert_pdf_to_markdown(filename, source, dataset_name, markdown_dir)
                         # Store content in cache
                         print(f"[Thread {threading.current_thread().name}] Storing content in cache after fresh conversion")
                         markdown_cache[filename] = markdown_content
@@ -672,114 +695,163 @@ def handle_dataset_extraction(extraction_progress_id, source, dataset_name, file
         
         # Create threads for PDF processing
         pdf_files = [(filename, i) for i, filename in enumerate(files) if filename.lower().endswith('.pdf')]
-        threads = []
-        
         print(f"[Extraction Task] Found {len(pdf_files)} PDF files to process")
         
         # Determine the number of threads to use (limit to a reasonable number)
-        max_threads = min(10, len(pdf_files))
+        max_threads = max(1, min(10, len(pdf_files)))
         print(f"[Extraction Task] Using {max_threads} concurrent threads for PDF processing")
         
-        # Create and start threads
-        for i in range(0, len(pdf_files), max_threads):
-            batch = pdf_files[i:i+max_threads]
-            print(f"[Extraction Task] Starting batch of {len(batch)} files (batch {i//max_threads + 1})")
-            
-            for file_info in batch:
-                thread = threading.Thread(target=process_pdf_file, args=(file_info,))
-                threads.append(thread)
-                print(f"[Extraction Task] Starting thread for file: {file_info[0]}")
-                thread.start()
-            
-            # Wait for all threads in this batch to complete
-            print(f"[Extraction Task] Waiting for all {len(threads)} threads in batch to complete")
-            for thread in threads:
-                thread.join()
-            
-            print(f"[Extraction Task] Batch {i//max_threads + 1} completed")
-            
-            # Check if extraction has been paused or cancelled
-            current_status = extraction_progress.get_extraction_status(source, dataset_name)
-            if not current_status or current_status == 'cancelled':
-                print(f"[Extraction Task] Extraction cancelled for {source}/{dataset_name}")
-                logger.info(f"Extraction cancelled for {source}/{dataset_name}")
-                return
-            
-            if current_status == 'paused':
-                print(f"[Extraction Task] Extraction paused for {source}/{dataset_name}")
-                logger.info(f"Extraction paused for {source}/{dataset_name}")
-                return
+        # One bounded pool for the whole conversion step, its threads are reused across batches
+        with ThreadPoolExecutor(max_workers=max_threads, thread_name_prefix='pdf-convert') as pdf_pool:
+            for i in range(0, len(pdf_files), max_threads):
+                batch = pdf_files[i:i+max_threads]
+                print(f"[Extraction Task] Starting batch of {len(batch)} files (batch {i//max_threads + 1})")
+                
+                futures = [pdf_pool.submit(process_pdf_file, file_info) for file_info in batch]
+                
+                # Wait for all files in this batch to complete
+                print(f"[Extraction Task] Waiting for all {len(futures)} files in batch to complete")
+                wait(futures)
+                
+                print(f"[Extraction Task] Batch {i//max_threads + 1} completed")
+                
+                # Check if extraction has been paused or cancelled
+                current_status = extraction_progress.get_extraction_status(source, dataset_name)
+                if not current_status or current_status == 'cancelled':
+                    print(f"[Extraction Task] Extraction cancelled for {source}/{dataset_name}")
+                    logger.info(f"Extraction cancelled for {source}/{dataset_name}")
+                    return
+                
+                if current_status == 'paused':
+                    print(f"[Extraction Task] Extraction paused for {source}/{dataset_name}")
+                    logger.info(f"Extraction paused for {source}/{dataset_name}")
+                    return
         
         print(f"[Extraction Task] PDF to markdown conversion phase complete. Converted {len(markdown_cache)} files.")
         print(f"[Extraction Task] Cached markdown files directory: {markdown_dir}")
         
-        # STEP 2: Process all files with LLM extraction (single-threaded)
-        print(f"\n[Extraction Task] ===== STEP 2: RUNNING LLM EXTRACTION (SINGLE-THREADED) =====")
-        logger.info("Step 2: Running LLM extraction on all files (single-threaded)")
+        # STEP 2: Process all files with LLM extraction, several files at a time
+        print(f"\n[Extraction Task] ===== STEP 2: RUNNING LLM EXTRACTION ({EXTRACTION_WORKERS} WORKERS) =====")
+        logger.info(f"Step 2: Running LLM extraction on all files ({EXTRACTION_WORKERS} workers)")
         
-        all_results = []
+        # Group the files into units extracted by one call: runs of small files
+        # extracted together in one request, or single files
+        units = []
+        i = 0
+        while i < len(files):
+            batch = []
+            if EXTRACTION_BATCH_MAX_FILES > 1:
+                batch = pack_extraction_batch(files, i, markdown_cache, EXTRACTION_BATCH_MAX_FILES, MAX_CHUNK_SIZE)
+            unit_files = batch if len(batch) > 1 else [files[i]]
+            units.append((i, unit_files))
+            i += len(unit_files)
         
-        for i, filename in enumerate(files):
-            # Check if extraction has been paused or cancelled
-            current_status = extraction_progress.get_extraction_status(source, dataset_name)
+        def extract_unit(unit):
+            start, unit_files = unit
             
-            if not current_status or current_status == 'cancelled':
-                print(f"[Extraction Task] Extraction cancelled for {source}/{dataset_name}")
-                logger.info(f"Extraction cancelled for {source}/{dataset_name}")
-                return
-            
-            if current_status == 'paused':
-                print(f"[Extraction Task] Extraction paused for {source}/{dataset_name} at file {i+1}/{len(files)}")
-                logger.info(f"Extraction paused for {source}/{dataset_name} at file {i+1}/{len(files)}")
-                return
-            
-            # Update the current file information
-            print(f"[Extraction Task] Starting LLM extraction for file {i+1}/{len(files)}: {filename}")
-            extraction_progress.update_extraction_progress(
-                source, 
-                dataset_name, 
-                {
-                    'current_file': filename,
-                    'current_file_index': i,
-                    'file_progress': 0,
-                    'message': 'Running LLM extraction'
-                }
-            )
-            
-            logger.info(f"Processing file {i+1}/{len(files)}: {filename}")
+            # Extract runs of small files together, saving an LLM request per file
+            if len(unit_files) > 1:
+                try:
+                    batch_results = process_file_batch(
+                        unit_files, [markdown_cache[f] for f in unit_files], source, dataset_name,
+                        config, schema, extracted_dir
+                    )
+                except Exception as e:
+                    logger.error(f"Error in batch extraction starting at {unit_files[0]}: {str(e)}", exc_info=True)
+                    batch_results = None
+                if batch_results is not None:
+                    return [
+                        {'filename': f, 'success': True, 'data': result['data'], 'merge_reasoning_history': []}
+                        for f, result in zip(unit_files, batch_results)
+                    ]
             
-            # Process the file
-            try:
-                # Use cached markdown content if available
-                markdown_content = markdown_cache.get(filename)
-                if markdown_content:
-                    print(f"[Extraction Task] Using cached markdown content for {filename}, size: {len(markdown_content)} characters")
-                else:
-                    print(f"[Extraction Task] No cached markdown found for {filename}, will process as-is")
+            unit_results = []
+            for offset, filename in enumerate(unit_files):
+                logger.info(f"Processing file {start+offset+1}/{len(files)}: {filename}")
+                try:
+                    # Use cached markdown content if available
+                    markdown_content = markdown_cache.get(filename)
+                    if markdown_content:
+                        print(f"[Extraction Task] Using cached markdown content for {filename}, size: {len(markdown_content)} characters")
+                    else:
+                        print(f"[Extraction Task] No cached markdown found for {filename}, will process as-is")
+                    
+                    result = process_file(filename, source, dataset_name, config, markdown_content, extracted_dir, schema)
+                    print(f"[Extraction Task] LLM extraction completed for {filename}")
+                    unit_results.append({
+                        'filename': filename,
+                        'success': True,
+                        'data': result.get('data', {}),
+                        'merge_reasoning_history': result['merge_reasoning_history']
+                    })
+                except Exception as e:
+                    print(f"[Extraction Task] ERROR processing file {filename}: {str(e)}")
+                    logger.error(f"Error processing file {filename}: {str(e)}", exc_info=True)
+                    # Continue with the next file despite errors
+                    unit_results.append({'filename': filename, 'success': False})
+            return unit_results
+        
+        # Units run in windows of EXTRACTION_WORKERS, so pausing or cancelling
+        # takes effect between windows and files still complete in order,
+        # which resuming an extraction relies on. The workers only return their
+        # results; the progress record is updated here, once per window, so
+        # files running at the same time do not overwrite each other's progress.
+        all_results = []
+        extraction_state = extraction_progress.get_extraction_state(source, dataset_name)
+        processed_files = (extraction_state or {}).get('processed_files') or 0
+        max_workers = max(1, EXTRACTION_WORKERS)
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='llm-extract') as executor:
+            for w in range(0, len(units), max_workers):
+                window = units[w:w + max_workers]
+                first_index, first_files = window[0]
+                
+                # Check if extraction has been paused or cancelled
+                current_status = extraction_progress.get_extraction_status(source, dataset_name)
                 
-                result = process_file(filename, source, dataset_name, config, markdown_content)
-                print(f"[Extraction Task] LLM extraction completed for {filename}")
+                if not current_status or current_status == 'cancelled':
+                    print(f"[Extraction Task] Extraction cancelled for {source}/{dataset_name}")
+                    logger.info(f"Extraction cancelled for {source}/{dataset_name}")
+                    return
                 
-                # Store the processing status
-                all_results.append({
-                    'filename': filename,
-                    'success': True
-                })
+                if current_status == 'paused':
+                    print(f"[Extraction Task] Extraction paused for {source}/{dataset_name} at file {first_index+1}/{len(files)}")
+                    logger.info(f"Extraction paused for {source}/{dataset_name} at file {first_index+1}/{len(files)}")
+                    return
                 
-                # Update processed files count
-                print(f"[Extraction Task] Updating processed files count: {i+1}/{len(files)}")
+                # Update the current file information, and clear the merge
+                # reasoning of the previous window
+                print(f"[Extraction Task] Starting LLM extraction for file {first_index+1}/{len(files)}: {first_files[0]}")
                 extraction_progress.update_extraction_progress(
                     source, 
                     dataset_name, 
                     {
-                        'processed_files': i + 1
+                        'current_file': first_files[0],
+                        'current_file_index': first_index,
+                        'file_progress': 0,
+                        'message': 'Running LLM extraction',
+                        'merge_reasoning_history': None
                     }
                 )
                 
-            except Exception as e:
-                print(f"[Extraction Task] ERROR processing file {filename}: {str(e)}")
-                logger.error(f"Error processing file {filename}: {str(e)}", exc_info=True)
-                # Continue with the next file despite errors
+                window_results = []
+                for unit_results in executor.map(extract_unit, window):
+                    window_results.extend(unit_results)
+                all_results.extend(window_results)
+                
+                # Update processed files count, merged data and merge reasoning
+                # from the files of the window that succeeded
+                succeeded = [result for result in window_results if result['success']]
+                processed_files += len(succeeded)
+                print(f"[Extraction Task] Updating processed files count: {processed_files}/{len(files)}")
+                window_update = {'processed_files': processed_files}
+                if succeeded:
+                    window_update['merged_data'] = succeeded[-1]['data']
+                merge_reasoning_history = [
+                    entry for result in succeeded for entry in result['merge_reasoning_history']
+                ]
+                if merge_reasoning_history:
+                    window_update['merge_reasoning_history'] = merge_reasoning_history
+                extraction_progress.update_extraction_progress(source, dataset_name, window_update)
         
         # Complete the extraction
         print(f"\n[Extraction Task] All files processed, completing extraction task")
@@ -917,7 +989,7 @@ def poll_for_extractions():
                 # We'll use a database lock to prevent duplicate processing
                 with db.get_session() as check_session:
                     # Check if the extraction is still in a pending state
-                    current_extraction = check_session.query(ExtractionProgress).get(extraction.id)
+                    current_extraction = check_session.get(ExtractionProgress, extraction.id)
                     if not current_extraction or current_extraction.status not in ['scheduled', 'paused', 'in_progress']:
                         logger.info(f"Extraction {extraction.id} ({extraction.source}/{extraction.dataset_name}) is no longer pending, skipping")
                         continue
@@ -55,6 +55,9 @@ class Config:
         # Database Configuration
         self.DATABASE_NAME: str = os.getenv('DATABASE_NAME', 'schemas.db')
         self.DATABASE_URL: str = os.getenv('DATABASE_URL', f'sqlite:///{self.DATABASE_NAME}')
+        self.DB_POOL_SIZE: int = int(os.getenv('DB_POOL_SIZE', '10'))
+        self.DB_MAX_OVERFLOW: int = int(os.getenv('DB_MAX_OVERFLOW', '20'))
+        self.DB_POOL_RECYCLE: int = int(os.getenv('DB_POOL_RECYCLE', '1800'))
         
         # Flask Configuration
         self.SECRET_KEY: str = os.getenv('SECRET_KEY', 'dev')
@@ -123,9 +126,23 @@ class Config:
         # Default settings
         self.DEFAULT_TEMPERATURE: float = 0.3
         self.DEFAULT_MAX_TOKENS: int = 4000
-        self.MAX_CHUNK_SIZE: int = 8000
+        # Characters of document text sent per extraction request; raise for models with larger context windows
+        self.MAX_CHUNK_SIZE: int = int(os.getenv('MAX_CHUNK_SIZE', '8000'))
         self.MIN_CHUNK_SIZE: int = 100
         self.DATA_DIR: str = os.getenv('DATA_DIR', '.data')
+        
+        # Directory for caching LLM extraction results, caching is off when empty
+        self.LLM_CACHE_DIR: str = os.getenv('LLM_CACHE_DIR', '')
+        
+        # Limits on requests to the LLM backend across all extraction threads
+        self.LLM_MAX_CONCURRENCY: int = int(os.getenv('LLM_MAX_CONCURRENCY', '8'))
+        self.LLM_REQUESTS_PER_SECOND: float = float(os.getenv('LLM_REQUESTS_PER_SECOND', '0'))
+        
+        # Files of a dataset extraction sent to the LLM at the same time
+        self.EXTRACTION_WORKERS: int = int(os.getenv('EXTRACTION_WORKERS', '4'))
+        
+        # Most small files extracted together in one LLM request, 1 sends each file on its own
+        self.EXTRACTION_BATCH_MAX_FILES: int = int(os.getenv('EXTRACTION_BATCH_MAX_FILES', '1'))
 
 # Create a singleton instance
 config = Config() 
\ No newline at end of file
@@ -48,6 +48,9 @@ DATABASE_NAME: str = config.DATABASE_NAME
 DEFAULT_DATABASE_NAME: str = 'schemas.db'  # Default database name
 DATABASE_URL: str = config.DATABASE_URL
 DEFAULT_DATABASE_URL: str = f'sqlite:///{DEFAULT_DATABASE_NAME}'  # For backward compatibility
+DB_POOL_SIZE: int = config.DB_POOL_SIZE
+DB_MAX_OVERFLOW: int = config.DB_MAX_OVERFLOW
+DB_POOL_RECYCLE: int = config.DB_POOL_RECYCLE
 
 # Flask Configuration
 SECRET_KEY: str = config.SECRET_KEY
@@ -67,3 +70,16 @@ MIN_CHUNK_SIZE: int = config.MIN_CHUNK_SIZE
 
 # Data directory
 DATA_DIR: str = config.DATA_DIR
+
+# LLM extraction cache directory, empty when caching is disabled
+LLM_CACHE_DIR: str = config.LLM_CACHE_DIR
+
+# LLM request limits, a rate of 0 means unlimited
+LLM_MAX_CONCURRENCY: int = config.LLM_MAX_CONCURRENCY
+LLM_REQUESTS_PER_SECOND: float = config.LLM_REQUESTS_PER_SECOND
+
+# Files of a dataset extraction processed at the same time
+EXTRACTION_WORKERS: int = config.EXTRACTION_WORKERS
+
+# Most small files extracted in one LLM request, 1 disables batching
+EXTRACTION_BATCH_MAX_FILES: int = config.EXTRACTION_BATCH_MAX_FILES
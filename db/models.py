@@ -1,15 +1,41 @@
 import json
 from datetime import datetime
-from typing import Dict, Any, List, Optional, cast
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Float, Text, JSON
+from typing import Dict, Any, List, Mapping, Optional, cast
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Float, Text, JSON, Index
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, Mapped, mapped_column
+from sqlalchemy.sql.expression import FunctionElement
 
 from type_definitions import SchemaDefinition, StorageType
+from utils.json_utils import RawJSON
 
 Base = declarative_base()
 
 
+class local_now(FunctionElement):
+    """
+    The database's current local time, with sub-second precision
+
+    Used for timestamps that are stamped inside the UPDATE itself rather than
+    built in Python. SQLite's CURRENT_TIMESTAMP only has whole seconds, which
+    is too coarse for values used as ETags on progress that changes several
+    times a second.
+    """
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(local_now)
+def _compile_local_now(element: local_now, compiler: Any, **kw: Any) -> str:
+    return 'LOCALTIMESTAMP'
+
+
+@compiles(local_now, 'sqlite')
+def _compile_local_now_sqlite(element: local_now, compiler: Any, **kw: Any) -> str:
+    return "strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime')"
+
+
 class Schema(Base):
     """Schema model for storing JSON schemas"""
     
@@ -53,6 +79,24 @@ class DatasetSchemaMapping(Base):
         return f"<DatasetSchemaMapping(id={self.id}, dataset='{self.dataset_name}', source='{self.source}')>"
 
 
+# Mapping lookups filter on dataset and source together
+Index(
+    'ix_dsm_lookup',
+    DatasetSchemaMapping.dataset_name,
+    DatasetSchemaMapping.source
+)
+
+
+# JSON text columns of ExtractionProgress, with the value they serialize to when empty
+_JSON_COLUMN_DEFAULTS: Dict[str, Any] = {
+    'files': [],
+    'merged_data': None,
+    'merge_reasoning_history': None,
+    'schema': None
+}
+_DATETIME_COLUMNS = ('start_time', 'end_time', 'updated_at')
+
+
 class ExtractionProgress(Base):
     """
     Model for tracking extraction progress
@@ -72,8 +116,10 @@ class ExtractionProgress(Base):
     total_chunks: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     current_chunk: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     files: Mapped[str] = mapped_column(String, nullable=False)
-    merged_data: Mapped[Optional[str]] = mapped_column(String, nullable=True)  # JSON for merged data
-    merge_reasoning_history: Mapped[Optional[str]] = mapped_column(String, nullable=True)  # JSON for merge reasoning history
+    # The merge columns can hold megabytes of JSON, so they are only loaded when
+    # accessed or when a query undefers the 'merge_data' group
+    merged_data: Mapped[Optional[str]] = mapped_column(String, nullable=True, deferred=True, deferred_group='merge_data')  # JSON for merged data
+    merge_reasoning_history: Mapped[Optional[str]] = mapped_column(String, nullable=True, deferred=True, deferred_group='merge_data')  # JSON for merge reasoning history
     schema: Mapped[Optional[str]] = mapped_column(String, nullable=True)  # JSON schema for extraction
     provider: Mapped[Optional[str]] = mapped_column(String, nullable=True)  # LLM provider (e.g., 'openai', 'anthropic')
     model: Mapped[Optional[str]] = mapped_column(String, nullable=True)  # LLM model name
@@ -82,38 +128,47 @@ class ExtractionProgress(Base):
     start_time: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     end_time: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     duration: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
-    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.now, onupdate=datetime.now)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=local_now(), onupdate=local_now())
     
     def __repr__(self):
         return f"<ExtractionProgress(id={self.id}, dataset={self.dataset_name}, status={self.status})>"
     
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            'id': self.id,
-            'source': self.source,
-            'dataset_name': self.dataset_name,
-            'status': self.status,
-            'message': self.message,
-            'total_files': self.total_files,
-            'processed_files': self.processed_files,
-            'current_file': self.current_file,
-            'current_file_index': self.current_file_index,
-            'file_progress': self.file_progress,
-            'total_chunks': self.total_chunks,
-            'current_chunk': self.current_chunk,
-            'files': json.loads(self.files) if self.files else [],
-            'merged_data': json.loads(self.merged_data) if self.merged_data else None,
-            'merge_reasoning_history': json.loads(self.merge_reasoning_history) if self.merge_reasoning_history else None,
-            'schema': json.loads(self.schema) if self.schema else None,
-            'provider': self.provider,
-            'model': self.model,
-            'use_api': self.use_api,
-            'temperature': self.temperature,
-            'start_time': self.start_time.isoformat() if self.start_time else None,
-            'end_time': self.end_time.isoformat() if self.end_time else None,
-            'duration': self.duration,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
+        # Loaded columns are read straight from the instance state, skipping
+        # the attribute descriptors; expired or unloaded ones still go through
+        # getattr so they are loaded
+        state = self.__dict__
+        return self.row_to_dict({
+            key: state[key] if key in state else getattr(self, key)
+            for key in _COLUMN_KEYS
+        })
+    
+    @staticmethod
+    def row_to_dict(row: Mapping[str, Any], raw_json: bool = False) -> Dict[str, Any]:
+        """
+        Serialize a Core result row of the extraction_progress table
+        
+        Produces the same dict as to_dict, without loading an ORM instance.
+        
+        Args:
+            row: Row mapping holding every column of the table
+            raw_json: Wrap the stored JSON text in RawJSON instead of decoding
+                it, for responses written with dumps_with_raw
+            
+        Returns:
+            The row as a JSON serializable dict
+        """
+        data = dict(row)
+        for key, empty in _JSON_COLUMN_DEFAULTS.items():
+            value = data[key]
+            if not value:
+                data[key] = empty
+            else:
+                data[key] = RawJSON(value) if raw_json else json.loads(value)
+        for key in _DATETIME_COLUMNS:
+            value = data[key]
+            data[key] = value.isoformat() if value else None
+        return data
         
     def get_files(self):
         """Get the list of files as a Python list"""
@@ -159,4 +214,27 @@ class ExtractionProgress(Base):
             current_history = []
             
         current_history.append(reasoning_entry)
-        self.set_merge_reasoning_history(current_history) 
\ No newline at end of file
+        self.set_merge_reasoning_history(current_history) 
+
+# Column attribute names in table order, as serialized by to_dict
+_COLUMN_KEYS = tuple(column.key for column in ExtractionProgress.__table__.columns)
+
+# Lookups by dataset and status (resume, pause, active checks) seek on this
+# index instead of scanning the table
+Index(
+    'ix_ep_lookup',
+    ExtractionProgress.source,
+    ExtractionProgress.dataset_name,
+    ExtractionProgress.status,
+    ExtractionProgress.start_time.desc()
+)
+
+# Partial index over the handful of running extractions, matching the
+# filter used by the active extraction queries
+_active_extraction_filter = (ExtractionProgress.status == 'in_progress') & ExtractionProgress.end_time.is_(None)
+Index(
+    'ix_ep_active',
+    ExtractionProgress.updated_at,
+    postgresql_where=_active_extraction_filter,
+    sqlite_where=_active_extraction_filter
+)
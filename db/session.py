@@ -1,10 +1,11 @@
 import logging
-from typing import Optional, Any
+from typing import Optional, Any, Dict
 from sqlalchemy import create_engine
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import sessionmaker, scoped_session, Session
+from sqlalchemy.pool import QueuePool
 from .models import Base
-from constants import DEFAULT_DATABASE_NAME
+from constants import DEFAULT_DATABASE_NAME, DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_RECYCLE
 
 logger = logging.getLogger(__name__)
 
@@ -19,9 +20,43 @@ class Database:
         Args:
             database_url: SQLAlchemy database URL
         """
-        self.engine: Engine = create_engine(database_url)
+        self.engine: Engine = create_engine(database_url, **self._pool_options(database_url))
         self.session_factory = sessionmaker(bind=self.engine)
         self.Session = scoped_session(self.session_factory)
+        # Sessions for read-only handlers run in autocommit mode, so polled
+        # SELECTs skip the BEGIN/COMMIT round trips of a transaction
+        self.readonly_session_factory = sessionmaker(
+            bind=self.engine.execution_options(isolation_level='AUTOCOMMIT'),
+            autoflush=False
+        )
+        self.ReadOnlySession = scoped_session(self.readonly_session_factory)
+    
+    @staticmethod
+    def _pool_options(database_url: str) -> Dict[str, Any]:
+        """
+        Get the connection pool options for a database URL
+        
+        Connections are kept in a QueuePool so request handlers reuse them
+        instead of reconnecting on every poll. In-memory SQLite databases
+        only exist for a single connection, so they keep SQLAlchemy's default.
+        
+        Args:
+            database_url: SQLAlchemy database URL
+            
+        Returns:
+            Keyword arguments for create_engine
+        """
+        url = make_url(database_url)
+        if url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:'):
+            return {}
+        
+        return {
+            'poolclass': QueuePool,
+            'pool_size': DB_POOL_SIZE,
+            'max_overflow': DB_MAX_OVERFLOW,
+            'pool_pre_ping': True,
+            'pool_recycle': DB_POOL_RECYCLE
+        }
     
     def create_tables(self, drop_first: bool = False, recreate_schema: bool = False) -> None:
         """
@@ -81,6 +116,19 @@ class Database:
         """
         return self.Session()
     
+    def get_readonly_session(self) -> Session:
+        """
+        Get a database session for read-only queries
+        
+        The session's connection runs in autocommit mode, so it must not be
+        used for writes. Server-side cursors (stream_results) need a
+        transaction on some backends and should use get_session instead.
+        
+        Returns:
+            SQLAlchemy session
+        """
+        return self.ReadOnlySession()
+    
     def close_session(self, session: Session) -> None:
         """
         Close a database session
@@ -93,6 +141,7 @@ class Database:
     def close_all_sessions(self) -> None:
         """Close all sessions"""
         self.Session.remove()
+        self.ReadOnlySession.remove()
     
     def dispose_engine(self) -> None:
         """Dispose of the engine"""
@@ -14,18 +14,27 @@ Arguments:
 """
 
 import argparse
+import hashlib
+import io
+import json
 import logging
 import os
+import shutil
 import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from dotenv import load_dotenv
 from flask import Flask
 
 from db import init_db, db, Schema, DatasetSchemaMapping
 from storage import create_storage
-from routes.extractors import process_file
+from batch.extraction_processor import process_file
+from routes.extractors import get_extractor_config
 from routes import register_blueprints
-from constants import MODEL_CONFIGS, DEFAULT_OLLAMA_HOST, DEFAULT_OLLAMA_API_PATH, DEFAULT_DATABASE_NAME
+from utils.pdf_utils import pdf_to_markdown
+from constants import MODEL_CONFIGS, DEFAULT_OLLAMA_HOST, DEFAULT_OLLAMA_API_PATH, DEFAULT_DATABASE_NAME, EXTRACTION_WORKERS
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, 
@@ -35,6 +44,152 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_dotenv()
 
+# Name of the file in the output directory recording which PDFs have been extracted
+PROCESSED_INDEX_FILENAME = '.index.json'
+
+def load_processed_index(storage, output_dir):
+    """
+    Load the processed file index of an output directory
+
+    The index maps the SHA1 of each extracted PDF to the output file it was
+    extracted to, the hash of the schema used and when it was extracted.
+
+    Returns:
+        The index, or an empty one if it does not exist or cannot be read
+    """
+    index_file = storage.get_file(output_dir, PROCESSED_INDEX_FILENAME)
+    if index_file is None:
+        return {}
+    try:
+        with index_file:
+            index = json.load(index_file)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable processed index in {output_dir}: {e}")
+        return {}
+    return index if isinstance(index, dict) else {}
+
+def save_processed_index(storage, output_dir, index):
+    """Save the processed file index of an output directory"""
+    data = json.dumps(index, indent=2).encode('utf-8')
+    storage.save_file(output_dir, io.BytesIO(data), PROCESSED_INDEX_FILENAME)
+
+def hash_file(storage, dataset_name, filename):
+    """Return the SHA1 hex digest of a file in storage, or None if it is missing"""
+    file_obj = storage.get_file(dataset_name, filename)
+    if file_obj is None:
+        return None
+    digest = hashlib.sha1()
+    with file_obj:
+        for block in iter(lambda: file_obj.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def extract_file(storage, source, dataset_name, output_dir, filename, schema_data, config):
+    """
+    Extract one PDF file of a dataset and save the result to the output directory
+
+    The result is also written under DATA_DIR/extracted, like extractions
+    started from the web app.
+
+    Returns:
+        A success result with the output file path
+    """
+    # Local storage files are converted in place; other backends are copied
+    # to a temporary file first
+    temp_file_path = None
+    pdf_path = storage.get_local_path(dataset_name, filename)
+    if not pdf_path:
+        file_obj = storage.get_file(dataset_name, filename)
+        if file_obj is None:
+            raise FileNotFoundError(f"File {filename} not found in dataset {dataset_name}")
+        with file_obj, tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as temp_file:
+            shutil.copyfileobj(file_obj, temp_file)
+            temp_file_path = pdf_path = temp_file.name
+    try:
+        markdown_content = pdf_to_markdown(pdf_path)
+    finally:
+        if temp_file_path:
+            os.unlink(temp_file_path)
+    
+    result = process_file(filename, source, dataset_name, config, markdown_content, schema=schema_data)
+    
+    output_filename = os.path.splitext(os.path.basename(filename))[0] + '.json'
+    data = json.dumps(result.get('data', {}), indent=2).encode('utf-8')
+    storage.save_file(output_dir, io.BytesIO(data), output_filename)
+    return {'status': 'success', 'output_file': f"{output_dir}/{output_filename}"}
+
+def extract_pdf_files(storage, source, dataset_name, output_dir, pdf_files, schema_data, config):
+    """
+    Extract the PDF files of a dataset, skipping files already extracted
+
+    A file is skipped when the processed index has its content hash with the
+    same schema, and its output file still exists.
+
+    Returns:
+        The result of each file, in file order
+    """
+    schema_hash = hashlib.sha1(
+        json.dumps(schema_data, sort_keys=True, default=str).encode('utf-8')
+    ).hexdigest()
+    
+    # Skip files that were already extracted with this schema and whose
+    # output still exists
+    index = load_processed_index(storage, output_dir)
+    existing_outputs = {f.get('name') for f in storage.list_files(output_dir)}
+    results_by_file = {}
+    file_hashes = {}
+    to_process = []
+    for filename in pdf_files:
+        file_hash = hash_file(storage, dataset_name, filename)
+        file_hashes[filename] = file_hash
+        entry = index.get(file_hash) if file_hash else None
+        if (entry and entry.get('schema_hash') == schema_hash
+                and os.path.basename(entry.get('output_file', '')) in existing_outputs):
+            logger.info(f"Skipping unchanged file: {filename}")
+            results_by_file[filename] = {'status': 'skipped', 'output_file': entry['output_file']}
+        else:
+            to_process.append(filename)
+    
+    def process_pdf(filename):
+        """Process one file, reporting failures as an error result"""
+        try:
+            return extract_file(storage, source, dataset_name, output_dir, filename, schema_data, config)
+        except Exception as e:
+            logger.error(f"Error processing {filename}: {str(e)}", exc_info=True)
+            return {'status': 'error', 'message': str(e)}
+    
+    # Files are independent and mostly wait on the LLM, so process them
+    # concurrently, as many at once as the batch processor does; each file
+    # also extracts its chunks concurrently. map keeps the results in file order
+    max_workers = max(1, min(EXTRACTION_WORKERS, len(to_process)))
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='cli-extract') as executor:
+        for filename, result in zip(to_process, executor.map(process_pdf, to_process)):
+            results_by_file[filename] = result
+            
+            # Print result
+            status = result.get('status', 'unknown')
+            output_file = result.get('output_file', 'N/A')
+            if status == 'success':
+                logger.info(f"✅ {filename}: Extracted to {output_file}")
+                # Record the file straight away so an interrupted run
+                # does not redo it
+                if file_hashes[filename]:
+                    index[file_hashes[filename]] = {
+                        'filename': filename,
+                        'output_file': output_file,
+                        'schema_hash': schema_hash,
+                        'timestamp': time.time()
+                    }
+                    save_processed_index(storage, output_dir, index)
+            else:
+                logger.error(f"❌ {filename}: {result.get('message', 'Unknown error')}")
+    
+    skipped = len(pdf_files) - len(to_process)
+    if skipped:
+        logger.info(f"Skipped {skipped} files that were already extracted.")
+    return [results_by_file[filename] for filename in pdf_files]
+
+
 def create_app():
     """Create a Flask app for configuration"""
     app = Flask(__name__)
@@ -99,18 +254,19 @@ def extract_dataset(dataset_name, source='local'):
             # Create storage instance
             storage = create_storage(storage_type, storage_config)
             
-            # Get dataset mapping to find schema
-            mapping = session.query(DatasetSchemaMapping).filter_by(
-                dataset_name=dataset_name,
-                source=source
+            # Get dataset mapping and its schema in one query
+            row = session.query(DatasetSchemaMapping, Schema).outerjoin(
+                Schema, Schema.id == DatasetSchemaMapping.schema_id
+            ).filter(
+                DatasetSchemaMapping.dataset_name == dataset_name,
+                DatasetSchemaMapping.source == source
             ).first()
             
-            if not mapping or not mapping.schema_id:
+            if not row or not row[0].schema_id:
                 logger.error(f"No schema associated with dataset {dataset_name}")
                 return False
             
-            # Get schema
-            schema = session.query(Schema).get(mapping.schema_id)
+            mapping, schema = row
             if not schema:
                 logger.error(f"Schema with ID {mapping.schema_id} not found")
                 return False
@@ -137,25 +293,17 @@ def extract_dataset(dataset_name, source='local'):
                 cached_dir.mkdir(exist_ok=True, parents=True)
                 logger.info(f"Using cached directory: {cached_dir}")
             
-            # Process each file
-            results = []
-            for file_info in files:
-                filename = file_info.get('name')
-                if not filename.lower().endswith('.pdf'):
-                    logger.info(f"Skipping non-PDF file: {filename}")
-                    continue
-                    
-                result = process_file(storage, dataset_name, output_dir, filename, schema.schema)
-                results.append(result)
-                
-                # Print result
-                status = result.get('status', 'unknown')
-                output_file = result.get('output_file', 'N/A')
-                if status == 'success':
-                    logger.info(f"✅ {filename}: Extracted to {output_file}")
-                else:
-                    logger.error(f"❌ {filename}: {result.get('message', 'Unknown error')}")
-                
+            # Collect the PDF files to process
+            pdf_files = [
+                file_info['name'] for file_info in files
+                if file_info.get('name', '').lower().endswith('.pdf')
+            ]
+            logger.info(f"{len(pdf_files)}/{len(files)} files are PDFs to process")
+            
+            results = extract_pdf_files(
+                storage, source, dataset_name, output_dir, pdf_files, schema.schema, get_extractor_config()
+            )
+            
             logger.info(f"Extraction complete. Processed {len(results)} files.")
             return True
                 
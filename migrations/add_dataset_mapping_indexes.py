@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Migration script to add the lookup index to the DatasetSchemaMapping table
+"""
+import os
+import sys
+import logging
+from sqlalchemy import inspect
+
+# Add the parent directory to the path so we can import the db module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db import db, DatasetSchemaMapping
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def run_migration():
+    """Run the migration to add indexes to the DatasetSchemaMapping table"""
+    logger.info("Starting migration to add indexes to DatasetSchemaMapping table")
+    
+    try:
+        inspector = inspect(db.engine)
+        existing_indexes = {
+            index['name']: index['column_names'] for index in inspector.get_indexes('dataset_schema_mappings')
+        }
+        
+        for index in DatasetSchemaMapping.__table__.indexes:
+            if index.name in existing_indexes:
+                # Rebuild indexes created from an older definition
+                if existing_indexes[index.name] == [column.name for column in index.columns]:
+                    continue
+                logger.info(f"Dropping outdated index {index.name}")
+                index.drop(db.engine)
+            logger.info(f"Creating index {index.name}")
+            index.create(db.engine)
+        
+        logger.info("Migration completed successfully")
+            
+    except Exception as e:
+        logger.error(f"Error running migration: {e}")
+        raise
+
+if __name__ == "__main__":
+    run_migration()
@@ -71,7 +71,7 @@ def edit_schema():
             return jsonify({'error': 'schema_id is required'}), 400
             
         session = db.get_session()
-        schema = session.query(Schema).get(schema_id)
+        schema = session.get(Schema, schema_id)
         if not schema:
             return jsonify({'error': 'Schema not found'}), 404
             
@@ -1,13 +1,21 @@
 import logging
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, request, jsonify
+from sqlalchemy.orm import selectinload
 
 from db import db, Schema, DatasetSchemaMapping
-from storage import create_storage
+from storage import create_storage, get_storage_config
+from utils.json_utils import validate_json_fields
+from constants import STORAGE_TYPE
 
 logger = logging.getLogger(__name__)
 
 datasets_bp = Blueprint('datasets', __name__, url_prefix='/api')
 
+# Expected JSON body fields for the mapping endpoints
+MAPPING_FIELDS = {'dataset_name': str, 'source': str}
+MAPPING_OPTIONAL_FIELDS = {'schema_id': (int, type(None))}
+APPLY_SCHEMA_FIELDS = {'schema_id': int}
+
 
 @datasets_bp.route('/datasets', methods=['GET'])
 def get_datasets():
@@ -15,24 +23,9 @@ def get_datasets():
     try:
         logger.info("Starting GET /api/datasets request")
         
-        # Get storage configuration from app config
-        storage_type = current_app.config.get('STORAGE_TYPE', 'local')
-        storage_config = {}
-        
-        if storage_type == 's3':
-            storage_config = {
-                'bucket_name': current_app.config.get('S3_BUCKET_NAME'),
-                'aws_access_key_id': current_app.config.get('AWS_ACCESS_KEY_ID'),
-                'aws_secret_access_key': current_app.config.get('AWS_SECRET_ACCESS_KEY'),
-                'region_name': current_app.config.get('AWS_REGION')
-            }
-        else:
-            storage_config = {
-                'storage_path': current_app.config.get('LOCAL_STORAGE_PATH', '.data')
-            }
-        
         # Create storage instance
-        storage = create_storage(storage_type, storage_config)
+        storage_type = STORAGE_TYPE
+        storage = create_storage(storage_type, get_storage_config(storage_type))
         
         # Get datasets from storage
         local_datasets = []
@@ -58,28 +51,14 @@ def get_datasets():
 
 
 @datasets_bp.route('/dataset/<source>/<path:dataset_name>/files', methods=['GET'])
+@datasets_bp.route('/dataset-files/<source>/<path:dataset_name>', methods=['GET'])
 def get_dataset_files(source, dataset_name):
     """Get all files in a dataset"""
     try:
-        logger.info(f"Starting GET /api/dataset/{source}/{dataset_name}/files request")
-        
-        # Get storage configuration from app config
-        storage_config = {}
-        
-        if source == 's3':
-            storage_config = {
-                'bucket_name': current_app.config.get('S3_BUCKET_NAME'),
-                'aws_access_key_id': current_app.config.get('AWS_ACCESS_KEY_ID'),
-                'aws_secret_access_key': current_app.config.get('AWS_SECRET_ACCESS_KEY'),
-                'region_name': current_app.config.get('AWS_REGION')
-            }
-        else:
-            storage_config = {
-                'storage_path': current_app.config.get('LOCAL_STORAGE_PATH', '.data')
-            }
+        logger.info(f"Starting GET {request.path} request")
         
         # Create storage instance
-        storage = create_storage(source, storage_config)
+        storage = create_storage(source, get_storage_config(source))
         
         # Get files from storage
         files = storage.list_files(dataset_name)
@@ -91,7 +70,7 @@ def get_dataset_files(source, dataset_name):
             'files': files
         })
     except Exception as e:
-        logger.error(f"Error in GET /api/dataset/{source}/{dataset_name}/files: {str(e)}", exc_info=True)
+        logger.error(f"Error in GET {request.path}: {str(e)}", exc_info=True)
         return jsonify({'error': str(e)}), 500
 
 
@@ -101,23 +80,21 @@ def get_dataset_mappings():
     session = db.get_session()
     try:
         logger.info("Starting GET /api/dataset-mappings request")
-        mappings = session.query(DatasetSchemaMapping).all()
+        # Load the schema names for all mappings in one extra query
+        # rather than one lookup per mapping
+        mappings = session.query(DatasetSchemaMapping).options(
+            selectinload(DatasetSchemaMapping.schema).load_only(Schema.id, Schema.name)
+        ).all()
         logger.info(f"Successfully retrieved {len(mappings)} dataset mappings from database")
         
         result = []
         for mapping in mappings:
-            schema_name = None
-            if mapping.schema_id:
-                schema = session.query(Schema).get(mapping.schema_id)
-                if schema:
-                    schema_name = schema.name
-                    
             mapping_dict = {
                 'id': mapping.id,
                 'dataset_name': mapping.dataset_name,
                 'source': mapping.source,
                 'schema_id': mapping.schema_id,
-                'schema_name': schema_name,
+                'schema_name': mapping.schema.name if mapping.schema else None,
                 'created_at': mapping.created_at.isoformat() if mapping.created_at else None
             }
             result.append(mapping_dict)
@@ -137,12 +114,14 @@ def create_or_update_mapping():
     session = db.get_session()
     try:
         logger.info("Starting POST /api/dataset-mappings request")
-        data = request.get_json()
+        data, error = validate_json_fields(
+            request.get_json(silent=True), MAPPING_FIELDS, MAPPING_OPTIONAL_FIELDS
+        )
         logger.debug(f"Received data: {data}")
         
-        if not data or 'dataset_name' not in data or 'source' not in data:
-            logger.error("Missing required fields in request data")
-            return jsonify({'error': 'Missing required fields'}), 400
+        if error:
+            logger.error(f"Invalid request data: {error}")
+            return jsonify({'error': error}), 400
             
         # Check if mapping already exists
         existing_mapping = session.query(DatasetSchemaMapping).filter_by(
@@ -185,14 +164,14 @@ def apply_schema_to_dataset(source, dataset_name):
     session = db.get_session()
     try:
         logger.info(f"Starting POST /api/apply-schema/{source}/{dataset_name} request")
-        data = request.get_json()
+        data, error = validate_json_fields(request.get_json(silent=True), APPLY_SCHEMA_FIELDS)
         
-        if not data or 'schema_id' not in data:
-            logger.error("Missing schema_id in request data")
-            return jsonify({'error': 'schema_id is required'}), 400
+        if error:
+            logger.error(f"Invalid request data: {error}")
+            return jsonify({'error': error}), 400
             
         schema_id = data['schema_id']
-        schema = session.query(Schema).get(schema_id)
+        schema = session.get(Schema, schema_id)
         
         if not schema:
             logger.error(f"Schema with ID {schema_id} not found")
@@ -232,44 +211,6 @@ def apply_schema_to_dataset(source, dataset_name):
         db.close_session(session)
 
 
-@datasets_bp.route('/dataset-files/<source>/<path:dataset_name>', methods=['GET'])
-def get_dataset_files_v2(source, dataset_name):
-    """Get all files in a dataset"""
-    try:
-        logger.info(f"Starting GET /api/dataset-files/{source}/{dataset_name} request")
-        
-        # Get storage configuration from app config
-        storage_config = {}
-        
-        if source == 's3':
-            storage_config = {
-                'bucket_name': current_app.config.get('S3_BUCKET_NAME'),
-                'aws_access_key_id': current_app.config.get('AWS_ACCESS_KEY_ID'),
-                'aws_secret_access_key': current_app.config.get('AWS_SECRET_ACCESS_KEY'),
-                'region_name': current_app.config.get('AWS_REGION')
-            }
-        else:
-            storage_config = {
-                'storage_path': current_app.config.get('LOCAL_STORAGE_PATH', '.data')
-            }
-        
-        # Create storage instance
-        storage = create_storage(source, storage_config)
-        
-        # Get files from storage
-        files = storage.list_files(dataset_name)
-        logger.info(f"Found {len(files)} files in dataset {dataset_name}")
-        
-        return jsonify({
-            'dataset': dataset_name,
-            'source': source,
-            'files': files
-        })
-    except Exception as e:
-        logger.error(f"Error in GET /api/dataset-files/{source}/{dataset_name}: {str(e)}", exc_info=True)
-        return jsonify({'error': str(e)}), 500
-
-
 @datasets_bp.route('/dataset-mapping/<source>/<path:dataset_name>', methods=['GET'])
 def get_dataset_mapping(source, dataset_name):
     """Get dataset-schema mapping for a specific dataset"""
@@ -277,13 +218,15 @@ def get_dataset_mapping(source, dataset_name):
     try:
         logger.info(f"Starting GET /api/dataset-mapping/{source}/{dataset_name} request")
         
-        # Find the mapping
-        mapping = session.query(DatasetSchemaMapping).filter_by(
-            dataset_name=dataset_name,
-            source=source
+        # Find the mapping along with its schema name
+        row = session.query(DatasetSchemaMapping, Schema.name).outerjoin(
+            Schema, Schema.id == DatasetSchemaMapping.schema_id
+        ).filter(
+            DatasetSchemaMapping.dataset_name == dataset_name,
+            DatasetSchemaMapping.source == source
         ).first()
         
-        if not mapping:
+        if not row:
             logger.info(f"No mapping found for dataset {dataset_name} (source: {source})")
             return jsonify({
                 'dataset_name': dataset_name,
@@ -292,12 +235,7 @@ def get_dataset_mapping(source, dataset_name):
                 'schema_name': None
             })
         
-        # Get schema name if available
-        schema_name = None
-        if mapping.schema_id:
-            schema = session.query(Schema).get(mapping.schema_id)
-            if schema:
-                schema_name = schema.name
+        mapping, schema_name = row
                 
         result = {
             'id': mapping.id,
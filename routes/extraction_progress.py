@@ -1,14 +1,23 @@
+import itertools
 import logging
+import os
 import time
 import threading
+import queue
 from datetime import datetime
-from typing import Dict, Any, List, Optional, Tuple, cast
-from flask import Blueprint, request, jsonify, Response
-from sqlalchemy import desc
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, Any, Callable, List, Optional, Sequence, Set, Tuple, Union, cast
+from flask import Blueprint, current_app, request, jsonify, Response
+from sqlalchemy import Column, delete, desc, func, select, update
+from sqlalchemy.engine import Row, RowMapping
+from sqlalchemy.orm import Session
 import json
 
 from db import db, ExtractionProgress
 from utils import extraction_progress
+from utils.json_utils import dumps_with_raw, validate_json_fields
+from utils.response_cache import cached_response, clear_response_cache, conditional_json, conditional_response
 from routes.extractors import handle_dataset_extraction
 
 logger = logging.getLogger(__name__)
@@ -16,29 +25,250 @@ logger = logging.getLogger(__name__)
 # Create a blueprint for extraction progress routes
 extraction_progress_bp = Blueprint('extraction_progress', __name__, url_prefix='/api')
 
+# Extractions started from this process share a bounded worker pool; requests
+# beyond MAX_PENDING_EXTRACTIONS queued or running jobs are turned away
+EXTRACTION_POOL_WORKERS = 4
+MAX_PENDING_EXTRACTIONS = 8
+_extraction_pool = ThreadPoolExecutor(max_workers=EXTRACTION_POOL_WORKERS, thread_name_prefix='extraction')
+_pending_extractions = 0
+_pending_lock = threading.Lock()
+# (source, dataset_name) of the extractions queued or running on the pool
+_pool_extractions: Set[Tuple[str, str]] = set()
+
+# Number of records returned by the per-dataset history endpoints unless the
+# client asks for more with ?limit=
+DEFAULT_HISTORY_LIMIT = 20
+
+# Rows fetched per round trip when streaming progress record lists
+STREAM_BATCH_SIZE = 500
+
+# Seconds between keep-alive comments on extraction event streams
+SSE_HEARTBEAT_SECONDS = 15
+
+# Text columns that hold JSON documents
+PROGRESS_JSON_FIELDS = {'files', 'merged_data', 'merge_reasoning_history', 'schema'}
+
+def progress_field_types(column: Column) -> Tuple[type, ...]:
+    """
+    Get the JSON types accepted for an extraction progress column
+    
+    Date columns take ISO 8601 strings and float columns take any number.
+    Nullable columns also take null.
+    
+    Args:
+        column: Column of the extraction_progress table
+        
+    Returns:
+        Tuple of accepted types
+    """
+    python_type = column.type.python_type
+    if python_type is datetime:
+        accepted: Tuple[type, ...] = (str,)
+    elif python_type is float:
+        accepted = (int, float)
+    else:
+        accepted = (python_type,)
+    if column.nullable:
+        accepted += (type(None),)
+    return accepted
+
+# Fields accepted in create/update request bodies (any column but the primary key)
+PROGRESS_REQUIRED_FIELDS = {'dataset_name': str, 'source': str, 'status': str, 'total_files': int}
+PROGRESS_FIELDS = {
+    column.key: progress_field_types(column)
+    for column in ExtractionProgress.__table__.columns if column.key != 'id'
+}
+
+def parse_progress_fields(data: Dict[str, Any]) -> Optional[str]:
+    """
+    Convert validated request fields to column values, in place
+    
+    Date fields are parsed from ISO 8601 strings, and JSON text fields must
+    hold valid JSON.
+    
+    Args:
+        data: Fields checked against PROGRESS_FIELDS
+        
+    Returns:
+        Error message, or None if every field is valid
+    """
+    for key, value in data.items():
+        if value is None:
+            continue
+        if key in PROGRESS_JSON_FIELDS:
+            try:
+                json.loads(value)
+            except ValueError:
+                return f"Invalid JSON for field: {key}"
+        elif ExtractionProgress.__table__.columns[key].type.python_type is datetime:
+            try:
+                data[key] = datetime.fromisoformat(value)
+            except ValueError:
+                return f"Invalid date for field: {key}"
+    return None
+
+def progress_etag_source(progresses: Sequence[RowMapping]) -> List[Tuple[int, datetime]]:
+    """
+    Get the value an ETag for a list of extraction progress records is derived from
+    
+    Args:
+        progresses: Extraction progress rows in the response
+        
+    Returns:
+        The (id, updated_at) pair of each record
+    """
+    return [(progress['id'], progress['updated_at']) for progress in progresses]
+
+def query_dataset_history(
+    session: Session,
+    source: str,
+    dataset_name: str,
+    newest_first_by: Any
+) -> Sequence[RowMapping]:
+    """
+    Get the most recent extraction progress records for a dataset
+    
+    The records are read as plain rows rather than ORM instances, since
+    callers only serialize them.
+    
+    Args:
+        session: Database session
+        source: Source of the dataset (e.g., 'local', 's3')
+        dataset_name: Name of the dataset
+        newest_first_by: Column the records are ordered by, newest first
+        
+    Returns:
+        Up to get_history_limit() rows
+    """
+    return session.execute(
+        select(ExtractionProgress.__table__).where(
+            ExtractionProgress.source == source,
+            ExtractionProgress.dataset_name == dataset_name
+        ).order_by(desc(newest_first_by)).limit(get_history_limit())
+    ).mappings().all()
+
+def find_resumable_extraction(
+    session: Session,
+    source: str,
+    dataset_name: str,
+    statuses: Tuple[str, ...],
+    *columns: Any
+) -> Optional[Row]:
+    """
+    Find the latest extraction for a dataset in the first matching status
+    
+    Only the requested columns are loaded, so resuming never reads the large
+    merged data columns. Each lookup is served by the ix_ep_lookup index.
+    
+    Args:
+        session: Database session
+        source: Source of the dataset (e.g., 'local', 's3')
+        dataset_name: Name of the dataset
+        statuses: Statuses to look for, in order of preference
+        *columns: ExtractionProgress columns to load
+        
+    Returns:
+        Row with the requested columns, or None if there is no such extraction
+    """
+    for status in statuses:
+        extraction_record = session.query(*columns).filter(
+            ExtractionProgress.source == source,
+            ExtractionProgress.dataset_name == dataset_name,
+            ExtractionProgress.status == status
+        ).order_by(desc(ExtractionProgress.start_time)).limit(1).first()
+        if extraction_record:
+            return extraction_record
+    return None
+
+def get_history_limit() -> int:
+    """
+    Get the number of history records to return for a dataset
+    
+    Returns:
+        The 'limit' query parameter, or DEFAULT_HISTORY_LIMIT if it is missing or invalid
+    """
+    limit = request.args.get('limit', DEFAULT_HISTORY_LIMIT, type=int)
+    return limit if limit and limit > 0 else DEFAULT_HISTORY_LIMIT
+
+def stream_progress_records(prefix: str, order_by: Any) -> Response:
+    """
+    Stream all extraction progress records as a JSON response
+    
+    Rows are serialized one at a time from a server-side cursor, without
+    loading ORM instances, so memory stays flat regardless of how many
+    extractions have been recorded. The ETag comes from one aggregate query,
+    so polls while nothing has changed get a 304 without reading any rows.
+    
+    The query runs and its first batch of rows is fetched before the response
+    is returned, so database errors reach the caller's error handling instead
+    of cutting off a 200 response part way through.
+    
+    Args:
+        prefix: Opening of the JSON envelope, up to and including the '['
+        order_by: Column expression to order the records by
+        
+    Returns:
+        Streamed JSON response, or a 304 Not Modified response
+        
+    Raises:
+        Exception: If the records cannot be queried
+    """
+    # Any insert, update or delete changes the row count or the latest update time
+    with db.get_readonly_session() as session:
+        etag_source = tuple(session.query(
+            func.count(ExtractionProgress.id), func.max(ExtractionProgress.updated_at)
+        ).one())
+    
+    def build_response() -> Response:
+        session = db.get_session()
+        try:
+            rows = session.execute(
+                select(ExtractionProgress.__table__).order_by(order_by),
+                execution_options={'stream_results': True, 'yield_per': STREAM_BATCH_SIZE}
+            ).mappings()
+            first_rows = rows.fetchmany(STREAM_BATCH_SIZE)
+        except Exception:
+            db.close_session(session)
+            raise
+        
+        def generate():
+            try:
+                yield prefix
+                first = True
+                for row in itertools.chain(first_rows, rows):
+                    if not first:
+                        yield ','
+                    yield dumps_with_raw(ExtractionProgress.row_to_dict(row, raw_json=True))
+                    first = False
+                yield ']}'
+            except Exception as e:
+                logger.exception(f"Error streaming extraction progress records: {e}")
+                raise
+        
+        response = Response(generate(), mimetype='application/json')
+        response.call_on_close(lambda: db.close_session(session))
+        return response
+    
+    return conditional_response(build_response, etag_source)
+
 @extraction_progress_bp.route('/', methods=['GET'])
-def list_extraction_progress() -> Tuple[Response, int]:
+def list_extraction_progress() -> Union[Response, Tuple[Response, int]]:
     """
     Get a list of all extraction progress records
     
     Returns:
-        JSON response with all extraction progress records
+        Streamed JSON response with all extraction progress records
     """
     try:
-        session = db.get_session()
-        progresses = session.query(ExtractionProgress).order_by(desc(ExtractionProgress.updated_at)).all()
-        
-        return jsonify({
-            'extraction_progresses': [progress.to_dict() for progress in progresses]
-        }), 200
+        return stream_progress_records(
+            '{"extraction_progresses": [', desc(ExtractionProgress.updated_at)
+        )
     except Exception as e:
         logger.error(f"Error listing extraction progress: {str(e)}", exc_info=True)
         return jsonify({'error': str(e)}), 500
-    finally:
-        db.close_session(session)
 
 @extraction_progress_bp.route('/<int:progress_id>', methods=['GET'])
-def get_extraction_progress(progress_id: int) -> Tuple[Response, int]:
+def get_extraction_progress(progress_id: int) -> Union[Response, Tuple[Response, int]]:
     """
     Get a specific extraction progress record by ID
     
@@ -49,21 +279,28 @@ def get_extraction_progress(progress_id: int) -> Tuple[Response, int]:
         JSON response with the extraction progress record
     """
     try:
-        session = db.get_session()
-        progress = session.query(ExtractionProgress).get(progress_id)
-        
-        if not progress:
-            return jsonify({'error': f'Extraction progress with ID {progress_id} not found'}), 404
+        with db.get_readonly_session() as session:
+            # Check the version first, so unchanged polls never load the record
+            updated_at = session.query(ExtractionProgress.updated_at).filter(
+                ExtractionProgress.id == progress_id
+            ).scalar()
+            
+            if updated_at is None:
+                return jsonify({'error': f'Extraction progress with ID {progress_id} not found'}), 404
             
-        return jsonify(progress.to_dict()), 200
+            def build_payload() -> Dict[str, Any]:
+                row = session.execute(
+                    select(ExtractionProgress.__table__).where(ExtractionProgress.id == progress_id)
+                ).mappings().one()
+                return ExtractionProgress.row_to_dict(row, raw_json=True)
+                
+            return conditional_json(build_payload, (progress_id, updated_at))
     except Exception as e:
         logger.error(f"Error getting extraction progress: {str(e)}", exc_info=True)
         return jsonify({'error': str(e)}), 500
-    finally:
-        db.close_session(session)
 
 @extraction_progress_bp.route('/dataset/<source>/<path:dataset_name>', methods=['GET'])
-def get_extraction_progress_by_dataset(source: str, dataset_name: str) -> Tuple[Response, int]:
+def get_extraction_progress_by_dataset(source: str, dataset_name: str) -> Union[Response, Tuple[Response, int]]:
     """
     Get extraction progress records for a specific dataset
     
@@ -75,41 +312,51 @@ def get_extraction_progress_by_dataset(source: str, dataset_name: str) -> Tuple[
         JSON response with extraction progress records for the dataset
     """
     try:
-        session = db.get_session()
-        progresses = session.query(ExtractionProgress).filter_by(
-            source=source, 
-            dataset_name=dataset_name
-        ).order_by(desc(ExtractionProgress.updated_at)).all()
-        
-        # Return the most recent extraction progress, or a 404 if none found
-        if progresses:
-            return jsonify({
-                'most_recent': progresses[0].to_dict(),
-                'all_extractions': [progress.to_dict() for progress in progresses]
-            }), 200
-        else:
-            return jsonify({
-                'error': f'No extraction progress found for dataset {dataset_name} ({source})'
-            }), 404
+        with db.get_readonly_session() as session:
+            progresses = query_dataset_history(
+                session, source, dataset_name, ExtractionProgress.updated_at
+            )
+            
+            # Return the most recent extraction progress, or a 404 if none found
+            if progresses:
+                def build_payload() -> Dict[str, Any]:
+                    all_extractions = [
+                        ExtractionProgress.row_to_dict(progress, raw_json=True) for progress in progresses
+                    ]
+                    return {
+                        'most_recent': all_extractions[0],
+                        'all_extractions': all_extractions
+                    }
+                
+                return conditional_json(build_payload, progress_etag_source(progresses))
+            else:
+                return jsonify({
+                    'error': f'No extraction progress found for dataset {dataset_name} ({source})'
+                }), 404
     except Exception as e:
         logger.error(f"Error getting extraction progress for dataset: {str(e)}", exc_info=True)
         return jsonify({'error': str(e)}), 500
-    finally:
-        db.close_session(session)
 
 @extraction_progress_bp.route('/active', methods=['GET'])
-def get_active_extractions() -> Tuple[Response, int]:
+@cached_response(timeout=2)
+def get_active_extractions() -> Union[Response, Tuple[Response, int]]:
     """Get all active extractions"""
     try:
-        # Query the database for in-progress extractions
-        active_progresses = db.session.query(ExtractionProgress).filter(
-            ExtractionProgress.status == 'in_progress',
-            ExtractionProgress.end_time.is_(None)
-        ).all()
-        
-        return jsonify({
-            'active_extractions': [progress.to_dict() for progress in active_progresses]
-        }), 200
+        with db.get_readonly_session() as session:
+            # Query the database for in-progress extractions (served by ix_ep_active)
+            active_progresses = session.execute(
+                select(ExtractionProgress.__table__).where(
+                    ExtractionProgress.status == 'in_progress',
+                    ExtractionProgress.end_time.is_(None)
+                ).order_by(desc(ExtractionProgress.updated_at))
+            ).mappings().all()
+            
+            return conditional_json(
+                lambda: {'active_extractions': [
+                    ExtractionProgress.row_to_dict(progress, raw_json=True) for progress in active_progresses
+                ]},
+                progress_etag_source(active_progresses)
+            )
     except Exception as e:
         logger.exception(f"Error getting active extractions: {e}")
         return jsonify({'error': str(e)}), 500
@@ -126,27 +373,31 @@ def delete_extraction_progress(progress_id: int) -> Tuple[Response, int]:
         JSON response indicating success or error
     """
     try:
-        session = db.get_session()
-        progress = session.query(ExtractionProgress).get(progress_id)
-        
-        if not progress:
-            return jsonify({'error': f'Extraction progress with ID {progress_id} not found'}), 404
-            
-        session.delete(progress)
-        session.commit()
+        with db.get_session() as session:
+            # Delete by id without loading the record and its merge data
+            deleted = session.execute(
+                delete(ExtractionProgress)
+                .where(ExtractionProgress.id == progress_id)
+                .returning(ExtractionProgress.source, ExtractionProgress.dataset_name)
+            ).first()
             
-        return jsonify({
-            'success': True,
-            'message': f'Extraction progress with ID {progress_id} deleted'
-        }), 200
+            if not deleted:
+                return jsonify({'error': f'Extraction progress with ID {progress_id} not found'}), 404
+                
+            session.commit()
+            extraction_progress.invalidate_extraction_active(deleted.source, deleted.dataset_name)
+            clear_response_cache()
+                
+            return jsonify({
+                'success': True,
+                'message': f'Extraction progress with ID {progress_id} deleted'
+            }), 200
     except Exception as e:
         logger.error(f"Error deleting extraction progress: {str(e)}", exc_info=True)
         return jsonify({'error': str(e)}), 500
-    finally:
-        db.close_session(session)
 
 @extraction_progress_bp.route('/check/<source>/<path:dataset_name>', methods=['GET'])
-def check_active_extraction(source: str, dataset_name: str) -> Tuple[Response, int]:
+def check_active_extraction(source: str, dataset_name: str) -> Union[Response, Tuple[Response, int]]:
     """
     Check if there is an active extraction for a specific dataset
     
@@ -158,33 +409,27 @@ def check_active_extraction(source: str, dataset_name: str) -> Tuple[Response, i
         JSON response indicating whether an active extraction exists
     """
     try:
-        # Use the extraction_progress module to check for active extractions
-        is_active = extraction_progress.is_extraction_active(source, dataset_name)
+        # A single lookup of the latest record answers both questions
+        extraction_state = extraction_progress.get_extraction_state(source, dataset_name)
         
-        if is_active:
-            extraction_state = extraction_progress.get_extraction_state(source, dataset_name)
-            return jsonify({
-                'active': True,
-                'extraction_progress': extraction_state
-            }), 200
+        if extraction_progress.is_state_active(extraction_state):
+            return conditional_json(
+                lambda: {'active': True, 'extraction_progress': extraction_state},
+                (extraction_state['id'], extraction_state['updated_at'])
+            )
         else:
-            return jsonify({
-                'active': False
-            }), 200
+            return conditional_json(lambda: {'active': False}, False)
     except Exception as e:
         logger.error(f"Error checking active extraction: {str(e)}", exc_info=True)
         return jsonify({'error': str(e)}), 500
 
 @extraction_progress_bp.route('/extraction-progress/list', methods=['GET'])
-def list_extraction_progress_new():
+def list_extraction_progress_new() -> Union[Response, Tuple[Response, int]]:
     """Get a list of all extraction progress records."""
     try:
-        with db.get_session() as session:
-            progress_records = session.query(ExtractionProgress).order_by(desc(ExtractionProgress.start_time)).all()
-            return jsonify({
-                'success': True,
-                'records': [record.to_dict() for record in progress_records]
-            })
+        return stream_progress_records(
+            '{"success": true, "records": [', desc(ExtractionProgress.start_time)
+        )
     except Exception as e:
         logger.exception(f"Error listing extraction progress records: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -193,21 +438,20 @@ def list_extraction_progress_new():
 def get_extraction_progress_new(source, dataset_name):
     """Get extraction progress for a specific dataset."""
     try:
-        with db.get_session() as session:
-            progress_records = session.query(ExtractionProgress).filter_by(
-                source=source,
-                dataset_name=dataset_name
-            ).order_by(desc(ExtractionProgress.start_time)).all()
+        with db.get_readonly_session() as session:
+            progress_records = query_dataset_history(
+                session, source, dataset_name, ExtractionProgress.start_time
+            )
             
             if not progress_records:
                 return jsonify({'success': False, 'error': 'No extraction progress found'}), 404
             
-            most_recent = progress_records[0].to_dict() if progress_records else None
+            records = [ExtractionProgress.row_to_dict(record) for record in progress_records]
             
             return jsonify({
                 'success': True,
-                'most_recent': most_recent,
-                'records': [record.to_dict() for record in progress_records]
+                'most_recent': records[0],
+                'records': records
             })
     except Exception as e:
         logger.exception(f"Error getting extraction progress: {e}")
@@ -217,21 +461,26 @@ def get_extraction_progress_new(source, dataset_name):
 def create_extraction_progress():
     """Create a new extraction progress record."""
     try:
-        data = request.json
-        required_fields = ['dataset_name', 'source', 'status', 'total_files']
-        
-        for field in required_fields:
-            if field not in data:
-                return jsonify({'success': False, 'error': f'Missing required field: {field}'}), 400
+        data, error = validate_json_fields(
+            request.get_json(silent=True), PROGRESS_REQUIRED_FIELDS, PROGRESS_FIELDS
+        )
+        error = error or parse_progress_fields(data)
+        if error:
+            return jsonify({'success': False, 'error': error}), 400
         
         with db.get_session() as session:
             progress = ExtractionProgress(**data)
             session.add(progress)
+            # Flush to get the new id so the expired instance is not reloaded after commit
+            session.flush()
+            progress_id = progress.id
             session.commit()
+            extraction_progress.invalidate_extraction_active(data['source'], data['dataset_name'])
+            clear_response_cache()
             
             return jsonify({
                 'success': True,
-                'id': progress.id,
+                'id': progress_id,
                 'message': 'Extraction progress record created'
             })
     except Exception as e:
@@ -242,18 +491,25 @@ def create_extraction_progress():
 def update_extraction_progress(progress_id):
     """Update an existing extraction progress record."""
     try:
-        data = request.json
+        data, error = validate_json_fields(request.get_json(silent=True), {}, PROGRESS_FIELDS)
+        error = error or parse_progress_fields(data)
+        if error:
+            return jsonify({'success': False, 'error': error}), 400
         
         with db.get_session() as session:
-            progress = session.query(ExtractionProgress).filter_by(id=progress_id).first()
-            if not progress:
+            # Write the validated columns in a single UPDATE without loading the row
+            updated = session.execute(
+                update(ExtractionProgress)
+                .where(ExtractionProgress.id == progress_id)
+                .values(**data)
+                .returning(ExtractionProgress.source, ExtractionProgress.dataset_name)
+            ).first()
+            if not updated:
                 return jsonify({'success': False, 'error': 'Extraction progress not found'}), 404
             
-            for key, value in data.items():
-                if hasattr(progress, key):
-                    setattr(progress, key, value)
-            
             session.commit()
+            extraction_progress.invalidate_extraction_active(updated.source, updated.dataset_name)
+            clear_response_cache()
             
             return jsonify({
                 'success': True,
@@ -268,44 +524,16 @@ def get_extraction_status(source, dataset_name):
     """Check if an extraction is currently running for a dataset."""
     try:
         # Get the extraction status using our utility
-        is_running = extraction_progress.is_extraction_active(source, dataset_name)
         extraction_state = extraction_progress.get_extraction_state(source, dataset_name)
+        is_running = extraction_progress.is_state_active(extraction_state)
+        
+        # Log a summary only: the state can carry megabytes of merged data
+        if extraction_state and logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                f"Extraction state for {source}/{dataset_name}: "
+                f"id={extraction_state['id']} status={extraction_state['status']}"
+            )
         
-        # Debug information
-        with db.get_session() as session:
-            extract_record = session.query(ExtractionProgress).filter_by(
-                source=source,
-                dataset_name=dataset_name
-            ).order_by(ExtractionProgress.id.desc()).first()
-            
-            if extract_record:
-                print(f"DEBUG - Direct DB data for {source}/{dataset_name}:")
-                print(f"  id: {extract_record.id}")
-                print(f"  status: {extract_record.status}")
-                print(f"  merged_data: {extract_record.merged_data is not None}")
-                if extract_record.merged_data:
-                    print(f"  merged_data length: {len(extract_record.merged_data)}")
-                print(f"  merge_reasoning_history: {extract_record.merge_reasoning_history is not None}")
-                if extract_record.merge_reasoning_history:
-                    print(f"  merge_reasoning_history length: {len(extract_record.merge_reasoning_history)}")
-                
-                # Try to parse the JSON directly as a test
-                try:
-                    if extract_record.merged_data:
-                        merged_data = json.loads(extract_record.merged_data)
-                        print(f"  parsed merged_data: {type(merged_data)} with {len(merged_data)} keys")
-                    if extract_record.merge_reasoning_history:
-                        merge_history = json.loads(extract_record.merge_reasoning_history)
-                        print(f"  parsed merge_reasoning_history: {type(merge_history)} with {len(merge_history)} entries")
-                except Exception as e:
-                    print(f"  JSON parsing error: {str(e)}")
-        
-        print(f"DEBUG - Extraction state from utility:")
-        print(f"  extraction_state: {extraction_state}")
-        if extraction_state:
-            print(f"  merged_data: {extraction_state.get('merged_data') is not None}")
-            print(f"  merge_reasoning_history: {extraction_state.get('merge_reasoning_history') is not None}")
-            
         return jsonify({
             'success': True,
             'is_running': is_running,
@@ -315,6 +543,129 @@ def get_extraction_status(source, dataset_name):
         logger.exception(f"Error checking extraction status: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@extraction_progress_bp.route('/extraction-stream/<source>/<path:dataset_name>', methods=['GET'])
+def stream_extraction_progress(source: str, dataset_name: str) -> Response:
+    """
+    Stream extraction state for a dataset as Server-Sent Events
+    
+    An event is sent when the stream opens and whenever the state changes,
+    instead of the client polling /extraction-status. Changes made by this
+    process are pushed immediately; the state is also re-read at every
+    heartbeat to pick up changes made by the batch processor.
+    
+    Args:
+        source: Source of the dataset (e.g., 'local', 's3')
+        dataset_name: Name of the dataset
+        
+    Returns:
+        text/event-stream response
+    """
+    def generate():
+        notifications = extraction_progress.subscribe(source, dataset_name)
+        last_state = None
+        first = True
+        try:
+            while True:
+                state = extraction_progress.get_extraction_state(source, dataset_name)
+                if first or state != last_state:
+                    event = {
+                        'is_running': extraction_progress.is_state_active(state),
+                        'extraction_info': state
+                    }
+                    yield f"data: {json.dumps(event)}\n\n"
+                    last_state = state
+                    first = False
+                else:
+                    yield ": keep-alive\n\n"
+                
+                try:
+                    notifications.get(timeout=SSE_HEARTBEAT_SECONDS)
+                except queue.Empty:
+                    pass
+        finally:
+            extraction_progress.unsubscribe(source, dataset_name, notifications)
+    
+    return Response(
+        generate(),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@lru_cache(maxsize=256)
+def ensure_output_dir(output_dir: str) -> None:
+    """
+    Create an extraction output directory, once per directory per process
+    
+    Nothing in the app removes output directories, so repeat resumes of a
+    dataset skip the filesystem calls.
+    
+    Args:
+        output_dir: Directory to create
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+def get_pending_extractions() -> int:
+    """Get the number of extractions queued or running on the extraction pool"""
+    with _pending_lock:
+        return _pending_extractions
+
+def submit_extraction(source: str, dataset_name: str, fn: Callable[..., Any], *args: Any) -> Future:
+    """
+    Run an extraction job on the bounded extraction pool
+    
+    Args:
+        source: Source of the dataset being extracted
+        dataset_name: Name of the dataset being extracted
+        fn: Extraction function to run
+        *args: Arguments passed to the function
+        
+    Returns:
+        Future for the extraction job
+    """
+    global _pending_extractions
+    key = (source, dataset_name)
+    with _pending_lock:
+        _pending_extractions += 1
+        _pool_extractions.add(key)
+    
+    def finished(future: Future) -> None:
+        # Release the pool slot once the job is done
+        global _pending_extractions
+        with _pending_lock:
+            _pending_extractions -= 1
+            _pool_extractions.discard(key)
+    
+    future = _extraction_pool.submit(fn, *args)
+    future.add_done_callback(finished)
+    return future
+
+def shutdown_extraction_pool() -> None:
+    """
+    Stop the extraction pool when the server shuts down
+    
+    The pool's worker threads are joined at interpreter exit, so without this
+    shutdown would wait for every queued extraction to run to the end. Queued
+    jobs are cancelled, and running and cancelled extractions are marked
+    paused: a running job stops after its current file, and all of them can
+    be resumed.
+    
+    Called by the app once its server loop returns, while the database can
+    still be written to.
+    """
+    with _pending_lock:
+        extractions = list(_pool_extractions)
+    _extraction_pool.shutdown(wait=False, cancel_futures=True)
+    for source, dataset_name in extractions:
+        logger.info(f"Pausing extraction for {source}/{dataset_name} at shutdown")
+        extraction_progress.update_extraction_progress(
+            source,
+            dataset_name,
+            {
+                'status': 'paused',
+                'message': 'Extraction paused at server shutdown'
+            }
+        )
+
 @extraction_progress_bp.route('/extraction-resume/<source>/<dataset_name>', methods=['POST'])
 def resume_extraction(source, dataset_name):
     """Resume a paused extraction process."""
@@ -329,13 +680,23 @@ def resume_extraction(source, dataset_name):
                 'error': 'Extraction is already running'
             }), 400
         
+        # Refuse new work while the extraction pool is saturated
+        if get_pending_extractions() >= MAX_PENDING_EXTRACTIONS:
+            logger.warning(f"Extraction pool is full, cannot resume {source}/{dataset_name}")
+            return jsonify({
+                'success': False,
+                'error': 'Too many extractions are running, try again later'
+            }), 429
+        
         # Find the paused extraction in the database
         with db.get_session() as session:
-            paused_extraction = session.query(ExtractionProgress).filter_by(
-                source=source,
-                dataset_name=dataset_name,
-                status='paused'
-            ).order_by(desc(ExtractionProgress.start_time)).first()
+            paused_extraction = find_resumable_extraction(
+                session, source, dataset_name, ('paused',),
+                ExtractionProgress.id,
+                ExtractionProgress.files,
+                ExtractionProgress.schema,
+                ExtractionProgress.current_file_index
+            )
             
             if not paused_extraction:
                 logger.warning(f"No paused extraction found for {source}/{dataset_name}")
@@ -344,37 +705,37 @@ def resume_extraction(source, dataset_name):
                     'error': 'No paused extraction found to resume'
                 }), 404
             
-            # Update status to in_progress
-            paused_extraction.status = 'in_progress'
-            paused_extraction.message = 'Extraction resumed'
-            paused_extraction.updated_at = datetime.now()
-            session.commit()
-            
             # Get the extraction data needed to resume
             extraction_id = paused_extraction.id
-            files = paused_extraction.get_files()
-            schema = paused_extraction.get_schema()
+            files = json.loads(paused_extraction.files) if paused_extraction.files else []
+            schema = json.loads(paused_extraction.schema) if paused_extraction.schema else {}
             current_file_index = paused_extraction.current_file_index or 0
             
+            # Update status to in_progress, updated_at is stamped by the database
+            session.execute(
+                update(ExtractionProgress)
+                .where(ExtractionProgress.id == extraction_id)
+                .values(status='in_progress', message='Extraction resumed')
+            )
+            session.commit()
+            extraction_progress.invalidate_extraction_active(source, dataset_name)
+            clear_response_cache()
+            
             # Only pass the remaining files
             remaining_files = files[current_file_index:]
             logger.info(f"Resuming extraction with {len(remaining_files)} remaining files")
-            
-            # Extract output directory from message or construct it
-            import os
-            from flask import current_app
-            output_dir = f"{current_app.config['DATA_DIR']}/extracted/{source}/{dataset_name}"
-            os.makedirs(output_dir, exist_ok=True)
-            
             logger.info(f"Successfully updated extraction status in database for {source}/{dataset_name}")
         
-        # Start extraction process in a separate thread
-        extraction_thread = threading.Thread(
-            target=handle_dataset_extraction,
-            args=(extraction_id, source, dataset_name, remaining_files, schema, output_dir, None, None, None, None),
-            daemon=True
+        # Create the output directory once the session is released
+        output_dir = f"{current_app.config['DATA_DIR']}/extracted/{source}/{dataset_name}"
+        ensure_output_dir(output_dir)
+        
+        # Run the extraction on the bounded extraction pool
+        submit_extraction(
+            source, dataset_name,
+            handle_dataset_extraction,
+            extraction_id, source, dataset_name, remaining_files, schema, output_dir, None, None, None, None
         )
-        extraction_thread.start()
         
         return jsonify({
             'success': True,
@@ -414,6 +775,7 @@ def pause_extraction(source, dataset_name):
                 'message': 'Extraction paused by user'
             }
         )
+        clear_response_cache()
         
         logger.info(f"Successfully paused extraction for {source}/{dataset_name}")
         
@@ -449,19 +811,10 @@ def resume_extraction_route(source, dataset_name):
         
         # Find the extraction record to resume
         with db.get_session() as session:
-            extraction_record = session.query(ExtractionProgress).filter_by(
-                source=source,
-                dataset_name=dataset_name,
-                status='paused'
-            ).order_by(desc(ExtractionProgress.start_time)).first()
-            
-            if not extraction_record:
-                # Check for in-progress extractions as well
-                extraction_record = session.query(ExtractionProgress).filter_by(
-                    source=source,
-                    dataset_name=dataset_name,
-                    status='in_progress'
-                ).order_by(desc(ExtractionProgress.start_time)).first()
+            # Prefer a paused extraction, then fall back to an in-progress one
+            extraction_record = find_resumable_extraction(
+                session, source, dataset_name, ('paused', 'in_progress'), ExtractionProgress.id
+            )
             
             if not extraction_record:
                 logger.warning(f"No paused or in-progress extraction found for {source}/{dataset_name}")
@@ -471,11 +824,18 @@ def resume_extraction_route(source, dataset_name):
                 }), 404
             
             # Update status to scheduled (will be picked up by batch processor)
-            extraction_record.status = 'scheduled'
-            extraction_record.message = 'Extraction scheduled for resumption'
-            extraction_record.updated_at = datetime.now()
-            session.commit()
             extraction_id = extraction_record.id
+            session.execute(
+                update(ExtractionProgress)
+                .where(ExtractionProgress.id == extraction_id)
+                .values(
+                    status='scheduled',
+                    message='Extraction scheduled for resumption'
+                )
+            )
+            session.commit()
+            extraction_progress.invalidate_extraction_active(source, dataset_name)
+            clear_response_cache()
         
         logger.info(f"Successfully scheduled extraction {extraction_id} for resumption")
         
@@ -521,16 +881,21 @@ def test_merge_fields(source, dataset_name):
                 # Set the fields directly
                 extraction_record.set_merged_data(test_merged_data)
                 
-                # For reasoning history, initialize it if it's empty
-                current_history = []
-                if extraction_record.merge_reasoning_history:
-                    try:
-                        current_history = json.loads(extraction_record.merge_reasoning_history)
-                    except:
-                        current_history = []
-                
-                current_history.append(test_reasoning_entry)
-                extraction_record.set_merge_reasoning_history(current_history)
+                # Append to the reasoning history, in the database where possible
+                appended = extraction_progress.json_array_append(
+                    session, ExtractionProgress.merge_reasoning_history, [test_reasoning_entry]
+                )
+                if appended is not None:
+                    extraction_record.merge_reasoning_history = appended
+                else:
+                    current_history = []
+                    if extraction_record.merge_reasoning_history:
+                        try:
+                            current_history = json.loads(extraction_record.merge_reasoning_history)
+                        except:
+                            current_history = []
+                    current_history.append(test_reasoning_entry)
+                    extraction_record.set_merge_reasoning_history(current_history)
                 
                 # Commit the changes
                 session.commit()
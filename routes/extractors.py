@@ -6,17 +6,19 @@ import time
 import shutil
 from pathlib import Path
 from flask import Blueprint, request, jsonify, current_app, Response
+from sqlalchemy.orm import undefer_group
 from typing import Dict, List, Any, Optional, Union, TypedDict, Tuple, cast, Literal
 from datetime import datetime
 import threading
 from db import db, Schema, DatasetSchemaMapping, ExtractionProgress
-from storage import create_storage, Storage
+from storage import create_storage, get_storage_config, Storage
 from ai import create_schema_generator, create_llm_extractor
 from ai.extractor import DataExtractor
 from utils import extraction_progress
+from utils.pdf_utils import pdf_to_markdown
+from utils.text_utils import has_extractable_text, split_content_into_chunks
 from constants import (
-    STORAGE_TYPE, LOCAL_STORAGE_PATH, S3_BUCKET_NAME, AWS_ACCESS_KEY_ID,
-    AWS_SECRET_ACCESS_KEY, AWS_REGION, USE_LOCAL_MODEL, LLM_PROVIDER,
+    STORAGE_TYPE, USE_LOCAL_MODEL, LLM_PROVIDER,
     DEEPSEEK_API_KEY, OPENAI_API_KEY, ANTHROPIC_API_KEY, MODEL_CONFIGS,
     DEFAULT_LLM_PROVIDER, MAX_CHUNK_SIZE, DEFAULT_TEMPERATURE, DATA_DIR
 )
@@ -41,27 +43,12 @@ class ExtractorResponse(TypedDict, total=False):
     processed_files: Optional[int]
     results: Optional[List[FileResult]]
 
-class StorageConfig(TypedDict, total=False):
-    """Storage configuration options"""
-    bucket_name: Optional[str]
-    aws_access_key_id: Optional[str]
-    aws_secret_access_key: Optional[str]
-    region_name: Optional[str]
-    storage_path: Optional[str]
-
-def get_storage_config() -> StorageConfig:
-    """Get storage configuration based on environment variables"""
-    if STORAGE_TYPE == 's3':
-        return {
-            'bucket_name': S3_BUCKET_NAME,
-            'aws_access_key_id': AWS_ACCESS_KEY_ID,
-            'aws_secret_access_key': AWS_SECRET_ACCESS_KEY,
-            'region_name': AWS_REGION
-        }
-    else:
-        return {
-            'storage_path': LOCAL_STORAGE_PATH
-        }
+# API key of each provider
+PROVIDER_API_KEYS: Dict[str, str] = {
+    'deepseek': DEEPSEEK_API_KEY,
+    'openai': OPENAI_API_KEY,
+    'anthropic': ANTHROPIC_API_KEY
+}
 
 def get_extractor_config() -> Dict[str, Any]:
     """Get extractor configuration based on environment variables"""
@@ -70,14 +57,9 @@ def get_extractor_config() -> Dict[str, Any]:
         'provider': LLM_PROVIDER
     }
     
-    if not USE_LOCAL_MODEL:
-        # Set API key based on provider
-        if LLM_PROVIDER == 'deepseek':
-            config['api_key'] = DEEPSEEK_API_KEY
-        elif LLM_PROVIDER == 'openai':
-            config['api_key'] = OPENAI_API_KEY
-        elif LLM_PROVIDER == 'anthropic':
-            config['api_key'] = ANTHROPIC_API_KEY
+    # Set API key based on provider
+    if not USE_LOCAL_MODEL and LLM_PROVIDER in PROVIDER_API_KEYS:
+        config['api_key'] = PROVIDER_API_KEYS[LLM_PROVIDER]
     
     # Get model and API URL from MODEL_CONFIGS
     mode = 'api' if not USE_LOCAL_MODEL else 'local'
@@ -151,19 +133,20 @@ def extract_dataset(source: str, dataset_name: str) -> Tuple[Response, int]:
         
         # If schema not provided in request, get from database
         if not schema_data:
-            # Get dataset mapping to find schema
-            mapping = session.query(DatasetSchemaMapping).filter_by(
-                dataset_name=dataset_name,
-                source=source
+            # Get dataset mapping and its schema in one query
+            row = session.query(DatasetSchemaMapping, Schema).outerjoin(
+                Schema, Schema.id == DatasetSchemaMapping.schema_id
+            ).filter(
+                DatasetSchemaMapping.dataset_name == dataset_name,
+                DatasetSchemaMapping.source == source
             ).first()
             
-            if not mapping or not mapping.schema_id:
+            if not row or not row[0].schema_id:
                 return jsonify({
                     'error': f'No schema associated with dataset {dataset_name}'
                 }), 400
             
-            # Get schema
-            schema = session.query(Schema).get(mapping.schema_id)
+            mapping, schema = row
             if not schema:
                 return jsonify({
                     'error': f'Schema with ID {mapping.schema_id} not found'
@@ -200,7 +183,7 @@ def extract_dataset(source: str, dataset_name: str) -> Tuple[Response, int]:
         
         # Store the schema
         with db.get_session() as session:
-            extraction_record = session.query(ExtractionProgress).get(extraction_progress_id)
+            extraction_record = session.get(ExtractionProgress, extraction_progress_id)
             if extraction_record and schema_data:
                 extraction_record.schema = json.dumps(schema_data, indent=2) if isinstance(schema_data, dict) else schema_data
                 extraction_record.status = 'scheduled'  # Set to scheduled for batch processing
@@ -253,6 +236,11 @@ def handle_dataset_extraction(extraction_progress_id, source, dataset_name, file
             }
         )
         
+        # Every file uses the same configuration, so one extractor serves
+        # them all
+        config = get_extractor_config()
+        extractor = create_file_extractor(config)
+        
         # Process each file
         for i, filename in enumerate(files):
             # Check if extraction has been paused or cancelled
@@ -281,7 +269,7 @@ def handle_dataset_extraction(extraction_progress_id, source, dataset_name, file
             
             # Process the file
             try:
-                process_file(filename, source, dataset_name, get_extractor_config())
+                process_file(filename, source, dataset_name, config, extractor)
                 
                 # Update processed files count
                 extraction_progress.update_extraction_progress(
@@ -318,8 +306,20 @@ def handle_dataset_extraction(extraction_progress_id, source, dataset_name, file
         
         raise
 
-def process_file(file_path: str, source: str, dataset_name: str, config: Dict[str, Any]) -> Dict[str, Any]:
-    """Process a single file with the given configuration"""
+def create_file_extractor(config: Dict[str, Any]) -> DataExtractor:
+    """Create an extractor, falling back to the local model when no API key is set"""
+    try:
+        return create_llm_extractor(config)
+    except ValueError as e:
+        if "API key is required" in str(e):
+            # If API key is missing, retry with use_api=False
+            config['use_api'] = False
+            return create_llm_extractor(config)
+        raise
+
+def process_file(file_path: str, source: str, dataset_name: str, config: Dict[str, Any],
+                 extractor: Optional[DataExtractor] = None) -> Dict[str, Any]:
+    """Process a single file with the given configuration, or with an already created extractor"""
     try:
         # Check if there's an active extraction for this dataset
         active_extraction = db.session.query(ExtractionProgress).filter(
@@ -346,21 +346,14 @@ def process_file(file_path: str, source: str, dataset_name: str, config: Dict[st
             extraction_progress_id = extraction_progress.id
         
         # Create the extractor
-        try:
-            extractor = create_llm_extractor(config)
-        except ValueError as e:
-            if "API key is required" in str(e):
-                # If API key is missing, retry with use_api=False
-                config['use_api'] = False
-                extractor = create_llm_extractor(config)
-            else:
-                raise
+        if extractor is None:
+            extractor = create_file_extractor(config)
         
         # Process the file
         result = extractor.extract(file_path)
         
         # Update extraction progress
-        extraction_progress = db.session.query(ExtractionProgress).get(extraction_progress_id)
+        extraction_progress = db.session.get(ExtractionProgress, extraction_progress_id)
         if extraction_progress:
             extraction_progress.processed_files += 1
             extraction_progress.status = 'completed'
@@ -372,7 +365,7 @@ def process_file(file_path: str, source: str, dataset_name: str, config: Dict[st
         logger.exception(f"Error processing file {file_path}: {e}")
         # Update extraction progress to failed
         if 'extraction_progress_id' in locals():
-            extraction_progress = db.session.query(ExtractionProgress).get(extraction_progress_id)
+            extraction_progress = db.session.get(ExtractionProgress, extraction_progress_id)
             if extraction_progress:
                 extraction_progress.status = 'failed'
                 extraction_progress.message = str(e)
@@ -380,61 +373,48 @@ def process_file(file_path: str, source: str, dataset_name: str, config: Dict[st
                 db.session.commit()
         raise
 
-def convert_pdf_to_markdown(pdf_path: str, md_path: str) -> None:
-    """Convert a PDF file to Markdown using pymupdf4llm"""
+def convert_pdf_to_markdown(pdf_path: str, md_path: str) -> str:
+    """
+    Convert a PDF file to Markdown using pymupdf4llm
+    
+    The markdown is saved to md_path and also returned, so callers can
+    extract from it without reading the file back.
+    """
     try:
-        # Import pymupdf4llm for PDF to Markdown conversion
-        import pymupdf4llm
-        
         # Convert PDF to Markdown using pymupdf4llm
-        markdown_content = pymupdf4llm.to_markdown(pdf_path)
+        markdown_content = pdf_to_markdown(pdf_path)
         
         # Save the markdown content to file
         with open(md_path, 'w', encoding='utf-8') as f:
             f.write(markdown_content)
             
         logger.info(f"Converted PDF to Markdown: {md_path}")
+        return markdown_content
         
     except Exception as e:
         logger.error(f"Error converting PDF to Markdown: {str(e)}", exc_info=True)
         raise
 
 
-def split_content_into_chunks(content: str, max_chunk_size: int = MAX_CHUNK_SIZE) -> List[str]:
-    """Split markdown content into smaller chunks while preserving structure."""
-    chunks: List[str] = []
-    current_chunk: List[str] = []
-    current_size: int = 0
-    
-    # Split by paragraphs
-    paragraphs = content.split('\n\n')
-    
-    for para in paragraphs:
-        para_size = len(para)
-        
-        # If adding this paragraph would exceed max size, start a new chunk
-        if current_size + para_size > max_chunk_size and current_chunk:
-            chunks.append('\n\n'.join(current_chunk))
-            current_chunk = []
-            current_size = 0
-        
-        current_chunk.append(para)
-        current_size += para_size
-    
-    # Add the last chunk if it exists
-    if current_chunk:
-        chunks.append('\n\n'.join(current_chunk))
-    
-    return chunks
+def _list_item_key(item: Any) -> Any:
+    """Hashable key for comparing list items, serializing dicts and lists"""
+    if isinstance(item, (dict, list)):
+        return json.dumps(item, sort_keys=True, default=str)
+    return item
 
 def merge_chunk_data(accumulated_data: Dict[str, Any], chunk_data: Dict[str, Any]) -> Dict[str, Any]:
-    """Merge data from a chunk into accumulated data, taking the first non-null value for each field."""
+    """
+    Merge data from a chunk into accumulated data, taking the first non-null value for each field.
     
-    # If accumulated_data is empty, return chunk_data directly
-    if not accumulated_data:
-        return chunk_data
+    accumulated_data is updated in place and returned, so merging many chunks
+    does not copy the accumulated data for each one.
+    """
+    merged = accumulated_data
     
-    merged = accumulated_data.copy()
+    # If accumulated_data is empty, take the chunk's fields as they are
+    if not merged:
+        merged.update(chunk_data)
+        return merged
     
     # Handle basic fields
     for key, value in chunk_data.items():
@@ -448,17 +428,16 @@ def merge_chunk_data(accumulated_data: Dict[str, Any], chunk_data: Dict[str, Any
         elif isinstance(value, list) and isinstance(merged[key], list):
             # For lists, we need to handle special cases
             if key == "timePeriods":
-                # For time periods, merge by period
+                # For time periods, merge by period, looking periods up by name
+                # rather than scanning the list for each one
+                periods_by_name = {p.get("period"): p for p in merged[key]}
                 for period_data in value:
                     period = period_data.get("period")
                     if not period:
                         continue
                     
                     # Check if period already exists
-                    existing_period = next(
-                        (p for p in merged[key] if p.get("period") == period),
-                        None
-                    )
+                    existing_period = periods_by_name.get(period)
                     
                     if existing_period:
                         # Merge metrics
@@ -468,21 +447,29 @@ def merge_chunk_data(accumulated_data: Dict[str, Any], chunk_data: Dict[str, Any
                     else:
                         # New period, add it
                         merged[key].append(period_data)
+                        periods_by_name[period] = period_data
             else:
                 # For other lists, append new items
-                merged[key].extend([x for x in value if x not in merged[key]])
+                existing_items = {_list_item_key(x) for x in merged[key]}
+                merged[key].extend([x for x in value if _list_item_key(x) not in existing_items])
     
     return merged
 
 def print_accumulated_data(data: Dict[str, Any], schema: Dict[str, Any], indent: int = 0) -> None:
     """
-    Print accumulated data as formatted JSON, filtering to only include fields defined in the schema.
+    Log accumulated data as JSON at debug level, filtering to only include fields defined in the schema.
+    
+    Nothing is filtered or serialized unless debug logging is enabled, since
+    the accumulated data grows with every chunk.
     
     Args:
         data: The accumulated data to print
         schema: The schema defining the allowed fields
         indent: Current indentation level (used for recursive calls)
     """
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    
     def filter_by_schema(data: Dict[str, Any], schema: Dict[str, Any]) -> Dict[str, Any]:
         """Recursively filter data to only include fields defined in the schema."""
         if not isinstance(data, dict) or not isinstance(schema, dict):
@@ -511,32 +498,39 @@ def print_accumulated_data(data: Dict[str, Any], schema: Dict[str, Any], indent:
     # Filter out None values for cleaner output
     filtered_data = {k: v for k, v in filtered_data.items() if v is not None}
     
-    # Print formatted JSON
-    logger.info(json.dumps(filtered_data, indent=2))
+    logger.debug("Accumulated data: %s", json.dumps(filtered_data))
 
 def extract_data_from_markdown(markdown_file: Path, schema: Dict[str, Any], extractor: DataExtractor, 
-                               source: str, dataset_name: str, filename: str, extraction_progress_id: int) -> Dict[str, Any]:
+                               source: str, dataset_name: str, filename: str, extraction_progress_id: int,
+                               content: Optional[str] = None) -> Dict[str, Any]:
     """
     Extract structured data from a markdown file using the provided extractor
     
     Args:
-        markdown_file: Path to the markdown file
+        markdown_file: Path to the markdown file, read only when content is not given
         schema: JSON schema defining the structure of the data
         extractor: DataExtractor instance to use for extraction
         source: Source of the dataset (for progress tracking)
         dataset_name: Name of the dataset (for progress tracking)
         filename: Name of the file being processed (for progress tracking)
         extraction_progress_id: ID of the extraction progress record
+        content: Markdown content already in memory, such as the result of
+            convert_pdf_to_markdown, so the file is not read back
         
     Returns:
         Extracted data as a dictionary
     """
-    # Read the markdown file
-    with open(markdown_file, 'r', encoding='utf-8') as f:
-        content = f.read()
+    if content is None:
+        # Read the markdown file
+        with open(markdown_file, 'r', encoding='utf-8') as f:
+            content = f.read()
     
     # Split the content into chunks
-    chunks = split_content_into_chunks(content)
+    chunks = split_content_into_chunks(content, MAX_CHUNK_SIZE)
+    
+    # Skip chunks with no text, such as blank pages, keeping one so the file
+    # still gets a result
+    chunks = [chunk for chunk in chunks if has_extractable_text(chunk)] or chunks[:1]
     total_chunks = len(chunks)
     
     logger.info(f"Split content into {total_chunks} chunks")
@@ -567,6 +561,9 @@ def extract_data_from_markdown(markdown_file: Path, schema: Dict[str, Any], extr
         current_chunk = extraction_state.get('current_chunk', 0)
         logger.info(f"Resuming extraction from chunk {current_chunk}/{total_chunks}")
     
+    # The schema is the same for every prompt of the file, so render it once
+    schema_str = render_schema(schema)
+    
     for i, chunk in enumerate(chunks):
         # Skip chunks that were already processed if resuming
         if i < current_chunk:
@@ -575,16 +572,14 @@ def extract_data_from_markdown(markdown_file: Path, schema: Dict[str, Any], extr
         
         logger.info(f"Processing chunk {i+1}/{total_chunks}")
         
-        # Update current chunk in the database
-        extraction_state = extraction_progress.get_extraction_state(source, dataset_name)
-        if extraction_state:
-            # Check if extraction has been paused or cancelled
-            if extraction_state.get('status') == 'paused':
-                logger.info(f"Extraction paused at chunk {i+1}/{total_chunks}")
-                break
-            elif extraction_state.get('status') == 'cancelled':
-                logger.info(f"Extraction cancelled")
-                break
+        # Check if extraction has been paused or cancelled
+        current_status = extraction_progress.get_extraction_status(source, dataset_name)
+        if current_status == 'paused':
+            logger.info(f"Extraction paused at chunk {i+1}/{total_chunks}")
+            break
+        elif current_status == 'cancelled':
+            logger.info(f"Extraction cancelled")
+            break
         
         # Update extraction progress with current chunk
         extraction_progress.update_extraction_progress(
@@ -597,7 +592,7 @@ def extract_data_from_markdown(markdown_file: Path, schema: Dict[str, Any], extr
         )
         
         # Create a prompt for this chunk
-        prompt = create_extraction_prompt_with_context(chunk, schema, i, len(chunks))
+        prompt = create_extraction_prompt_with_context(chunk, schema, i, total_chunks, schema_str)
         
         # Extract data from the chunk
         chunk_data = extractor.extract_data_with_context(prompt, schema)
@@ -608,14 +603,15 @@ def extract_data_from_markdown(markdown_file: Path, schema: Dict[str, Any], extr
             'data': chunk_data
         })
 
-        logger.info(f'Chunk {i+1}/{total_chunks} processed, data: {chunk_data}')
+        logger.info(f'Chunk {i+1}/{total_chunks} processed')
+        logger.debug("Chunk %d data: %s", i + 1, chunk_data)
         
         # If we have processed data from multiple chunks, do an intermediate merge
         # and report the current state for progress tracking
         if i > 0 and i % 2 == 0:
             logger.info(f"Performing intermediate merge after chunk {i+1}/{total_chunks}")
             # Create a prompt for merging the current results with reasoning
-            intermediate_merge_prompt = create_intermediate_merge_prompt(all_chunk_results[:i+1], schema)
+            intermediate_merge_prompt = create_intermediate_merge_prompt(all_chunk_results[:i+1], schema, schema_str)
             
             # Get an intermediate merged result with reasoning
             intermediate_result = extractor.merge_results_with_reasoning(intermediate_merge_prompt, schema)
@@ -646,8 +642,7 @@ def extract_data_from_markdown(markdown_file: Path, schema: Dict[str, Any], extr
             )
     
     # Check if extraction was completed or paused
-    extraction_state = extraction_progress.get_extraction_state(source, dataset_name)
-    if extraction_state and extraction_state.get('status') == 'paused':
+    if extraction_progress.get_extraction_status(source, dataset_name) == 'paused':
         logger.info(f"Extraction paused - saving current state")
         return merged_data
     
@@ -682,7 +677,7 @@ def extract_data_from_markdown(markdown_file: Path, schema: Dict[str, Any], extr
     
     # Create a prompt for merging all the results
     logger.info(f"Creating final merge prompt for {len(all_chunk_results)} chunks")
-    final_merge_prompt = create_intermediate_merge_prompt(all_chunk_results, schema)
+    final_merge_prompt = create_intermediate_merge_prompt(all_chunk_results, schema, schema_str)
     
     # Get the merged result from the LLM with reasoning
     logger.info("Getting final merged result from LLM")
@@ -716,7 +711,17 @@ def extract_data_from_markdown(markdown_file: Path, schema: Dict[str, Any], extr
     
     return merged_data
 
-def create_extraction_prompt_with_context(content: str, schema: Dict[str, Any], chunk_index: int, total_chunks: int) -> str:
+def render_schema(schema: Dict[str, Any]) -> str:
+    """
+    Render a schema for inclusion in extraction and merge prompts
+    
+    The schema is sent with every chunk, so it is rendered as compact JSON;
+    indentation only adds input tokens.
+    """
+    return json.dumps(schema, separators=(',', ':'))
+
+def create_extraction_prompt_with_context(content: str, schema: Dict[str, Any], chunk_index: int, total_chunks: int,
+                                          schema_str: Optional[str] = None) -> str:
     """
     Create a prompt for extracting data with contextual information
     
@@ -725,12 +730,15 @@ def create_extraction_prompt_with_context(content: str, schema: Dict[str, Any],
         schema: JSON schema defining the structure of the data
         chunk_index: Index of the current chunk (0-based)
         total_chunks: Total number of chunks
+        schema_str: The schema already rendered by render_schema, to avoid
+            serializing it again for every chunk
         
     Returns:
         A prompt for the LLM to extract data with context
     """
     # Convert schema to a string representation
-    schema_str = json.dumps(schema, indent=2)
+    if schema_str is None:
+        schema_str = render_schema(schema)
     
     # Create the prompt
     prompt = f"""
@@ -774,33 +782,43 @@ Return only the JSON object, with no additional text or explanation.
     
     return prompt
 
-def create_merge_prompt(chunk_results: List[Dict[str, Any]], schema: Dict[str, Any]) -> str:
+def format_chunk_results(chunk_results: List[Dict[str, Any]]) -> str:
     """
-    Create a prompt for the LLM to merge multiple chunk results
+    Format chunk results for inclusion in a merge prompt
     
     Args:
         chunk_results: List of chunk results with their indices and metadata
-        schema: JSON schema defining the structure of the data
         
     Returns:
-        A prompt for the LLM to merge the results
+        The data and metadata of each chunk, in order
     """
-    # Convert schema to a string representation
-    schema_str = json.dumps(schema, indent=2)
-    
-    # Create a string representation of all chunk results
-    chunk_results_str = ""
+    parts: List[str] = []
     for result in chunk_results:
-        chunk_index = result['chunk_index']
         chunk_data = result['data']
         
         # Format the data and metadata
         data_str = json.dumps(chunk_data.get('data', {}), indent=2)
         metadata_str = json.dumps(chunk_data.get('metadata', {}), indent=2)
         
-        chunk_results_str += f"Chunk {chunk_index}:\n"
-        chunk_results_str += f"Data:\n{data_str}\n\n"
-        chunk_results_str += f"Metadata:\n{metadata_str}\n\n"
+        parts.append(f"Chunk {result['chunk_index']}:\nData:\n{data_str}\n\nMetadata:\n{metadata_str}\n\n")
+    return ''.join(parts)
+
+def create_merge_prompt(chunk_results: List[Dict[str, Any]], schema: Dict[str, Any]) -> str:
+    """
+    Create a prompt for the LLM to merge multiple chunk results
+    
+    Args:
+        chunk_results: List of chunk results with their indices and metadata
+        schema: JSON schema defining the structure of the data
+        
+    Returns:
+        A prompt for the LLM to merge the results
+    """
+    # Convert schema to a string representation
+    schema_str = render_schema(schema)
+    
+    # Create a string representation of all chunk results
+    chunk_results_str = format_chunk_results(chunk_results)
     
     # Create the prompt
     prompt = f"""
@@ -837,33 +855,25 @@ Return only the merged JSON object, with no additional text or explanation.
     
     return prompt
 
-def create_intermediate_merge_prompt(chunk_results: List[Dict[str, Any]], schema: Dict[str, Any]) -> str:
+def create_intermediate_merge_prompt(chunk_results: List[Dict[str, Any]], schema: Dict[str, Any],
+                                     schema_str: Optional[str] = None) -> str:
     """
     Create a prompt specifically for intermediate merges with reasoning
     
     Args:
         chunk_results: List of chunk results with their indices and metadata
         schema: JSON schema defining the structure of the data
+        schema_str: The schema already rendered by render_schema
         
     Returns:
         A prompt for the LLM to merge the results with reasoning
     """
     # Convert schema to a string representation
-    schema_str = json.dumps(schema, indent=2)
+    if schema_str is None:
+        schema_str = render_schema(schema)
     
     # Create a string representation of all chunk results
-    chunk_results_str = ""
-    for result in chunk_results:
-        chunk_index = result['chunk_index']
-        chunk_data = result['data']
-        
-        # Format the data and metadata
-        data_str = json.dumps(chunk_data.get('data', {}), indent=2)
-        metadata_str = json.dumps(chunk_data.get('metadata', {}), indent=2)
-        
-        chunk_results_str += f"Chunk {chunk_index}:\n"
-        chunk_results_str += f"Data:\n{data_str}\n\n"
-        chunk_results_str += f"Metadata:\n{metadata_str}\n\n"
+    chunk_results_str = format_chunk_results(chunk_results)
     
     # Create the prompt with request for reasoning
     prompt = f"""
@@ -968,7 +978,9 @@ def delete_running_extraction_endpoint(source: str, dataset_name: str) -> Tuple[
 @extractors_bp.route('/extract/status/<source>/<path:dataset_name>', methods=['GET'])
 def get_extraction_status(source: str, dataset_name: str) -> Tuple[Response, int]:
     """Get the status of an extraction job."""
-    extraction_progress_record = db.get_session().query(ExtractionProgress).filter_by(
+    extraction_progress_record = db.get_session().query(ExtractionProgress).options(
+        undefer_group('merge_data')
+    ).filter_by(
         dataset_name=dataset_name,
         source=source
     ).first()
@@ -980,7 +992,9 @@ def get_extraction_status(source: str, dataset_name: str) -> Tuple[Response, int
 @extractors_bp.route('/extract/state/<source>/<path:dataset_name>', methods=['GET'])
 def get_extraction_state(source: str, dataset_name: str) -> Tuple[Response, int]:
     """Get the current state of an extraction job."""
-    extraction_progress_record = db.get_session().query(ExtractionProgress).filter_by(
+    extraction_progress_record = db.get_session().query(ExtractionProgress).options(
+        undefer_group('merge_data')
+    ).filter_by(
         dataset_name=dataset_name,
         source=source
     ).first()
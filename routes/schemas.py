@@ -90,7 +90,7 @@ def get_schema(id):
     """Get a schema by ID"""
     session = db.get_session()
     try:
-        schema = session.query(Schema).get(id)
+        schema = session.get(Schema, id)
         
         if not schema:
             return jsonify({'error': 'Schema not found'}), 404
@@ -117,7 +117,7 @@ def update_schema(id):
         if not data:
             return jsonify({'error': 'No data provided'}), 400
         
-        schema = session.query(Schema).get(id)
+        schema = session.get(Schema, id)
         if not schema:
             return jsonify({'error': 'Schema not found'}), 404
         
@@ -148,7 +148,7 @@ def delete_schema(id):
     """Delete a schema by ID"""
     session = db.get_session()
     try:
-        schema = session.query(Schema).get(id)
+        schema = session.get(Schema, id)
         if not schema:
             return jsonify({'error': 'Schema not found'}), 404
         
@@ -1,8 +1,9 @@
 import logging
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, request, jsonify
 from werkzeug.utils import secure_filename
 
-from storage import create_storage
+from storage import create_storage, get_storage_config
+from constants import STORAGE_TYPE
 
 logger = logging.getLogger(__name__)
 
@@ -46,24 +47,8 @@ def upload_file():
         return jsonify({'error': f'Invalid file type. Allowed types: {", ".join(ALLOWED_EXTENSIONS)}'}), 400
     
     try:
-        # Get storage configuration from app config
-        storage_type = current_app.config.get('STORAGE_TYPE', 'local')
-        storage_config = {}
-        
-        if storage_type == 's3':
-            storage_config = {
-                'bucket_name': current_app.config.get('S3_BUCKET_NAME'),
-                'aws_access_key_id': current_app.config.get('AWS_ACCESS_KEY_ID'),
-                'aws_secret_access_key': current_app.config.get('AWS_SECRET_ACCESS_KEY'),
-                'region_name': current_app.config.get('AWS_REGION')
-            }
-        else:
-            storage_config = {
-                'storage_path': current_app.config.get('LOCAL_STORAGE_PATH', '.data')
-            }
-        
         # Create storage instance
-        storage = create_storage(storage_type, storage_config)
+        storage = create_storage(STORAGE_TYPE, get_storage_config(STORAGE_TYPE))
         
         # Secure the filename to prevent path traversal attacks
         filename = secure_filename(file.filename)
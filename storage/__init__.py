@@ -8,11 +8,48 @@ from typing import Dict, Any, Optional, cast, Union
 
 from .base import StorageInterface, Storage
 from .local import LocalStorage
-from .s3 import S3Storage
+from constants import (
+    STORAGE_TYPE, LOCAL_STORAGE_PATH, S3_BUCKET_NAME, AWS_ACCESS_KEY_ID,
+    AWS_SECRET_ACCESS_KEY, AWS_REGION
+)
 from type_definitions import StorageType, StorageConfig
 
 logger = logging.getLogger(__name__)
 
+# Storage configuration is fixed for the lifetime of the process, so build it
+# once at import time rather than on every request
+S3_STORAGE_CONFIG: StorageConfig = {
+    'bucket_name': S3_BUCKET_NAME,
+    'aws_access_key_id': AWS_ACCESS_KEY_ID,
+    'aws_secret_access_key': AWS_SECRET_ACCESS_KEY,
+    'region_name': AWS_REGION
+}
+LOCAL_STORAGE_CONFIG: StorageConfig = {
+    'storage_path': LOCAL_STORAGE_PATH
+}
+
+
+def __getattr__(name: str) -> Any:
+    # The S3 backend pulls in boto3, which takes longer to import than the rest
+    # of the app, so it is only loaded once S3 storage is actually used
+    if name == 'S3Storage':
+        from .s3 import S3Storage
+        return S3Storage
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def get_storage_config(storage_type: StorageType = STORAGE_TYPE) -> StorageConfig:
+    """
+    Get the configuration for a storage type from the application settings
+    
+    Args:
+        storage_type: Type of storage ('local' or 's3'), defaults to the configured one
+        
+    Returns:
+        Configuration parameters for create_storage
+    """
+    return S3_STORAGE_CONFIG if storage_type == 's3' else LOCAL_STORAGE_CONFIG
+
 def create_storage(storage_type: StorageType, config: Optional[StorageConfig] = None) -> Storage:
     """
     Create a storage instance
@@ -34,6 +71,7 @@ def create_storage(storage_type: StorageType, config: Optional[StorageConfig] =
         storage_path = config.get('storage_path', '.data')
         return LocalStorage(storage_path=storage_path)
     elif storage_type == 's3':
+        from .s3 import S3Storage
         return S3Storage(
             bucket_name=config.get('bucket_name', ''),
             aws_access_key_id=cast(str, config.get('aws_access_key_id', '')),
@@ -44,4 +82,4 @@ def create_storage(storage_type: StorageType, config: Optional[StorageConfig] =
         raise ValueError(f"Invalid storage type: {storage_type}")
 
 
-__all__ = ['StorageInterface', 'LocalStorage', 'S3Storage', 'create_storage'] 
\ No newline at end of file
+__all__ = ['StorageInterface', 'LocalStorage', 'S3Storage', 'create_storage', 'get_storage_config'] 
\ No newline at end of file
@@ -80,6 +80,22 @@ class StorageInterface(ABC):
         """
         pass
     
+    def get_local_path(self, dataset_name: str, filename: str) -> Optional[str]:
+        """
+        Get the path of a file on the local filesystem, if the backend stores it there
+        
+        Callers that need a file on disk, such as PDF conversion, can read it in
+        place instead of copying it out of storage through get_file.
+        
+        Args:
+            dataset_name: Name of the dataset
+            filename: Name of the file
+            
+        Returns:
+            Path of the file, or None if it is not stored locally or not found
+        """
+        return None
+    
     @abstractmethod
     def read_file(self, file_path: str) -> Optional[str]:
         """
@@ -142,6 +142,24 @@ class LocalStorage(StorageInterface):
 
         return open(file_path, "rb")
 
+    def get_local_path(self, dataset_name: str, filename: str) -> Optional[str]:
+        """
+        Get the path of a file in local storage
+
+        Args:
+            dataset_name: Name of the dataset
+            filename: Name of the file
+
+        Returns:
+            Path of the file or None if the file doesn't exist
+        """
+        file_path = Path(self._storage_path) / dataset_name / filename
+
+        if not file_path.is_file():
+            return None
+
+        return str(file_path)
+
     def read_file(self, file_path: str) -> Optional[str]:
         """
         Read text file content from storage
@@ -47,7 +47,7 @@ def test_extraction_record():
             print(f"Created record with ID {record_id}")
             
             # Retrieve the record to verify it was saved correctly
-            retrieved_record = session.query(ExtractionProgress).get(record_id)
+            retrieved_record = session.get(ExtractionProgress, record_id)
             retrieved_files = retrieved_record.get_files()
             
             print(f"Retrieved files: {retrieved_files}")
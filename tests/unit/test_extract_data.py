@@ -0,0 +1,77 @@
+"""Unit tests for the extract_data command-line script."""
+import io
+import json
+import tempfile
+import unittest
+from unittest import mock
+
+import extract_data
+from storage.local import LocalStorage
+
+SCHEMA = json.dumps({'type': 'object', 'properties': {'name': {'type': 'string'}}})
+
+
+class TestExtractPdfFiles(unittest.TestCase):
+    """Test cases for extracting the PDF files of a dataset."""
+
+    def setUp(self):
+        """Store two PDFs and stub out PDF conversion and LLM extraction."""
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.storage = LocalStorage(temp_dir.name)
+        for filename in ('a.pdf', 'b.pdf'):
+            self.storage.save_file('ds', io.BytesIO(f'%PDF {filename}'.encode('utf-8')), filename)
+
+        for patcher in (
+            mock.patch.object(extract_data, 'pdf_to_markdown', return_value='# Report'),
+            mock.patch.object(extract_data, 'process_file', return_value={'data': {'name': 'Acme'}}),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def extract(self, schema=SCHEMA):
+        """Extract both PDFs into the ds-extracted directory."""
+        return extract_data.extract_pdf_files(
+            self.storage, 'local', 'ds', 'ds-extracted', ['a.pdf', 'b.pdf'], schema, {}
+        )
+
+    def test_extracts_and_saves_results(self):
+        """Test that each file is extracted with its own arguments and saved to storage."""
+        results = self.extract()
+
+        self.assertEqual(
+            results,
+            [
+                {'status': 'success', 'output_file': 'ds-extracted/a.json'},
+                {'status': 'success', 'output_file': 'ds-extracted/b.json'},
+            ]
+        )
+        extract_data.process_file.assert_any_call('a.pdf', 'local', 'ds', {}, '# Report', schema=SCHEMA)
+        with self.storage.get_file('ds-extracted', 'a.json') as f:
+            self.assertEqual(json.load(f), {'name': 'Acme'})
+
+    def test_second_run_skips_unchanged_files(self):
+        """Test that a second run only extracts the file that changed."""
+        self.extract()
+        self.storage.save_file('ds', io.BytesIO(b'%PDF changed'), 'b.pdf')
+        extract_data.process_file.reset_mock()
+
+        results = self.extract()
+
+        self.assertEqual(results[0], {'status': 'skipped', 'output_file': 'ds-extracted/a.json'})
+        self.assertEqual(results[1]['status'], 'success')
+        self.assertEqual([c.args[0] for c in extract_data.process_file.call_args_list], ['b.pdf'])
+
+    def test_schema_change_extracts_again(self):
+        """Test that files extracted with another schema are not skipped."""
+        self.extract()
+        extract_data.process_file.reset_mock()
+
+        results = self.extract(schema=json.dumps({'type': 'object'}))
+
+        self.assertEqual([r['status'] for r in results], ['success', 'success'])
+        self.assertEqual(extract_data.process_file.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+"""Unit tests for the LLM extraction cache."""
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from ai.extraction_cache import ExtractionCache
+from ai.llm_extractor import LLMExtractor
+
+SCHEMA = {'name': {'type': 'string'}}
+RESULT = {'data': {'name': 'Acme'}, 'metadata': {'name': {'confidence': 0.9}}}
+
+
+class TestExtractionCache(unittest.TestCase):
+    """Test cases for ExtractionCache."""
+
+    def setUp(self):
+        """Create a cache in a temporary directory."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache = ExtractionCache(self.temp_dir.name)
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        self.temp_dir.cleanup()
+
+    def test_round_trip(self):
+        """Test that a stored result is returned for the same key."""
+        key = self.cache.make_key('deepseek', 'model', 0.3, 'prompt', SCHEMA)
+        self.assertIsNone(self.cache.get(key))
+        self.cache.set(key, RESULT, 'deepseek', 'model')
+        self.assertEqual(self.cache.get(key), RESULT)
+
+    def test_key_depends_on_inputs(self):
+        """Test that changing the model, prompt or schema changes the key."""
+        key = self.cache.make_key('deepseek', 'model', 0.3, 'prompt', SCHEMA)
+        self.assertNotEqual(key, self.cache.make_key('deepseek', 'other', 0.3, 'prompt', SCHEMA))
+        self.assertNotEqual(key, self.cache.make_key('deepseek', 'model', 0.3, 'prompt 2', SCHEMA))
+        self.assertNotEqual(key, self.cache.make_key('deepseek', 'model', 0.3, 'prompt', {}))
+        self.assertEqual(key, self.cache.make_key('deepseek', 'model', 0.3, 'prompt', dict(SCHEMA)))
+
+    def test_invalid_entry_is_evicted(self):
+        """Test that an unreadable entry is treated as a miss and removed."""
+        key = self.cache.make_key('deepseek', 'model', 0.3, 'prompt', SCHEMA)
+        self.cache.set(key, RESULT, 'deepseek', 'model')
+        path = self.cache._path(key)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('{"result": ')
+
+        self.assertIsNone(self.cache.get(key))
+        self.assertFalse(os.path.exists(path))
+
+
+class TestLLMExtractorCaching(unittest.TestCase):
+    """Test cases for caching in LLMExtractor."""
+
+    def setUp(self):
+        """Create a local extractor backed by a temporary cache."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        patcher = mock.patch(
+            'ai.llm_extractor.get_extraction_cache',
+            return_value=ExtractionCache(self.temp_dir.name)
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.extractor = LLMExtractor(use_api=False, provider='ollama', model='test-model')
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        self.temp_dir.cleanup()
+
+    def test_repeated_prompt_calls_model_once(self):
+        """Test that the model is only called the first time a prompt is seen."""
+        with mock.patch.object(self.extractor, '_call_local_api', return_value=json.dumps(RESULT)) as call:
+            first = self.extractor.extract_data_with_context('prompt', SCHEMA)
+            second = self.extractor.extract_data_with_context('prompt', SCHEMA)
+
+        self.assertEqual(call.call_count, 1)
+        self.assertEqual(first, second)
+        self.assertEqual(second['data'], {'name': 'Acme'})
+
+    def test_failed_extraction_not_cached(self):
+        """Test that empty results are retried instead of cached."""
+        with mock.patch.object(self.extractor, '_call_local_api', return_value=None) as call:
+            self.extractor.extract_data_with_context('prompt', SCHEMA)
+            self.extractor.extract_data_with_context('prompt', SCHEMA)
+
+        self.assertEqual(call.call_count, 2)
+
+    def test_extract_data_cached(self):
+        """Test that plain extraction of the same content calls the model once."""
+        with mock.patch.object(self.extractor, '_call_local_api', return_value=json.dumps({'name': 'Acme'})) as call:
+            first = self.extractor.extract_data('Acme annual report', SCHEMA)
+            second = self.extractor.extract_data('Acme annual report', SCHEMA)
+
+        self.assertEqual(call.call_count, 1)
+        self.assertEqual(first, second)
+
+
+if __name__ == "__main__":
+    unittest.main()
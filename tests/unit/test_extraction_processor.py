@@ -0,0 +1,122 @@
+"""Unit tests for the batch extraction processor."""
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from db.session import Database
+from batch import extraction_processor
+from utils import extraction_progress
+
+SCHEMA = {'type': 'object', 'properties': {'name': {'type': 'string'}, 'city': {'type': 'string'}}}
+
+
+class FakeExtractor:
+    """Extractor that holds each file's first chunk until both files reach it."""
+
+    provider = 'test'
+    model = 'test'
+    use_api = True
+
+    def __init__(self, failing=None):
+        self.barrier = threading.Barrier(2, timeout=5)
+        self.failing = failing
+
+    def extract_data_with_context(self, prompt, schema):
+        name = 'alpha' if 'alpha' in prompt else 'beta'
+        if ' one' in prompt:
+            self.barrier.wait()
+        if name == self.failing:
+            raise RuntimeError(f'{name} failed')
+        return {'data': {'name': name}, 'metadata': {}}
+
+    def merge_results(self, chunk_results):
+        return f'merged {len(chunk_results)} chunks'
+
+
+class TestConcurrentFileExtraction(unittest.TestCase):
+    """Test cases for extracting several files of a dataset at once."""
+
+    def setUp(self):
+        """Cache the markdown of two files and use a temporary database."""
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.data_dir = temp_dir.name
+        markdown_dir = os.path.join(self.data_dir, 'cached', 'local', 'ds-md')
+        os.makedirs(markdown_dir)
+        for stem in ('alpha', 'beta'):
+            with open(os.path.join(markdown_dir, f'{stem}.md'), 'w', encoding='utf-8') as f:
+                f.write(f'{stem} one\n\n{stem} two\n\n{stem} six')
+
+        database = Database(f"sqlite:///{os.path.join(self.data_dir, 'test.db')}")
+        database.create_tables()
+        self.addCleanup(database.dispose_engine)
+
+        for patcher in (
+            mock.patch.object(extraction_progress, 'db', database),
+            mock.patch.object(extraction_processor, 'DATA_DIR', self.data_dir),
+            mock.patch.object(extraction_processor, 'EXTRACTION_WORKERS', 2),
+            mock.patch.object(extraction_processor, 'EXTRACTION_BATCH_MAX_FILES', 1),
+            mock.patch.object(extraction_processor, 'MAX_CHUNK_SIZE', 10),
+            mock.patch.object(extraction_processor, 'LLM_MAX_CONCURRENCY', 1),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.window_states = []
+        update = extraction_progress.update_extraction_progress
+
+        def record_window(source, dataset_name, update_data):
+            updated = update(source, dataset_name, update_data)
+            if 'processed_files' in update_data:
+                self.window_states.append(extraction_progress.get_extraction_state(source, dataset_name))
+            return updated
+
+        patcher = mock.patch.object(extraction_progress, 'update_extraction_progress', side_effect=record_window)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def run_extraction(self, extractor):
+        """Extract both files and return the final progress record."""
+        files = ['alpha.pdf', 'beta.pdf']
+        extraction_id = extraction_progress.start_extraction('local', 'ds', files)
+        with mock.patch.object(extraction_processor, 'get_llm_extractor', return_value=extractor), \
+                mock.patch('builtins.print'):
+            extraction_processor.handle_dataset_extraction(
+                extraction_id, 'local', 'ds', files, SCHEMA, os.path.join(self.data_dir, 'extracted')
+            )
+        return extraction_progress.get_extraction_state('local', 'ds')
+
+    def test_window_progress_recorded_once(self):
+        """Test that files extracted together are counted and their merge reasoning kept."""
+        state = self.run_extraction(FakeExtractor())
+
+        self.assertEqual(len(self.window_states), 1)
+        window_state = self.window_states[0]
+        self.assertEqual(window_state['processed_files'], 2)
+        self.assertEqual(window_state['merged_data'], {'name': 'beta'})
+        history = window_state['merge_reasoning_history']
+        self.assertEqual(len(history), 4)
+        self.assertEqual([entry['is_final'] for entry in history], [False, True, False, True])
+
+        self.assertEqual(state['status'], 'completed')
+        self.assertEqual(state['processed_files'], 2)
+        extracted_dir = os.path.join(self.data_dir, 'extracted', 'local', 'ds')
+        self.assertEqual(sorted(os.listdir(extracted_dir)), ['alpha.json', 'beta.json'])
+
+    def test_failed_file_does_not_fail_extraction(self):
+        """Test that a failing file is not counted and leaves the other file's results."""
+        with mock.patch.object(extraction_processor, 'logger'):
+            state = self.run_extraction(FakeExtractor(failing='beta'))
+
+        window_state = self.window_states[0]
+        self.assertEqual(window_state['processed_files'], 1)
+        self.assertEqual(window_state['merged_data'], {'name': 'alpha'})
+        self.assertEqual(len(window_state['merge_reasoning_history']), 2)
+        self.assertEqual(state['status'], 'completed')
+        self.assertEqual(state['processed_files'], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
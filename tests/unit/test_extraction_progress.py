@@ -0,0 +1,61 @@
+"""Unit tests for extraction_progress utilities."""
+import json
+import unittest
+
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import Session
+
+from db.models import Base, ExtractionProgress
+from utils.extraction_progress import json_array_append
+
+
+class TestJsonArrayAppend(unittest.TestCase):
+    """Test cases for json_array_append."""
+
+    def setUp(self):
+        """Create an in-memory database with a progress record."""
+        self.engine = create_engine('sqlite://')
+        Base.metadata.create_all(self.engine)
+        self.session = Session(self.engine)
+        self.record = ExtractionProgress(
+            source='local', dataset_name='ds', status='in_progress', total_files=1,
+            processed_files=0, file_progress=0.0, files='[]'
+        )
+        self.session.add(self.record)
+        self.session.commit()
+
+    def tearDown(self):
+        """Close the session and dispose of the engine."""
+        self.session.close()
+        self.engine.dispose()
+
+    def append(self, entries):
+        """Append entries to the record's history and return the stored value."""
+        column = ExtractionProgress.merge_reasoning_history
+        self.session.execute(
+            update(ExtractionProgress)
+            .where(ExtractionProgress.id == self.record.id)
+            .values(merge_reasoning_history=json_array_append(self.session, column, entries))
+        )
+        self.session.commit()
+        return json.loads(self.session.get(ExtractionProgress, self.record.id).merge_reasoning_history)
+
+    def test_append_to_empty_history(self):
+        """Test that appending to a NULL column starts a new array."""
+        self.assertEqual(self.append([{'step': 1}]), [{'step': 1}])
+
+    def test_append_keeps_existing_entries(self):
+        """Test that entries are appended after the existing ones, in order."""
+        self.append([{'step': 1}])
+        history = self.append([{'step': 2}, {'step': 3, 'nested': {'ok': True}}])
+        self.assertEqual(history, [{'step': 1}, {'step': 2}, {'step': 3, 'nested': {'ok': True}}])
+
+    def test_invalid_history_is_replaced(self):
+        """Test that a history that is not valid JSON is treated as empty."""
+        self.record.merge_reasoning_history = 'not json'
+        self.session.commit()
+        self.assertEqual(self.append([{'step': 1}]), [{'step': 1}])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+"""Unit tests for the extraction progress list endpoints."""
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from flask import Flask
+
+from db import ExtractionProgress
+from db.session import Database
+from routes import extraction_progress
+
+
+class TestStreamedProgressLists(unittest.TestCase):
+    """Test cases for the streamed extraction progress lists."""
+
+    def setUp(self):
+        """Serve the blueprint from an empty in-memory database."""
+        database = Database('sqlite://')
+        database.create_tables()
+        self.addCleanup(database.dispose_engine)
+        patcher = mock.patch.object(extraction_progress, 'db', database)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        app = Flask(__name__)
+        app.register_blueprint(extraction_progress.extraction_progress_bp, url_prefix='/api/extraction-progress')
+        self.client = app.test_client()
+
+    def test_lists_records(self):
+        """Test that both list endpoints return their JSON envelopes."""
+        response = self.client.get('/api/extraction-progress/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json(), {'extraction_progresses': []})
+
+        response = self.client.get('/api/extraction-progress/extraction-progress/list')
+        self.assertEqual(response.get_json(), {'success': True, 'records': []})
+
+    def test_query_error_returns_json_error(self):
+        """Test that a failing query gives a 500 JSON error rather than a truncated 200 stream."""
+        with mock.patch.object(extraction_progress, 'select', side_effect=RuntimeError('db down')), \
+                mock.patch.object(extraction_progress, 'logger'):
+            response = self.client.get('/api/extraction-progress/')
+            self.assertEqual(response.status_code, 500)
+            self.assertEqual(response.get_json(), {'error': 'db down'})
+
+            response = self.client.get('/api/extraction-progress/extraction-progress/list')
+            self.assertEqual(response.status_code, 500)
+            self.assertEqual(response.get_json(), {'success': False, 'error': 'db down'})
+
+
+class TestProgressRecordValidation(unittest.TestCase):
+    """Test cases for field validation on progress record create and update."""
+
+    def setUp(self):
+        """Serve the blueprint from an in-memory database holding one record."""
+        database = Database('sqlite://')
+        database.create_tables()
+        self.addCleanup(database.dispose_engine)
+        patcher = mock.patch.object(extraction_progress, 'db', database)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        app = Flask(__name__)
+        app.register_blueprint(extraction_progress.extraction_progress_bp, url_prefix='/api/extraction-progress')
+        self.client = app.test_client()
+
+        response = self.client.post('/api/extraction-progress/extraction-progress/create', json={
+            'source': 'local', 'dataset_name': 'reports', 'status': 'processing', 'total_files': 2,
+            'processed_files': 0, 'file_progress': 0, 'files': '["a.pdf", "b.pdf"]',
+            'start_time': '2024-05-01T12:30:00'
+        })
+        self.assertEqual(response.status_code, 200)
+        self.progress_id = response.get_json()['id']
+        self.database = database
+
+    def get_record(self):
+        """Load the record created in setUp."""
+        with self.database.get_session() as session:
+            return session.get(ExtractionProgress, self.progress_id).to_dict()
+
+    def test_create_parses_dates(self):
+        """Test that ISO date strings are stored as dates."""
+        self.assertEqual(self.get_record()['start_time'], '2024-05-01T12:30:00')
+
+    def test_create_rejects_wrong_types(self):
+        """Test that create rejects wrongly typed optional fields with a 400."""
+        base = {'source': 'local', 'dataset_name': 'reports', 'status': 'processing', 'total_files': 1}
+        for field, value in (('start_time', 'abc'), ('files', ['a.pdf']), ('merged_data', '{oops')):
+            response = self.client.post(
+                '/api/extraction-progress/extraction-progress/create', json={**base, field: value}
+            )
+            self.assertEqual(response.status_code, 400, field)
+            self.assertFalse(response.get_json()['success'])
+
+    def test_update_rejects_wrong_type(self):
+        """Test that a wrongly typed field is rejected with a 400 and not stored."""
+        response = self.client.put(
+            f'/api/extraction-progress/extraction-progress/update/{self.progress_id}',
+            json={'total_files': 'x'}
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json(), {'success': False, 'error': 'Invalid type for field: total_files'})
+        self.assertEqual(self.get_record()['total_files'], 2)
+
+    def test_update_accepts_typed_fields(self):
+        """Test that correctly typed fields, including null for nullable columns, are stored."""
+        response = self.client.put(
+            f'/api/extraction-progress/extraction-progress/update/{self.progress_id}',
+            json={'processed_files': 1, 'file_progress': 50, 'message': None, 'end_time': '2024-05-01T13:00:00'}
+        )
+        self.assertEqual(response.status_code, 200)
+        record = self.get_record()
+        self.assertEqual((record['processed_files'], record['file_progress']), (1, 50))
+        self.assertEqual(record['end_time'], '2024-05-01T13:00:00')
+
+
+class TestExtractionPoolShutdown(unittest.TestCase):
+    """Test cases for stopping the extraction pool at server shutdown."""
+
+    def test_queued_jobs_cancelled_and_extractions_paused(self):
+        """Test that shutdown cancels queued jobs and pauses every pool extraction."""
+        pool = ThreadPoolExecutor(max_workers=1)
+        release = threading.Event()
+        with mock.patch.object(extraction_progress, '_extraction_pool', pool), \
+                mock.patch.object(extraction_progress, 'extraction_progress') as progress, \
+                mock.patch.object(extraction_progress, 'logger'):
+            running = extraction_progress.submit_extraction('local', 'running', release.wait)
+            queued = extraction_progress.submit_extraction('local', 'queued', release.wait)
+
+            extraction_progress.shutdown_extraction_pool()
+            release.set()
+            running.result(timeout=5)
+
+        self.assertTrue(queued.cancelled())
+        paused = {call.args[:2] for call in progress.update_extraction_progress.call_args_list}
+        self.assertEqual(paused, {('local', 'running'), ('local', 'queued')})
+        self.assertEqual(extraction_progress.get_pending_extractions(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+"""Unit tests for json_utils module."""
+import json
+import os
+import tempfile
+import unittest
+
+from utils.json_utils import (
+    RawJSON, dumps_with_raw, is_path_populated, schema_leaf_paths, validate_json_fields, write_json_file
+)
+
+
+class TestValidateJsonFields(unittest.TestCase):
+    """Test cases for validate_json_fields."""
+
+    def test_valid_body(self):
+        """Test that known fields are kept and unknown fields dropped."""
+        data, error = validate_json_fields(
+            {'source': 'local', 'schema_id': None, 'extra': 1},
+            {'source': str},
+            {'schema_id': (int, type(None))},
+        )
+        self.assertIsNone(error)
+        self.assertEqual(data, {'source': 'local', 'schema_id': None})
+
+    def test_missing_field(self):
+        """Test that missing required fields are reported."""
+        data, error = validate_json_fields({'source': 'local'}, {'source': str, 'total_files': int})
+        self.assertEqual(data, {})
+        self.assertEqual(error, 'Missing required field: total_files')
+
+    def test_invalid_type(self):
+        """Test that wrongly typed fields are rejected, including bools for ints."""
+        _, error = validate_json_fields({'total_files': '3'}, {'total_files': int})
+        self.assertEqual(error, 'Invalid type for field: total_files')
+        _, error = validate_json_fields({'total_files': True}, {'total_files': int})
+        self.assertEqual(error, 'Invalid type for field: total_files')
+
+    def test_non_object_body(self):
+        """Test that a body that is not a JSON object is rejected."""
+        _, error = validate_json_fields(None, {'source': str})
+        self.assertEqual(error, 'Request body must be a JSON object')
+
+
+class TestDumpsWithRaw(unittest.TestCase):
+    """Test cases for dumps_with_raw."""
+
+    def test_raw_values_written_verbatim(self):
+        """Test that RawJSON text is spliced in without re-encoding."""
+        encoded = dumps_with_raw({'a': RawJSON('{"x": [1, 2]}'), 'b': [RawJSON('null'), 'text']})
+        self.assertEqual(encoded, '{"a": {"x": [1, 2]}, "b": [null, "text"]}')
+
+    def test_without_raw_values(self):
+        """Test that plain objects serialize like json.dumps."""
+        data = {'name': 'a "quoted" value', 'items': [1, 2.5, None]}
+        self.assertEqual(dumps_with_raw(data, separators=(',', ':')), json.dumps(data, separators=(',', ':')))
+
+    def test_unsupported_type(self):
+        """Test that other unserializable values still raise TypeError."""
+        with self.assertRaises(TypeError):
+            dumps_with_raw({'a': object()})
+
+
+class TestWriteJsonFile(unittest.TestCase):
+    """Test cases for write_json_file."""
+
+    def test_replaces_file_without_leaving_temporary_files(self):
+        """Test that the file is replaced and only the JSON file remains."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'result.json')
+            write_json_file(path, {'name': 'old'})
+            write_json_file(path, {'name': 'new'})
+
+            with open(path, encoding='utf-8') as f:
+                self.assertEqual(json.load(f), {'name': 'new'})
+            self.assertEqual(os.listdir(temp_dir), ['result.json'])
+
+    def test_unserializable_data_leaves_file_unchanged(self):
+        """Test that a serialization error does not touch the existing file."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'result.json')
+            write_json_file(path, {'name': 'old'})
+
+            with self.assertRaises(TypeError):
+                write_json_file(path, {'name': object()})
+
+            with open(path, encoding='utf-8') as f:
+                self.assertEqual(json.load(f), {'name': 'old'})
+
+
+class TestSchemaLeafPaths(unittest.TestCase):
+    """Test cases for finding the fields a schema asks for."""
+
+    def test_json_schema(self):
+        """Test that nested JSON schema properties give one path per scalar field."""
+        schema = {
+            'type': 'object',
+            'properties': {
+                'name': {'type': 'string'},
+                'address': {'type': 'object', 'properties': {'city': {'type': 'string'}}},
+            },
+        }
+        self.assertEqual(schema_leaf_paths(schema), {('name',), ('address', 'city')})
+
+    def test_plain_mapping(self):
+        """Test that a mapping of field names to field schemas is walked like properties."""
+        self.assertEqual(schema_leaf_paths({'name': {'type': 'string'}}), {('name',)})
+
+    def test_array_has_no_fixed_fields(self):
+        """Test that a schema with an array field gives None."""
+        schema = {'properties': {'timePeriods': {'type': 'array', 'items': {'type': 'object'}}}}
+        self.assertIsNone(schema_leaf_paths(schema))
+
+    def test_is_path_populated(self):
+        """Test that only non-null values at the full path count as populated."""
+        data = {'address': {'city': 'Paris', 'zip': None}, 'name': 'Acme'}
+        self.assertTrue(is_path_populated(data, ('address', 'city')))
+        self.assertFalse(is_path_populated(data, ('address', 'zip')))
+        self.assertFalse(is_path_populated(data, ('name', 'first')))
+        self.assertFalse(is_path_populated(data, ('revenue',)))
+
+
+if __name__ == "__main__":
+    unittest.main()
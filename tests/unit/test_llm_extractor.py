@@ -0,0 +1,116 @@
+"""Unit tests for LLMExtractor."""
+import json
+import unittest
+from unittest import mock
+
+from ai.llm_extractor import LLM_MAX_RETRIES, LLMExtractor
+
+SCHEMA = {'name': {'type': 'string'}}
+VALID_RESPONSE = json.dumps({'data': {'name': 'Acme'}, 'metadata': {}})
+
+
+class TestExtractDataWithContextRetries(unittest.TestCase):
+    """Test cases for retrying unparseable model responses."""
+
+    def setUp(self):
+        """Create a local extractor with caching and retry delays turned off."""
+        for patcher in (
+            mock.patch('ai.llm_extractor.get_extraction_cache', return_value=None),
+            mock.patch('ai.llm_extractor.LLM_RETRY_BACKOFF', 0),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.extractor = LLMExtractor(use_api=False, provider='ollama', model='test-model')
+
+    def test_invalid_response_retried_with_feedback(self):
+        """Test that an unparseable response is retried with the error appended."""
+        with mock.patch.object(
+            self.extractor, '_call_local_api', side_effect=['not json at all', VALID_RESPONSE]
+        ) as call:
+            result = self.extractor.extract_data_with_context('prompt', SCHEMA)
+
+        self.assertEqual(result['data'], {'name': 'Acme'})
+        self.assertEqual(call.call_count, 2)
+        retry_prompt = call.call_args_list[1].args[0]
+        self.assertTrue(retry_prompt.startswith('prompt'))
+        self.assertIn('not json at all', retry_prompt)
+
+    def test_retries_are_bounded(self):
+        """Test that a model that never returns JSON gives an empty result."""
+        with mock.patch.object(self.extractor, '_call_local_api', return_value='still not json') as call:
+            result = self.extractor.extract_data_with_context('prompt', SCHEMA)
+
+        self.assertEqual(result, {'data': {}, 'metadata': {}})
+        self.assertEqual(call.call_count, LLM_MAX_RETRIES + 1)
+
+    def test_failed_request_not_retried(self):
+        """Test that a request that got no response is not retried."""
+        with mock.patch.object(self.extractor, '_call_local_api', return_value=None) as call:
+            self.extractor.extract_data_with_context('prompt', SCHEMA)
+
+        self.assertEqual(call.call_count, 1)
+
+
+class TestExtractBatchWithContext(unittest.TestCase):
+    """Test cases for extracting several documents in one request."""
+
+    def setUp(self):
+        """Create a local extractor."""
+        self.extractor = LLMExtractor(use_api=False, provider='ollama', model='test-model')
+
+    def test_array_split_into_results(self):
+        """Test that a fenced JSON array is returned as one result per document."""
+        response = '```json\n' + json.dumps([
+            {'data': {'name': 'Acme'}, 'metadata': {'name': {'confidence': 0.9}}},
+            {'data': {'name': 'Globex'}},
+        ]) + '\n```'
+        with mock.patch.object(self.extractor, '_call_local_api', return_value=response):
+            results = self.extractor.extract_batch_with_context('prompt', SCHEMA, 2)
+
+        self.assertEqual([r['data'] for r in results], [{'name': 'Acme'}, {'name': 'Globex'}])
+        self.assertEqual(results[1]['metadata'], {})
+
+    def test_wrong_length_rejected(self):
+        """Test that an array with the wrong number of results is rejected."""
+        response = json.dumps([{'data': {'name': 'Acme'}}])
+        with mock.patch.object(self.extractor, '_call_local_api', return_value=response):
+            self.assertIsNone(self.extractor.extract_batch_with_context('prompt', SCHEMA, 2))
+
+    def test_invalid_response_rejected(self):
+        """Test that a response that is not JSON is rejected."""
+        with mock.patch.object(self.extractor, '_call_local_api', return_value='not json'):
+            self.assertIsNone(self.extractor.extract_batch_with_context('prompt', SCHEMA, 2))
+
+
+class TestStructuredOutputFormat(unittest.TestCase):
+    """Test cases for constraining local model output to the schema."""
+
+    def setUp(self):
+        """Create a local extractor with caching turned off."""
+        patcher = mock.patch('ai.llm_extractor.get_extraction_cache', return_value=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.extractor = LLMExtractor(use_api=False, provider='ollama', model='test-model')
+
+    def _post_format(self, schema):
+        response = mock.Mock()
+        response.json.return_value = {'message': {'content': VALID_RESPONSE}}
+        with mock.patch.object(self.extractor, '_post', return_value=response) as post:
+            self.extractor.extract_data_with_context('prompt', schema)
+        return post.call_args.kwargs['json'].get('format')
+
+    def test_json_schema_sent_as_format(self):
+        """Test that a JSON schema is wrapped in the data and metadata envelope."""
+        schema = {'type': 'object', 'properties': {'name': {'type': 'string'}}}
+        response_format = self._post_format(schema)
+
+        self.assertEqual(response_format['properties']['data'], schema)
+        self.assertEqual(response_format['required'], ['data', 'metadata'])
+
+    def test_other_schema_requests_json(self):
+        """Test that a schema that is not a JSON schema object only requests JSON."""
+        self.assertEqual(self._post_format(SCHEMA), 'json')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+"""Unit tests for db models."""
+import json
+import unittest
+from datetime import datetime
+
+from sqlalchemy import create_engine, select, update
+from sqlalchemy.orm import Session
+
+from db.models import Base, ExtractionProgress
+from utils.json_utils import dumps_with_raw
+
+
+class TestExtractionProgressSerialization(unittest.TestCase):
+    """Test cases for ExtractionProgress serialization."""
+
+    def setUp(self):
+        """Create an in-memory database with two progress records."""
+        self.engine = create_engine('sqlite://')
+        Base.metadata.create_all(self.engine)
+        self.session = Session(self.engine)
+        self.session.add_all([
+            ExtractionProgress(
+                source='local', dataset_name='ds', status='completed', total_files=1,
+                processed_files=1, file_progress=1.0, files=json.dumps(['a.pdf']),
+                merged_data=json.dumps({'name': 'a'}), schema=json.dumps({'name': {'type': 'string'}}),
+                start_time=datetime(2024, 1, 1, 12, 0), end_time=datetime(2024, 1, 1, 12, 5)
+            ),
+            ExtractionProgress(
+                source='local', dataset_name='ds', status='in_progress', total_files=0,
+                processed_files=0, file_progress=0.0, files=''
+            ),
+        ])
+        self.session.commit()
+
+    def tearDown(self):
+        """Close the session and dispose of the engine."""
+        self.session.close()
+        self.engine.dispose()
+
+    def test_row_to_dict_matches_to_dict(self):
+        """Test that serializing a Core row gives the same dict as the ORM instance."""
+        order = ExtractionProgress.id
+        records = self.session.query(ExtractionProgress).order_by(order).all()
+        rows = self.session.execute(select(ExtractionProgress.__table__).order_by(order)).mappings().all()
+
+        for record, row in zip(records, rows):
+            expected = record.to_dict()
+            actual = ExtractionProgress.row_to_dict(row)
+            self.assertEqual(actual, expected)
+            self.assertEqual(list(actual), list(expected))
+
+    def test_to_dict_loads_expired_columns(self):
+        """Test that to_dict reloads an instance expired by a commit."""
+        record = self.session.query(ExtractionProgress).filter_by(status='completed').one()
+        record.message = 'Done'
+        self.session.commit()
+
+        data = record.to_dict()
+        self.assertEqual(data['message'], 'Done')
+        self.assertEqual(data['files'], ['a.pdf'])
+        self.assertEqual(data['start_time'], '2024-01-01T12:00:00')
+
+    def test_row_to_dict_raw_json(self):
+        """Test that raw_json serialization matches the decoded form."""
+        rows = self.session.execute(select(ExtractionProgress.__table__)).mappings().all()
+        for row in rows:
+            raw = json.loads(dumps_with_raw(ExtractionProgress.row_to_dict(row, raw_json=True)))
+            self.assertEqual(raw, ExtractionProgress.row_to_dict(row))
+
+    def test_empty_json_columns(self):
+        """Test that empty JSON columns serialize to their defaults."""
+        row = self.session.execute(
+            select(ExtractionProgress.__table__).where(ExtractionProgress.status == 'in_progress')
+        ).mappings().one()
+        data = ExtractionProgress.row_to_dict(row)
+        self.assertEqual(data['files'], [])
+        self.assertIsNone(data['merged_data'])
+        self.assertIsNone(data['end_time'])
+
+    def test_updated_at_set_by_database(self):
+        """Test that updated_at is stamped on insert and on Core updates."""
+        record = self.session.query(ExtractionProgress).filter_by(status='in_progress').one()
+        created = record.updated_at
+        self.assertIsInstance(created, datetime)
+
+        self.session.execute(
+            update(ExtractionProgress).where(ExtractionProgress.id == record.id).values(message='Resumed')
+        )
+        self.session.commit()
+        self.assertGreater(record.updated_at, created)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+"""Unit tests for pdf_utils module."""
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from utils import pdf_utils
+
+
+@unittest.skipUnless(pdf_utils.PDF_SUPPORT, "pymupdf4llm not installed")
+class TestPdfToMarkdown(unittest.TestCase):
+    """Test cases for pdf_to_markdown."""
+
+    def make_pdf(self, page_count):
+        """Write a PDF with a heading and body text on each page."""
+        doc = pdf_utils.pymupdf.open()
+        for i in range(page_count):
+            page = doc.new_page()
+            page.insert_text((72, 72), f"Section {i}", fontsize=20)
+            for line in range(5):
+                page.insert_text((72, 110 + line * 16), f"Body text {line} on page {i}.", fontsize=10)
+        fd, path = tempfile.mkstemp(suffix='.pdf')
+        os.close(fd)
+        doc.save(path)
+        doc.close()
+        self.addCleanup(os.unlink, path)
+        return path
+
+    def test_parallel_conversion_matches_single_pass(self):
+        """Test that converting page ranges in workers gives the same markdown."""
+        path = self.make_pdf(pdf_utils.PARALLEL_MIN_PAGES + 4)
+        expected = pdf_utils.pymupdf4llm.to_markdown(path)
+
+        with mock.patch('utils.pdf_utils.os.cpu_count', return_value=3), \
+                mock.patch.object(pdf_utils, '_page_pool', None):
+            self.assertEqual(pdf_utils.pdf_to_markdown(path), expected)
+
+    def test_small_pdf_converted_in_process(self):
+        """Test that small PDFs do not use the page pool."""
+        path = self.make_pdf(2)
+        with mock.patch.object(pdf_utils, '_get_page_pool') as get_pool:
+            markdown = pdf_utils.pdf_to_markdown(path)
+        get_pool.assert_not_called()
+        self.assertIn('Section 1', markdown)
+
+
+if __name__ == "__main__":
+    unittest.main()
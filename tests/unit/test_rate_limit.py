@@ -0,0 +1,51 @@
+"""Unit tests for the LLM request limiter."""
+import threading
+import time
+import unittest
+
+from ai.rate_limit import RequestLimiter
+
+
+class TestRequestLimiter(unittest.TestCase):
+    """Test cases for RequestLimiter."""
+
+    def test_caps_concurrent_requests(self):
+        """Test that no more than max_concurrency requests run at once."""
+        limiter = RequestLimiter(max_concurrency=2)
+        lock = threading.Lock()
+        running = []
+        peak = []
+
+        def request():
+            with limiter:
+                with lock:
+                    running.append(1)
+                    peak.append(len(running))
+                time.sleep(0.02)
+                with lock:
+                    running.pop()
+
+        threads = [threading.Thread(target=request) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(max(peak), 2)
+
+    def test_spaces_request_starts(self):
+        """Test that requests start no faster than the configured rate."""
+        limiter = RequestLimiter(max_concurrency=4, requests_per_second=50)
+        starts = []
+        for _ in range(4):
+            with limiter:
+                starts.append(time.monotonic())
+
+        # Starts are scheduled at fixed intervals from the first, so a start
+        # that oversleeps can be followed by a shorter gap; check the offsets
+        offsets = [start - starts[0] for start in starts]
+        self.assertTrue(all(offset >= 0.019 * i for i, offset in enumerate(offsets)), offsets)
+
+
+if __name__ == "__main__":
+    unittest.main()
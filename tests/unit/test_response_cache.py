@@ -0,0 +1,52 @@
+"""Unit tests for cached GET responses."""
+import unittest
+from unittest import mock
+
+from flask import Flask, jsonify, request
+
+from utils import response_cache
+
+
+class TestCachedResponse(unittest.TestCase):
+    """Test cases for the cached_response decorator."""
+
+    def setUp(self):
+        """Create an app with one cached view and an empty cache."""
+        response_cache.clear_response_cache()
+        self.addCleanup(response_cache.clear_response_cache)
+        self.calls = 0
+
+        app = Flask(__name__)
+
+        @app.route('/items')
+        @response_cache.cached_response(timeout=60)
+        def items():
+            self.calls += 1
+            return jsonify({'page': request.args.get('page')})
+
+        self.client = app.test_client()
+
+    def test_repeated_request_served_from_cache(self):
+        """Test that the view runs once for repeated requests."""
+        self.client.get('/items?page=1')
+        response = self.client.get('/items?page=1')
+
+        self.assertEqual(response.get_json(), {'page': '1'})
+        self.assertEqual(self.calls, 1)
+
+    def test_entry_count_bounded(self):
+        """Test that distinct query strings do not grow the cache past its cap."""
+        with mock.patch.object(response_cache, 'MAX_CACHED_RESPONSES', 3):
+            for page in range(10):
+                self.client.get(f'/items?page={page}')
+
+        self.assertEqual(len(response_cache._cache), 3)
+        self.assertIn('/items?page=9', response_cache._cache)
+
+    def test_expired_entries_pruned(self):
+        """Test that storing a response drops entries that have expired."""
+        self.client.get('/items?page=1')
+        with mock.patch.object(response_cache.time, 'monotonic', return_value=1e12):
+            self.client.get('/items?page=2')
+
+        self.assertEqual(list(response_cache._cache), ['/items?page=2'])
@@ -0,0 +1,47 @@
+"""Unit tests for text_utils module."""
+import unittest
+
+from utils.text_utils import has_extractable_text, split_content_into_chunks
+
+
+class TestHasExtractableText(unittest.TestCase):
+    """Test cases for has_extractable_text."""
+
+    def test_text_without_words(self):
+        """Test that whitespace and markdown punctuation are not worth extracting."""
+        for text in ('', '  \n\n', '-----\n\n|---|---|\n', '___ ** ##'):
+            self.assertFalse(has_extractable_text(text), repr(text))
+
+    def test_text_with_words_or_numbers(self):
+        """Test that any letter or digit makes a chunk worth extracting."""
+        for text in ('Revenue', '| 2023 |', '€ 5', 'Straße'):
+            self.assertTrue(has_extractable_text(text), repr(text))
+
+
+class TestSplitContentIntoChunks(unittest.TestCase):
+    """Test cases for split_content_into_chunks."""
+
+    def test_paragraphs_packed_into_chunks(self):
+        """Test that whole paragraphs are packed until the next would not fit."""
+        content = 'one\n\ntwo\n\nthree\n\nfour'
+        self.assertEqual(split_content_into_chunks(content, 8), ['one\n\ntwo', 'three', 'four'])
+
+    def test_long_paragraph_cut(self):
+        """Test that a paragraph longer than a chunk is cut into chunk-sized pieces."""
+        content = 'ab\n\n' + 'x' * 7 + '\n\ncd'
+        self.assertEqual(split_content_into_chunks(content, 3), ['ab', 'xxx', 'xxx', 'x\n\ncd'])
+
+    def test_chunks_cover_content(self):
+        """Test that the chunks joined back with paragraph breaks give the content."""
+        content = '\n\n'.join(f"Paragraph {i}\n" + 'text ' * (i % 7) for i in range(500)) + '\n\n\n'
+        chunks = split_content_into_chunks(content, 100)
+        self.assertEqual('\n\n'.join(chunks), content)
+        self.assertTrue(all(len(chunk.replace('\n\n', '')) <= 100 for chunk in chunks))
+
+    def test_empty_content(self):
+        """Test that empty content gives a single empty chunk."""
+        self.assertEqual(split_content_into_chunks('', 100), [''])
+
+
+if __name__ == "__main__":
+    unittest.main()
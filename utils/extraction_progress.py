@@ -1,12 +1,18 @@
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import time
 import json
 from pathlib import Path
 import threading
+import queue
 import os
 from datetime import datetime
 
+from sqlalchemy import String, case, cast, exists, func, literal
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Session, undefer_group
+from sqlalchemy.sql.elements import ColumnElement
+
 from db import db, ExtractionProgress
 
 logger = logging.getLogger(__name__)
@@ -14,10 +20,116 @@ logger = logging.getLogger(__name__)
 # Lock for thread-safe access to database operations
 db_lock = threading.Lock()
 
+# Process-local registry of "is this extraction active" answers, keyed by
+# (source, dataset_name). The lifecycle functions below keep it current for
+# changes made in this process; the TTL bounds how stale it can get when the
+# batch processor updates the database from another process.
+ACTIVE_REGISTRY_TTL = 2.0
+_active_registry: Dict[Tuple[str, str], Tuple[bool, float]] = {}
+_active_registry_lock = threading.Lock()
+
+# Subscribers waiting for changes to an extraction, keyed by (source, dataset_name).
+# Each subscriber gets a single-slot queue, so bursts of updates coalesce into
+# one wake-up and the subscriber re-reads the latest state.
+_subscribers: Dict[Tuple[str, str], List[queue.Queue]] = {}
+_subscribers_lock = threading.Lock()
+
+def subscribe(source: str, dataset_name: str) -> queue.Queue:
+    """
+    Subscribe to change notifications for a dataset's extraction
+    
+    Args:
+        source: The source of the dataset
+        dataset_name: The name of the dataset
+        
+    Returns:
+        Queue that receives an item whenever the extraction changes
+    """
+    notifications: queue.Queue = queue.Queue(maxsize=1)
+    with _subscribers_lock:
+        _subscribers.setdefault((source, dataset_name), []).append(notifications)
+    return notifications
+
+def unsubscribe(source: str, dataset_name: str, notifications: queue.Queue) -> None:
+    """
+    Stop receiving change notifications for a dataset's extraction
+    
+    Args:
+        source: The source of the dataset
+        dataset_name: The name of the dataset
+        notifications: Queue returned by subscribe
+    """
+    with _subscribers_lock:
+        subscribers = _subscribers.get((source, dataset_name), [])
+        if notifications in subscribers:
+            subscribers.remove(notifications)
+        if not subscribers:
+            _subscribers.pop((source, dataset_name), None)
+
+def _notify_subscribers(source: str, dataset_name: str) -> None:
+    """Wake up everything subscribed to a dataset's extraction"""
+    with _subscribers_lock:
+        subscribers = list(_subscribers.get((source, dataset_name), []))
+    for notifications in subscribers:
+        try:
+            notifications.put_nowait(None)
+        except queue.Full:
+            pass
+
+def _set_extraction_active(source: str, dataset_name: str, active: bool) -> None:
+    """Record whether an extraction is active in the in-memory registry"""
+    with _active_registry_lock:
+        _active_registry[(source, dataset_name)] = (active, time.monotonic())
+
+def invalidate_extraction_active(source: str, dataset_name: str) -> None:
+    """
+    Drop the cached active state for a dataset after its extraction changed
+    
+    The next check goes to the database, and any subscribers are woken up.
+    
+    Args:
+        source: The source of the dataset
+        dataset_name: The name of the dataset
+    """
+    with _active_registry_lock:
+        _active_registry.pop((source, dataset_name), None)
+    _notify_subscribers(source, dataset_name)
+
+def json_array_append(session: Session, column: Any, entries: List[Any]) -> Optional[ColumnElement]:
+    """
+    Build a SQL expression appending entries to a JSON array stored as text
+    
+    The append happens in the database, so the existing array is neither
+    read into Python nor sent back. A missing or invalid array is treated as
+    empty.
+    
+    Args:
+        session: Database session the expression will be executed with
+        column: Text column holding a JSON array
+        entries: JSON serializable entries to append
+        
+    Returns:
+        The expression to assign to the column, or None if the database has
+        no JSON functions to do it with
+    """
+    dialect = session.get_bind().dialect.name
+    if dialect == 'sqlite':
+        expression = case((func.json_valid(column) == 1, column), else_=literal('[]'))
+        for entry in entries:
+            expression = func.json_insert(expression, '$[#]', func.json(json.dumps(entry)))
+        return expression
+    if dialect == 'postgresql':
+        existing = cast(func.coalesce(column, '[]'), JSONB)
+        return cast(existing.op('||')(cast(json.dumps(entries), JSONB)), String)
+    return None
+
 def is_extraction_active(source: str, dataset_name: str) -> bool:
     """
     Check if an extraction is currently active for a dataset
     
+    The answer is served from the in-memory registry when fresh, and only
+    falls through to the database on a miss.
+    
     Args:
         source: The source of the dataset
         dataset_name: The name of the dataset
@@ -25,20 +137,42 @@ def is_extraction_active(source: str, dataset_name: str) -> bool:
     Returns:
         True if the extraction is active, False otherwise
     """
-    with db.get_session() as session:
-        active_extraction = session.query(ExtractionProgress).filter_by(
-            source=source,
-            dataset_name=dataset_name,
-            status='in_progress'
-        ).filter(
-            ExtractionProgress.end_time.is_(None)  # Only get truly in-progress extractions
-        ).first()
+    with _active_registry_lock:
+        cached = _active_registry.get((source, dataset_name))
+    if cached and time.monotonic() - cached[1] < ACTIVE_REGISTRY_TTL:
+        return cached[0]
+    
+    with db.get_readonly_session() as session:
+        active = session.query(
+            exists().where(
+                ExtractionProgress.source == source,
+                ExtractionProgress.dataset_name == dataset_name,
+                ExtractionProgress.status == 'in_progress',
+                ExtractionProgress.end_time.is_(None)  # Only get truly in-progress extractions
+            )
+        ).scalar()
 
-        if active_extraction:
+        if active:
             logger.info(f"Found active extraction in database for {source}/{dataset_name}")
-            return True
         
-        return False
+        _set_extraction_active(source, dataset_name, active)
+        return active
+
+def is_state_active(extraction_state: Optional[Dict[str, Any]]) -> bool:
+    """
+    Check whether an extraction state returned by get_extraction_state is running
+    
+    Args:
+        extraction_state: The extraction state, or None if there is none
+        
+    Returns:
+        True if the extraction is in progress, False otherwise
+    """
+    return (
+        extraction_state is not None
+        and extraction_state.get('status') == 'in_progress'
+        and extraction_state.get('end_time') is None
+    )
 
 def get_extraction_state(source: str, dataset_name: str) -> Optional[Dict[str, Any]]:
     """
@@ -51,8 +185,10 @@ def get_extraction_state(source: str, dataset_name: str) -> Optional[Dict[str, A
     Returns:
         The current extraction state or None if not found
     """
-    with db.get_session() as session:
-        extraction_record = session.query(ExtractionProgress).filter_by(
+    with db.get_readonly_session() as session:
+        extraction_record = session.query(ExtractionProgress).options(
+            undefer_group('merge_data')
+        ).filter_by(
             source=source,
             dataset_name=dataset_name
         ).order_by(ExtractionProgress.id.desc()).first()
@@ -87,6 +223,7 @@ def start_extraction(source: str, dataset_name: str, files: List[str]) -> int:
             
             if active_extraction:
                 logger.warning(f"Active extraction already exists for {source}/{dataset_name}")
+                _set_extraction_active(source, dataset_name, True)
                 return active_extraction.id
             
             # Create a new extraction record
@@ -107,6 +244,8 @@ def start_extraction(source: str, dataset_name: str, files: List[str]) -> int:
             
             session.add(extraction)
             session.commit()
+            _set_extraction_active(source, dataset_name, True)
+            _notify_subscribers(source, dataset_name)
             logger.info(f"Started new extraction for {source}/{dataset_name}")
             return extraction.id
             
@@ -164,24 +303,23 @@ def update_extraction_progress(
                         extraction.merge_reasoning_history = None
                         logger.debug(f"Cleared merge reasoning history for {source}/{dataset_name}")
                     else:
-                        # Get existing history
-                        current_history = []
-                        if extraction.merge_reasoning_history:
-                            try:
-                                current_history = json.loads(extraction.merge_reasoning_history)
-                            except:
-                                current_history = []
+                        # A single entry is appended, a list extends the history
+                        entries = [value] if isinstance(value, dict) else value if isinstance(value, list) else []
                         
-                        # If value is a single entry, append it
-                        if isinstance(value, dict):
-                            current_history.append(value)
-                        # If value is a list, extend the history
-                        elif isinstance(value, list):
-                            current_history.extend(value)
-                        
-                        # Update the history
-                        extraction.merge_reasoning_history = json.dumps(current_history)
-                        logger.debug(f"Updated merge reasoning history for {source}/{dataset_name}, now has {len(current_history)} entries")
+                        # Append in the database where possible, without loading the history
+                        appended = json_array_append(session, ExtractionProgress.merge_reasoning_history, entries)
+                        if appended is not None:
+                            extraction.merge_reasoning_history = appended
+                        else:
+                            current_history = []
+                            if extraction.merge_reasoning_history:
+                                try:
+                                    current_history = json.loads(extraction.merge_reasoning_history)
+                                except:
+                                    current_history = []
+                            current_history.extend(entries)
+                            extraction.merge_reasoning_history = json.dumps(current_history)
+                        logger.debug(f"Appended {len(entries)} merge reasoning entries for {source}/{dataset_name}")
                 elif field == 'schema' and value is not None:
                     extraction.schema = json.dumps(value)
                 elif field == 'files' and value is not None:
@@ -210,6 +348,10 @@ def update_extraction_progress(
                     logger.info(f"Extraction {source}/{dataset_name} {update_data['status']} in {duration:.2f} seconds")
             
             session.commit()
+            if 'status' in update_data:
+                invalidate_extraction_active(source, dataset_name)
+            else:
+                _notify_subscribers(source, dataset_name)
             logger.debug(f"Updated extraction progress for {source}/{dataset_name}")
             return True
             
@@ -236,6 +378,7 @@ def clear_extraction_state(source: str, dataset_name: str) -> None:
                 logger.info(f"Clearing extraction state for {source}/{dataset_name}")
                 extraction_record.status = 'cleared'
                 session.commit()
+                invalidate_extraction_active(source, dataset_name)
                 logger.info(f"Extraction state cleared for {source}/{dataset_name}")
             else:
                 logger.warning(f"No extraction state found for {source}/{dataset_name} to clear")
@@ -253,16 +396,12 @@ def get_extraction_status(source: str, dataset_name: str) -> Optional[str]:
     Returns:
         Optional[str]: The status of the extraction job, or None if not found
     """
-    with db.get_session() as session:
-        extraction_record = session.query(ExtractionProgress).filter_by(
+    with db.get_readonly_session() as session:
+        # Select only the status column; this is polled between chunks
+        return session.query(ExtractionProgress.status).filter_by(
             source=source,
             dataset_name=dataset_name
-        ).order_by(ExtractionProgress.id.desc()).first()
-        
-        if extraction_record:
-            return extraction_record.status
-        
-        return None
+        ).order_by(ExtractionProgress.id.desc()).limit(1).scalar()
 
 def complete_extraction(source: str, dataset_name: str, success: bool, message: str = "") -> bool:
     """
@@ -299,6 +438,7 @@ def complete_extraction(source: str, dataset_name: str, success: bool, message:
                     extraction.duration = duration
                     logger.info(f"Extraction {source}/{dataset_name} {status} in {duration:.2f} seconds")
                 session.commit()
+                invalidate_extraction_active(source, dataset_name)
                 logger.info(f"Updated extraction status to {status} for {source}/{dataset_name}")
                 return True
             else:
@@ -347,6 +487,7 @@ def resume_extraction(source: str, dataset_name: str) -> Optional[int]:
             logger.info(f"Found paused extraction for {source}/{dataset_name}, resuming")
             paused_extraction.status = 'scheduled'
             session.commit()
+            _notify_subscribers(source, dataset_name)
             return paused_extraction.id
         
         # If no paused extraction, check for in-progress extractions
@@ -396,6 +537,7 @@ def delete_running_extraction(source: str, dataset_name: str) -> bool:
                 session.delete(record)
             
             session.commit()
+            invalidate_extraction_active(source, dataset_name)
             logger.info(f"Successfully deleted {len(extraction_records)} running extractions for {source}/{dataset_name}")
             return True
     except Exception as e:
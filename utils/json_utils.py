@@ -1,7 +1,11 @@
 """Utility functions for JSON handling."""
+import os
 import re
 import json
-from typing import Optional, Dict, Any
+import uuid
+from typing import Optional, Dict, Any, List, Mapping, Set, Tuple, Type, Union
+
+FieldTypes = Mapping[str, Union[Type, Tuple[Type, ...]]]
 
 
 def clean_json_string(json_str: str) -> str:
@@ -53,3 +57,163 @@ def extract_json_from_text(text: str) -> Optional[Dict[str, Any]]:
                 return json.loads(json_str)
 
     return None
+
+
+class RawJSON:
+    """
+    Already encoded JSON text, written verbatim by dumps_with_raw.
+
+    Wrapping a JSON string read from the database avoids decoding it only
+    to encode it again for the response.
+    """
+
+    __slots__ = ('encoded',)
+
+    def __init__(self, encoded: str) -> None:
+        self.encoded = encoded
+
+
+def dumps_with_raw(obj: Any, **kwargs: Any) -> str:
+    """
+    Serialize an object to JSON, writing RawJSON values verbatim.
+
+    Args:
+        obj: The object to serialize, which may contain RawJSON values
+        **kwargs: Additional arguments for json.dumps
+
+    Returns:
+        JSON string
+    """
+    fragments: List[str] = []
+    # Unique per call so the placeholder cannot collide with real data
+    marker = f"__raw_json_{uuid.uuid4().hex}_"
+
+    def default(value: Any) -> str:
+        if isinstance(value, RawJSON):
+            fragments.append(value.encoded)
+            return f"{marker}{len(fragments) - 1}"
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+    encoded = json.dumps(obj, default=default, **kwargs)
+    if not fragments:
+        return encoded
+    return re.sub(f'"{marker}(\\d+)"', lambda match: fragments[int(match.group(1))], encoded)
+
+
+def write_json_file(path: str, data: Any, indent: Optional[int] = 2) -> None:
+    """
+    Write data to a JSON file atomically.
+
+    The JSON is serialized in one call, written to a temporary file in the same
+    directory with a single write, and renamed over path, so readers never
+    see a partially written file.
+
+    Args:
+        path: Path of the JSON file
+        data: Data to serialize
+        indent: Indentation passed to json.dumps
+    """
+    encoded = json.dumps(data, indent=indent)
+    # Named next to the target, and opened like a normal file so it gets the
+    # usual permissions rather than mkstemp's owner-only ones
+    temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        with open(temp_path, 'x', encoding='utf-8') as f:
+            f.write(encoded)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+
+def validate_json_fields(
+    data: Any,
+    required: FieldTypes,
+    optional: Optional[FieldTypes] = None
+) -> Tuple[Dict[str, Any], Optional[str]]:
+    """
+    Validate a decoded JSON request body against the expected field types.
+
+    Args:
+        data: Decoded JSON body, usually from request.get_json(silent=True)
+        required: Mapping of required field names to their accepted types
+        optional: Mapping of optional field names to their accepted types
+
+    Returns:
+        Tuple of (validated fields, error message). Fields not named in
+        required or optional are dropped. The error message is None when
+        the body is valid.
+    """
+    if not isinstance(data, dict):
+        return {}, 'Request body must be a JSON object'
+
+    missing = required.keys() - data.keys()
+    if missing:
+        return {}, f"Missing required field: {', '.join(sorted(missing))}"
+
+    fields = {**(optional or {}), **required}
+    validated: Dict[str, Any] = {}
+    for key, value in data.items():
+        expected = fields.get(key)
+        if expected is None:
+            continue
+        # bool is a subclass of int, so reject it unless explicitly allowed
+        if not isinstance(value, expected) or (
+            isinstance(value, bool) and not _accepts_bool(expected)
+        ):
+            return {}, f"Invalid type for field: {key}"
+        validated[key] = value
+
+    return validated, None
+
+
+def _accepts_bool(expected: Union[Type, Tuple[Type, ...]]) -> bool:
+    """Check whether a field type spec explicitly allows booleans"""
+    if isinstance(expected, tuple):
+        return bool in expected or object in expected
+    return expected in (bool, object)
+
+
+def schema_leaf_paths(schema: Any, prefix: Tuple[str, ...] = ()) -> Optional[Set[Tuple[str, ...]]]:
+    """
+    Get the paths of the scalar fields of a schema.
+
+    Both JSON schemas and plain mappings of field names to field schemas are
+    supported. Array fields can always gain more items from a later chunk, so
+    a schema with any array has no fixed set of fields to complete.
+
+    Args:
+        schema: The schema, or a field schema when called recursively
+        prefix: Path of the field being walked
+
+    Returns:
+        Set of field paths, or None if the schema contains an array
+    """
+    if not isinstance(schema, dict):
+        return {prefix}
+    if schema.get('type') == 'array' or 'items' in schema:
+        return None
+
+    properties = schema.get('properties')
+    if properties is None:
+        if 'type' in schema or not schema:
+            return {prefix} if prefix else set()
+        properties = schema
+
+    paths: Set[Tuple[str, ...]] = set()
+    for key, field_schema in properties.items():
+        field_paths = schema_leaf_paths(field_schema, prefix + (key,))
+        if field_paths is None:
+            return None
+        paths |= field_paths
+    return paths
+
+
+def is_path_populated(data: Any, path: Tuple[str, ...]) -> bool:
+    """Check whether extracted data has a non-null value at a field path."""
+    for key in path:
+        if not isinstance(data, dict):
+            return False
+        data = data.get(key)
+    return data is not None
@@ -0,0 +1,89 @@
+"""
+PDF to markdown conversion helpers
+"""
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pymupdf
+    import pymupdf4llm
+    from pymupdf4llm.helpers.pymupdf_rag import IdentifyHeaders
+    PDF_SUPPORT = True
+except ImportError:
+    PDF_SUPPORT = False
+
+# PDFs with fewer pages are converted in the calling process, where starting
+# work in other processes would cost more than it saves
+PARALLEL_MIN_PAGES = 8
+
+# Page conversion is CPU bound Python code, so it runs in worker processes
+# shared by every conversion; created on first use. Workers are spawned
+# rather than forked, since the pool is created from the batch processor's
+# conversion threads and a forked child could inherit a lock (such as a
+# logging lock) held by another thread and deadlock
+_page_pool: Optional[ProcessPoolExecutor] = None
+_page_pool_lock = threading.Lock()
+
+
+def _get_page_pool() -> ProcessPoolExecutor:
+    """Return the shared page conversion pool, creating it on first use"""
+    global _page_pool
+    with _page_pool_lock:
+        if _page_pool is None:
+            _page_pool = ProcessPoolExecutor(
+                max_workers=os.cpu_count() or 1,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return _page_pool
+
+
+def _convert_pages(pdf_path: str, pages: List[int], hdr_info: 'IdentifyHeaders') -> str:
+    """Convert a range of pages, run in a page pool worker"""
+    return pymupdf4llm.to_markdown(pdf_path, pages=pages, hdr_info=hdr_info)
+
+
+def pdf_to_markdown(pdf_path: str) -> str:
+    """
+    Convert a PDF file to markdown using pymupdf4llm
+
+    Large PDFs are split into page ranges converted in parallel worker
+    processes. Header levels are worked out once from the whole document, so
+    the result is the same as converting it in one go. The document is opened
+    once here and shared by the page count, header scan and in-process
+    conversion, rather than each opening the file again.
+
+    Args:
+        pdf_path: Path to the PDF file
+
+    Returns:
+        The markdown content of the PDF
+
+    Raises:
+        ImportError: If pymupdf4llm is not installed
+    """
+    if not PDF_SUPPORT:
+        raise ImportError("pymupdf4llm is not installed. Cannot process PDF files.")
+
+    workers = os.cpu_count() or 1
+    with pymupdf.open(pdf_path) as doc:
+        page_count = doc.page_count
+        if page_count < PARALLEL_MIN_PAGES or workers < 2:
+            return pymupdf4llm.to_markdown(doc)
+
+        hdr_info = IdentifyHeaders(doc)
+
+    chunk_size = -(-page_count // workers)
+    page_ranges = [
+        list(range(start, min(start + chunk_size, page_count)))
+        for start in range(0, page_count, chunk_size)
+    ]
+
+    pool = _get_page_pool()
+    futures = [pool.submit(_convert_pages, pdf_path, pages, hdr_info) for pages in page_ranges]
+    return ''.join(future.result() for future in futures)
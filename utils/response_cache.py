@@ -0,0 +1,125 @@
+"""
+HTTP caching helpers for polled GET endpoints
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, List, Tuple
+
+from flask import Response, request
+
+from utils.json_utils import dumps_with_raw
+
+# Most responses kept at once; every distinct query string is a separate
+# entry, so the least recently used ones are dropped beyond this
+MAX_CACHED_RESPONSES = 256
+
+# Cached responses keyed by request path and query string, least recently
+# used first: (expiry time, body, status code, headers)
+_cache: 'OrderedDict[str, Tuple[float, bytes, int, List[Tuple[str, str]]]]' = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _store(key: str, entry: Tuple[float, bytes, int, List[Tuple[str, str]]], now: float) -> None:
+    """Store a cached response, dropping expired and least recently used entries"""
+    with _cache_lock:
+        _cache[key] = entry
+        _cache.move_to_end(key)
+        for cached_key in [k for k, cached in _cache.items() if cached[0] <= now]:
+            del _cache[cached_key]
+        while len(_cache) > MAX_CACHED_RESPONSES:
+            _cache.popitem(last=False)
+
+
+def cached_response(timeout: float = 2.0) -> Callable:
+    """
+    Cache the response of a GET view for a few seconds
+
+    Only successful responses are cached. Streamed responses are passed
+    through untouched.
+
+    Args:
+        timeout: Number of seconds to serve the cached response for
+
+    Returns:
+        Decorator for a Flask view function
+    """
+    def decorator(view: Callable) -> Callable:
+        @wraps(view)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            key = request.full_path
+            now = time.monotonic()
+
+            with _cache_lock:
+                entry = _cache.get(key)
+                if entry:
+                    _cache.move_to_end(key)
+            if entry and entry[0] > now:
+                cached = Response(entry[1], status=entry[2], headers=entry[3])
+                return cached.make_conditional(request)
+
+            response = view(*args, **kwargs)
+            if isinstance(response, tuple):
+                body, status = response
+            else:
+                body, status = response, response.status_code
+
+            if status == 200 and not body.is_streamed:
+                _store(key, (now + timeout, body.get_data(), status, list(body.headers.items())), now)
+            return response
+        return wrapper
+    return decorator
+
+
+def clear_response_cache() -> None:
+    """Drop all cached responses, called after writes that change them"""
+    with _cache_lock:
+        _cache.clear()
+
+
+def conditional_response(build_response: Callable[[], Response], etag_source: Any) -> Response:
+    """
+    Build a response with an ETag, or a 304 if the client has it already
+
+    Args:
+        build_response: Function returning the full response, only called
+            when the client's copy is out of date
+        etag_source: Value that changes whenever the response body does
+
+    Returns:
+        The built response, or an empty 304 Not Modified response
+    """
+    etag = hashlib.md5(repr(etag_source).encode()).hexdigest()
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = build_response()
+    response.set_etag(etag)
+    return response
+
+
+def conditional_json(build_payload: Callable[[], Any], etag_source: Any) -> Response:
+    """
+    Build a JSON response with an ETag, or a 304 if the client has it already
+
+    The If-None-Match check happens before the payload is built, so clients
+    polling unchanged data cost no serialization. The payload may contain
+    RawJSON values, which are written without being re-encoded.
+
+    Args:
+        build_payload: Function returning the JSON serializable response body
+        etag_source: Value that changes whenever the payload does, such as
+            the (id, updated_at) pairs of the records in it
+
+    Returns:
+        JSON response, or an empty 304 Not Modified response
+    """
+    return conditional_response(
+        lambda: Response(
+            dumps_with_raw(build_payload(), separators=(',', ':')) + '\n',
+            mimetype='application/json'
+        ),
+        etag_source
+    )
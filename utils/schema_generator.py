@@ -1,8 +1,8 @@
 import logging
 import json
 import csv
-import pandas as pd
 import os
+from itertools import islice
 from typing import Dict, Any, List, Optional, Set, Tuple
 from pathlib import Path
 
@@ -11,6 +11,9 @@ from .file_utils import get_file_type, is_supported_file_type
 
 logger = logging.getLogger(__name__)
 
+# Number of CSV rows sampled to infer field types
+CSV_SAMPLE_ROWS = 10
+
 def detect_field_type(value: Any) -> str:
     """
     Detect the type of a field value
@@ -134,10 +137,10 @@ def generate_schema_from_csv(file_path: str, schema_name: str = 'Auto-generated
         Dict[str, Any]: JSON schema
     """
     try:
-        # Read the CSV file
+        # Read only the rows used for sampling, not the whole file
         with open(file_path, 'r', encoding='utf-8') as f:
             reader = csv.DictReader(f)
-            rows = list(reader)
+            rows = list(islice(reader, CSV_SAMPLE_ROWS))
             
         if not rows:
             logger.warning(f"CSV file '{file_path}' is empty")
@@ -152,7 +155,7 @@ def generate_schema_from_csv(file_path: str, schema_name: str = 'Auto-generated
         sample_values = {}
         
         # Get sample values for each field
-        for row in rows[:10]:  # Use up to 10 rows for sampling
+        for row in rows:
             for field in field_names:
                 if field not in sample_values:
                     sample_values[field] = []
@@ -209,6 +212,9 @@ def generate_schema_from_excel(file_path: str, schema_name: str = 'Auto-generate
         Dict[str, Any]: JSON schema
     """
     try:
+        # pandas is only needed here and is slow to import, so load it on first use
+        import pandas as pd
+        
         # Read the Excel file
         df = pd.read_excel(file_path)
         
@@ -225,8 +231,7 @@ def generate_schema_from_excel(file_path: str, schema_name: str = 'Auto-generate
         properties = {}
         
         for field in field_names:
-            values = df[field].dropna().tolist()
-            samples = values[:10]  # Use up to 10 values for sampling
+            samples = df[field].dropna().head(10).tolist()  # Use up to 10 values for sampling
             
             # Try to determine the best type
             if df[field].dtype == 'bool':
@@ -0,0 +1,80 @@
+"""
+Helpers for document text sent to extraction
+"""
+import re
+from typing import List
+
+# Any letter or digit; text without one has nothing a schema field could hold
+_WORD_CHARACTER = re.compile(r'[^\W_]')
+
+
+def has_extractable_text(text: str) -> bool:
+    """
+    Check whether text contains anything worth sending to the LLM
+
+    Chunks of converted PDFs can consist only of whitespace, page rules,
+    table borders or other markdown punctuation. Extracting from them costs a
+    full LLM request and can never produce data.
+
+    Args:
+        text: Chunk of document text
+
+    Returns:
+        True if the text contains at least one letter or digit
+    """
+    return _WORD_CHARACTER.search(text) is not None
+
+
+def split_content_into_chunks(content: str, max_chunk_size: int) -> List[str]:
+    """
+    Split markdown content into chunks of whole paragraphs
+
+    Paragraphs are packed into a chunk until the next one would take it past
+    max_chunk_size; a paragraph longer than a whole chunk is cut into
+    chunk-sized pieces. Sizes count paragraph text only, not the separators
+    between paragraphs. Each chunk is a single slice of the content, running
+    from the start of its first paragraph to the end of its last.
+
+    Args:
+        content: Markdown content
+        max_chunk_size: Maximum number of characters of paragraph text in a chunk
+
+    Returns:
+        List of chunks, with a single empty chunk for empty content
+    """
+    max_chunk_size = max(1, max_chunk_size)
+    chunks: List[str] = []
+    content_size = len(content)
+    chunk_start = 0
+    # End of the last paragraph in the current chunk, -1 while it is empty
+    chunk_end = -1
+    current_size = 0
+    para_start = 0
+
+    while True:
+        para_end = content.find('\n\n', para_start)
+        if para_end == -1:
+            para_end = content_size
+
+        # If adding this paragraph would exceed max size, start a new chunk
+        if current_size + para_end - para_start > max_chunk_size and chunk_end >= 0:
+            chunks.append(content[chunk_start:chunk_end])
+            chunk_start = para_start
+            chunk_end = -1
+            current_size = 0
+
+        # The chunk is empty here if the paragraph alone is too long for it
+        while para_end - para_start > max_chunk_size:
+            chunks.append(content[para_start:para_start + max_chunk_size])
+            para_start += max_chunk_size
+            chunk_start = para_start
+
+        chunk_end = para_end
+        current_size += para_end - para_start
+        if para_end == content_size:
+            break
+        para_start = para_end + 2
+
+    # Add the last chunk
+    chunks.append(content[chunk_start:chunk_end])
+    return chunks